@@ -0,0 +1,58 @@
+"""add conversations
+
+Revision ID: 0008_conversations
+Revises: 0007_project_codespace_fields
+Create Date: 2026-10-17 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_conversations"
+down_revision = "0007_project_codespace_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversations",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("summarized_through", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("message_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_conversations_id", "conversations", ["id"])
+    op.create_index("ix_conversations_user_id", "conversations", ["user_id"])
+
+    op.create_table(
+        "conversation_messages",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("conversation_id", sa.String(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=True),
+        sa.Column("model_used", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_conversation_messages_conversation_seq",
+        "conversation_messages",
+        ["conversation_id", "seq"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversation_messages_conversation_seq", table_name="conversation_messages")
+    op.drop_table("conversation_messages")
+    op.drop_index("ix_conversations_user_id", table_name="conversations")
+    op.drop_index("ix_conversations_id", table_name="conversations")
+    op.drop_table("conversations")
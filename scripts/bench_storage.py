@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the MCP server's SQLite TaskStorage.
+
+Seeds a fresh database with N tasks spread over 100 projects, then times
+create/update/get one task at a time and list_tasks for a single project.
+
+    python scripts/bench_storage.py --sizes 10000,100000,1000000
+    python scripts/bench_storage.py --profile default   # SQLite defaults, for comparison
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import insert
+from src.storage.db import TaskStorage, TaskDB
+from src.models.task import Task, TaskType, TaskStatus, TaskPriority
+
+PROJECTS = 100
+SEED_CHUNK = 10000
+
+async def seed(storage: TaskStorage, size: int) -> float:
+    await storage._ensure_schema()
+    now = datetime.now()
+    start = time.perf_counter()
+    for offset in range(0, size, SEED_CHUNK):
+        rows = [
+            {
+                "id": f"seed-{i}",
+                "project_name": f"project-{i % PROJECTS}",
+                "type": TaskType.STANDARD,
+                "title": f"Seeded task {i}",
+                "status": TaskStatus.TODO,
+                "priority": TaskPriority.MEDIUM,
+                "deliverables": [],
+                "context_files": [],
+                "tags": [],
+                "approval_required": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(offset, min(offset + SEED_CHUNK, size))
+        ]
+        async with storage.engine.begin() as conn:
+            await conn.execute(insert(TaskDB), rows)
+    return time.perf_counter() - start
+
+async def timed(ops: int, fn) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        await fn(i)
+    return ops / (time.perf_counter() - start)
+
+async def run(size: int, ops: int, profile: str):
+    with tempfile.TemporaryDirectory() as tmp:
+        pragmas = {} if profile == "default" else None
+        storage = TaskStorage(os.path.join(tmp, "bench.sqlite"), pragmas=pragmas)
+        seed_seconds = await seed(storage, size)
+
+        created = []
+
+        async def create(i):
+            task = Task(id=f"bench-{i}", project_name="project-0", type=TaskType.STANDARD, title=f"Bench {i}")
+            created.append(await storage.create_task(task))
+
+        async def update(i):
+            task = created[i]
+            task.status = TaskStatus.IN_PROGRESS
+            await storage.update_task(task)
+
+        async def get(i):
+            await storage.get_task(f"seed-{(i * 7919) % size}")
+
+        rows_per_list = size // PROJECTS + ops
+
+        async def list_project(i):
+            await storage.list_tasks(project_name="project-0")
+
+        results = {
+            "seed rows/s": size / seed_seconds,
+            "create ops/s": await timed(ops, create),
+            "update ops/s": await timed(ops, update),
+            "get ops/s": await timed(ops, get),
+            "list rows/s": rows_per_list * await timed(max(1, ops // 100), list_project),
+        }
+        await storage.close()
+
+    print(f"{size:>9} tasks  " + "  ".join(f"{name}: {value:>10,.0f}" for name, value in results.items()))
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma separated task counts")
+    parser.add_argument("--ops", type=int, default=1000, help="single-task operations timed per size")
+    parser.add_argument("--profile", choices=["tuned", "default"], default="tuned")
+    args = parser.parse_args()
+
+    print(f"profile: {args.profile}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        await run(size, args.ops, args.profile)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for issue-to-task linking in SuggestionsEngine.
+
+Times generate_suggestions with the full task list (the engine builds the
+linked-issue set itself) and with a precomputed set as returned by
+TaskStorage.linked_issue_numbers, then a repeat call served from the rule memo.
+
+    python scripts/bench_suggestions.py --issues 10000 --tasks 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.core.suggestions import SuggestionsEngine
+from src.models.project import GitInfo, GitHubInfo
+from src.models.task import Task, TaskType
+
+def build(issue_count: int, task_count: int):
+    rng = random.Random(42)
+    github_info = GitHubInfo(issues=[{"number": n, "title": f"Issue {n}"} for n in range(1, issue_count + 1)])
+    tasks = [
+        Task(
+            id=f"t{i}", project_name="bench", type=TaskType.STANDARD, title=f"Task {i}",
+            # Roughly half the tasks reference an issue, and some issues have several tasks
+            github_issue_number=rng.randint(1, issue_count * 2) if i % 2 else None,
+        )
+        for i in range(task_count)
+    ]
+    git_info = GitInfo(branch="main", is_dirty=False, ahead=0, behind=0, last_commit={},
+                       modified_files=[], untracked_files=[])
+    return git_info, github_info, tasks
+
+def timed(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    git_info, github_info, tasks = build(args.issues, args.tasks)
+    linked = {t.github_issue_number for t in tasks if t.github_issue_number is not None}
+
+    # A fresh engine per run, so rule memoization does not hide the linking cost
+    from_tasks = timed(args.repeat, lambda: SuggestionsEngine().generate_suggestions(git_info, github_info, tasks))
+    precomputed = timed(args.repeat, lambda: SuggestionsEngine().generate_suggestions(git_info, github_info, linked_issues=linked))
+    engine = SuggestionsEngine()
+    engine.generate_suggestions(git_info, github_info, linked_issues=linked)
+    memoized = timed(args.repeat, lambda: engine.generate_suggestions(git_info, github_info, linked_issues=linked))
+
+    print(f"{args.issues} issues x {args.tasks} tasks")
+    print(f"  from task list:      {from_tasks * 1000:8.1f} ms")
+    print(f"  precomputed set:     {precomputed * 1000:8.1f} ms")
+    print(f"  memoized rules:      {memoized * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -11,11 +12,42 @@ logger = logging.getLogger(__name__)
 
 from src.api.routers import auth, accounts, projects, chat, integrations
 from src.storage.postgres import init_db
+from src.api.services.http_clients import HTTPClientRegistry
+from src.api.services.pm_context import PMContextCache
+from src.api.services.response_cache import create_response_cache
+from src.api.services.model_catalog import ModelCatalog
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    # Outbound clients (GitHub, Coder, LLM endpoints) are shared by all requests
+    app.state.http_clients = HTTPClientRegistry(
+        max_connections_per_host=int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20")),
+    )
+    app.state.pm_context = PMContextCache(ttl=float(os.getenv("PM_CONTEXT_TTL", "300")))
+    # LLM_RESPONSE_CACHE=off disables caching of chat answers
+    app.state.response_cache = create_response_cache(
+        os.getenv("LLM_RESPONSE_CACHE", "memory"),
+        ttl=float(os.getenv("LLM_RESPONSE_CACHE_TTL", "600")),
+        max_entries=int(os.getenv("LLM_RESPONSE_CACHE_SIZE", "1000")),
+    )
+    app.state.model_catalog = ModelCatalog(
+        app.state.http_clients,
+        ttl=float(os.getenv("MODEL_CATALOG_TTL", "300")),
+        stale_ttl=float(os.getenv("MODEL_CATALOG_STALE_TTL", "3600")),
+    )
+    app.state.model_catalog.start()
+    try:
+        yield
+    finally:
+        await app.state.model_catalog.aclose()
+        await app.state.http_clients.aclose()
 
 app = FastAPI(
     title="Fulcrum Project Manager API",
     description="Multi-tenant AI-native project orchestration system",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Mount static files
@@ -30,10 +62,6 @@ async def favicon():
         return FileResponse(favicon_path)
     return None
 
-@app.on_event("startup")
-async def on_startup():
-    await init_db()
-
 app.include_router(auth.router)
 app.include_router(accounts.router)
 app.include_router(projects.router)
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.storage.postgres import get_db
+from src.api.services.model_catalog import ModelCatalog, ModelCatalogError, get_model_catalog
+from src.api.services.pm_context import PMContextCache, get_pm_context_cache
 from src.api.middleware.auth import get_current_user
 from src.models.user import UserDB, AccountDB
 from pydantic import BaseModel
 from typing import List, Optional
 from sqlalchemy.future import select
 import uuid
-import httpx
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
@@ -19,6 +20,10 @@ def normalize_ollama_endpoint(provider: str, endpoint: Optional[str]) -> Optiona
     trimmed = endpoint.rstrip("/")
     return trimmed if trimmed.endswith("/v1") else f"{trimmed}/v1"
 
+def models_endpoint(account: AccountDB) -> str:
+    """The endpoint an account's model list is fetched from, as keyed in the model catalog."""
+    return normalize_ollama_endpoint(account.provider, account.api_endpoint or "https://api.openai.com/v1")
+
 class LLMConfigCreate(BaseModel):
     provider: str = "openai"
     name: Optional[str] = None
@@ -27,6 +32,7 @@ class LLMConfigCreate(BaseModel):
     model_name: Optional[str] = None  # Will be configured in PM settings
     is_global: bool = False # Only admins should be able to set this
     enabled_models: Optional[List[str]] = None
+    response_cache: bool = True  # Reuse answers to repeated prompts
 
 class AccountResponse(BaseModel):
     id: str
@@ -36,6 +42,7 @@ class AccountResponse(BaseModel):
     model_name: Optional[str]
     is_global: bool
     enabled_models: Optional[List[str]]
+    response_cache: bool = True
 
     class Config:
         from_attributes = True
@@ -45,16 +52,27 @@ class LLMConfigUpdate(BaseModel):
     api_endpoint: Optional[str] = None
     model_name: Optional[str] = None
     enabled_models: Optional[List[str]] = None
+    response_cache: Optional[bool] = None
 
 class LLMModelQuery(BaseModel):
     provider: str
     api_endpoint: Optional[str]
     api_key: Optional[str] = None
 
+def account_metadata(enabled_models: Optional[List[str]], response_cache: bool = True) -> Optional[dict]:
+    metadata = {}
+    if enabled_models:
+        metadata["enabled_models"] = enabled_models
+    if not response_cache:
+        metadata["response_cache"] = False
+    return metadata or None
+
 def account_to_response(account: AccountDB) -> dict:
     enabled_models = None
+    response_cache = True
     if account.extra_metadata and isinstance(account.extra_metadata, dict):
         enabled_models = account.extra_metadata.get("enabled_models")
+        response_cache = account.extra_metadata.get("response_cache", True) is not False
     return {
         "id": account.id,
         "provider": account.provider,
@@ -62,14 +80,16 @@ def account_to_response(account: AccountDB) -> dict:
         "api_endpoint": account.api_endpoint,
         "model_name": account.model_name,
         "is_global": account.is_global,
-        "enabled_models": enabled_models
+        "enabled_models": enabled_models,
+        "response_cache": response_cache
     }
 
 @router.post("/llm", response_model=AccountResponse)
 async def configure_llm(
     config: LLMConfigCreate,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pm_context: PMContextCache = Depends(get_pm_context_cache)
 ):
     # In a real app, restrict is_global to admins
     account_id = str(uuid.uuid4())
@@ -86,11 +106,12 @@ async def configure_llm(
         api_endpoint=normalized_endpoint,
         model_name=model_name,
         is_global=config.is_global,
-        extra_metadata={"enabled_models": config.enabled_models} if config.enabled_models else None
+        extra_metadata=account_metadata(config.enabled_models, config.response_cache)
     )
     db.add(db_account)
     await db.commit()
     await db.refresh(db_account)
+    pm_context.invalidate_account(db_account.id, db_account.user_id, db_account.is_global)
     return account_to_response(db_account)
 
 @router.get("", response_model=List[AccountResponse])
@@ -111,7 +132,9 @@ async def list_accounts(
 async def delete_account(
     account_id: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pm_context: PMContextCache = Depends(get_pm_context_cache),
+    model_catalog: ModelCatalog = Depends(get_model_catalog)
 ):
     # Fetch the account
     result = await db.execute(
@@ -128,6 +151,8 @@ async def delete_account(
     
     await db.delete(account)
     await db.commit()
+    pm_context.invalidate_account(account.id, account.user_id, account.is_global)
+    model_catalog.invalidate(models_endpoint(account), account.access_token)
     
     return {"message": "Account deleted successfully"}
 
@@ -136,7 +161,9 @@ async def update_account(
     account_id: str,
     config: LLMConfigUpdate,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pm_context: PMContextCache = Depends(get_pm_context_cache),
+    model_catalog: ModelCatalog = Depends(get_model_catalog)
 ):
     result = await db.execute(
         select(AccountDB).where(AccountDB.id == account_id)
@@ -148,6 +175,7 @@ async def update_account(
 
     if account.user_id != current_user.id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized to edit this account")
+    previous_endpoint = models_endpoint(account)
 
     if config.name is not None:
         account.name = config.name or None
@@ -155,19 +183,27 @@ async def update_account(
         account.api_endpoint = normalize_ollama_endpoint(account.provider, config.api_endpoint or None)
     if config.model_name is not None:
         account.model_name = config.model_name or None
-    if config.enabled_models is not None:
-        account.extra_metadata = account.extra_metadata or {}
-        account.extra_metadata["enabled_models"] = config.enabled_models
+    if config.enabled_models is not None or config.response_cache is not None:
+        # Assign a new dict: in-place changes to a JSON column are not tracked
+        metadata = dict(account.extra_metadata or {})
+        if config.enabled_models is not None:
+            metadata["enabled_models"] = config.enabled_models
+        if config.response_cache is not None:
+            metadata["response_cache"] = config.response_cache
+        account.extra_metadata = metadata
 
     await db.commit()
     await db.refresh(account)
+    pm_context.invalidate_account(account.id, account.user_id, account.is_global)
+    model_catalog.invalidate(previous_endpoint, account.access_token)
     return account_to_response(account)
 
 @router.get("/{account_id}/models")
 async def list_models_for_account(
     account_id: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    model_catalog: ModelCatalog = Depends(get_model_catalog)
 ):
     result = await db.execute(
         select(AccountDB).where(AccountDB.id == account_id)
@@ -180,71 +216,23 @@ async def list_models_for_account(
     if account.user_id != current_user.id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized to access this account")
 
-    endpoint = normalize_ollama_endpoint(
-        account.provider,
-        account.api_endpoint or "https://api.openai.com/v1"
-    )
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            headers = {}
-            if account.access_token:
-                headers["Authorization"] = f"Bearer {account.access_token}"
-            response = await client.get(f"{endpoint}/models", headers=headers)
-
-            if response.status_code == 200:
-                data = response.json()
-                models = [m["id"] for m in data.get("data", [])]
-                if models:
-                    return {"models": sorted(models)}
-
-            raise HTTPException(
-                status_code=502,
-                detail=f"Could not retrieve models from {endpoint}. Status: {response.status_code}. Please verify your API endpoint and credentials."
-            )
-    except httpx.TimeoutException:
-        raise HTTPException(
-            status_code=504,
-            detail=f"Timeout connecting to {endpoint}. Please verify the endpoint is accessible."
-        )
-    except httpx.HTTPError as e:
-        raise HTTPException(
-            status_code=502,
-            detail=f"Error connecting to {endpoint}: {str(e)}. Please verify your API endpoint and credentials."
-        )
+        return {"models": await model_catalog.list_models(models_endpoint(account), account.access_token)}
+    except ModelCatalogError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.post("/llm/models")
 async def list_models_for_endpoint(
     query: LLMModelQuery,
-    current_user: UserDB = Depends(get_current_user)
+    current_user: UserDB = Depends(get_current_user),
+    model_catalog: ModelCatalog = Depends(get_model_catalog)
 ):
     endpoint = normalize_ollama_endpoint(
         query.provider,
         query.api_endpoint or "https://api.openai.com/v1"
     )
+    # Ad-hoc endpoint and key (e.g. while setting up an account): not cached, so the key is not kept
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            headers = {}
-            if query.api_key:
-                headers["Authorization"] = f"Bearer {query.api_key}"
-            response = await client.get(f"{endpoint}/models", headers=headers)
-
-            if response.status_code == 200:
-                data = response.json()
-                models = [m["id"] for m in data.get("data", [])]
-                if models:
-                    return {"models": sorted(models)}
-
-            raise HTTPException(
-                status_code=502,
-                detail=f"Could not retrieve models from {endpoint}. Status: {response.status_code}. Please verify your API endpoint and credentials."
-            )
-    except httpx.TimeoutException:
-        raise HTTPException(
-            status_code=504,
-            detail=f"Timeout connecting to {endpoint}. Please verify the endpoint is accessible."
-        )
-    except httpx.HTTPError as e:
-        raise HTTPException(
-            status_code=502,
-            detail=f"Error connecting to {endpoint}: {str(e)}. Please verify your API endpoint and credentials."
-        )
+        return {"models": await model_catalog.fetch_models(endpoint, query.api_key)}
+    except ModelCatalogError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
@@ -3,12 +3,12 @@ from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.storage.postgres import get_db
+from src.api.services.http_clients import HTTPClientRegistry, get_http_clients
 from src.api.services import user_service
 from src.core.auth import security
 from pydantic import BaseModel, EmailStr
 from jose import jwt, JWTError
 import os
-import httpx
 import uuid
 from sqlalchemy.future import select
 
@@ -66,7 +66,12 @@ def _coder_redirect_uri() -> str:
 
 
 @router.get("/github/callback", include_in_schema=False)
-async def github_callback(code: str, state: str, db: AsyncSession = Depends(get_db)):
+async def github_callback(
+    code: str,
+    state: str,
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
+):
     try:
         payload = jwt.decode(state, security.SECRET_KEY, algorithms=[security.ALGORITHM])
         if payload.get("typ") != "github_oauth":
@@ -82,7 +87,7 @@ async def github_callback(code: str, state: str, db: AsyncSession = Depends(get_
     if not client_id or not client_secret:
         raise HTTPException(status_code=500, detail="GitHub OAuth not configured.")
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_clients.session(timeout=10.0) as client:
         token_res = await client.post(
             "https://github.com/login/oauth/access_token",
             headers={"Accept": "application/json"},
@@ -130,7 +135,12 @@ async def github_callback(code: str, state: str, db: AsyncSession = Depends(get_
 
 
 @router.get("/coder/callback", include_in_schema=False)
-async def coder_callback(code: str, state: str, db: AsyncSession = Depends(get_db)):
+async def coder_callback(
+    code: str,
+    state: str,
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
+):
     try:
         payload = jwt.decode(state, security.SECRET_KEY, algorithms=[security.ALGORITHM])
         if payload.get("typ") != "coder_oauth":
@@ -148,7 +158,7 @@ async def coder_callback(code: str, state: str, db: AsyncSession = Depends(get_d
     if not client_id or not client_secret:
         raise HTTPException(status_code=500, detail="Coder OAuth not configured.")
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_clients.session(timeout=10.0) as client:
         token_res = await client.post(
             token_endpoint,
             data={
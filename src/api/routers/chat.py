@@ -1,16 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.storage.postgres import get_db
+from src.storage.postgres import get_db, AsyncSessionLocal
+from src.api.services.http_clients import HTTPClientRegistry, get_http_clients
+from src.api.services.pm_context import PMContextCache, get_pm_context_cache
+from src.api.services.response_cache import LLMResponseCache, get_response_cache
+from src.api.services.model_catalog import ModelCatalog, ModelCatalogError, get_model_catalog
 from src.api.middleware.auth import get_current_user
+from src.api.services import conversations
 from src.models.user import UserDB
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Set
+from datetime import datetime
+import asyncio
 import httpx
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 OLLAMA_PROVIDERS = {"ollama", "ollama-local"}
+MAX_TOKENS = 500
+TEMPERATURE = 0.7
 
 def normalize_ollama_endpoint(provider: str, endpoint: Optional[str]) -> Optional[str]:
     if provider not in OLLAMA_PROVIDERS or not endpoint:
@@ -22,22 +35,79 @@ class ChatMessage(BaseModel):
     message: str
     model_name: Optional[str] = None
     account_id: Optional[str] = None
+    conversation_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     response: str
     model_used: str
+    conversation_id: Optional[str] = None
+
+class ConversationCreate(BaseModel):
+    title: Optional[str] = None
+
+class ConversationResponse(BaseModel):
+    id: str
+    title: Optional[str] = None
+    message_count: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ConversationMessageResponse(BaseModel):
+    seq: int
+    role: str
+    content: str
+    model_used: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
 
 class PMSettings(BaseModel):
     account_id: str
     model_name: str
 
-@router.post("/pm", response_model=ChatResponse)
-async def chat_with_pm(
+class PreparedChat:
+    """Everything a PM chat turn needs before the LLM call.
+
+    Holds plain values copied from the account row, so it can be cached
+    across requests and database sessions.
+    """
+
+    def __init__(self, account_id: str, provider: str, access_token: Optional[str],
+                 endpoint: str, model: str, system_prompt: str, cache_responses: bool = True):
+        self.account_id = account_id
+        self.provider = provider
+        self.access_token = access_token
+        self.endpoint = endpoint
+        self.model = model
+        self.system_prompt = system_prompt
+        self.cache_responses = cache_responses
+
+    @property
+    def model_used(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+async def prepare_pm_chat(
     msg: ChatMessage,
-    current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """Chat with the Project Manager AI"""
+    current_user: UserDB,
+    db: AsyncSession,
+    cache: Optional[PMContextCache] = None
+) -> PreparedChat:
+    """Resolves the AI account and model for a PM chat turn and builds its system prompt"""
+    key = (msg.account_id, msg.model_name)
+    if cache is not None:
+        cached = cache.get(current_user.id, key)
+        if cached is not None:
+            return cached
+    chat = await _build_pm_chat(msg, current_user, db)
+    if cache is not None:
+        cache.put(current_user.id, key, chat, account_id=chat.account_id)
+    return chat
+
+async def _build_pm_chat(msg: ChatMessage, current_user: UserDB, db: AsyncSession) -> PreparedChat:
     from src.core.agents.pm_agent import FulcrumPMAgent
     from src.models.user import AccountDB
     from sqlalchemy.future import select
@@ -93,26 +163,222 @@ Answer the user's question helpfully and concisely. Be friendly and professional
         if model_to_use not in enabled_models:
             model_to_use = enabled_models[0]
     
+    endpoint = normalize_ollama_endpoint(
+        account.provider,
+        account.api_endpoint or "https://api.openai.com/v1"
+    )
+    # Accounts can opt out of response caching with extra_metadata.response_cache = false
+    cache_responses = True
+    if account.extra_metadata and isinstance(account.extra_metadata, dict):
+        cache_responses = account.extra_metadata.get("response_cache", True) is not False
+    return PreparedChat(account.id, account.provider, account.access_token, endpoint, model_to_use, context,
+                        cache_responses)
+
+async def start_conversation_turn(
+    msg: ChatMessage,
+    current_user: UserDB,
+    db: AsyncSession,
+    chat: PreparedChat
+) -> Optional[conversations.ConversationTurn]:
+    """Loads the bounded history for `msg.conversation_id`; None for a stateless turn"""
+    if not msg.conversation_id:
+        return None
+    conversation = await conversations.get_conversation(db, current_user.id, msg.conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found.")
+    return await conversations.prepare_turn(
+        db, conversation, chat.system_prompt, msg.message, chat.model, MAX_TOKENS
+    )
+
+@router.post("/pm", response_model=ChatResponse)
+async def chat_with_pm(
+    msg: ChatMessage,
+    current_user: UserDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients),
+    pm_context: PMContextCache = Depends(get_pm_context_cache),
+    response_cache: Optional[LLMResponseCache] = Depends(get_response_cache)
+):
+    """Chat with the Project Manager AI"""
+    chat = await prepare_pm_chat(msg, current_user, db, pm_context)
+    turn = await start_conversation_turn(msg, current_user, db, chat)
+    system_prompt = turn.system_prompt if turn else chat.system_prompt
+    history = turn.history if turn else None
+
+    cache_key = None
+    response_text = None
+    if response_cache is not None and chat.cache_responses:
+        cache_key = response_cache_key(chat, system_prompt, msg.message, history)
+        response_text = await response_cache.get(cache_key)
+
     # Call the LLM
-    try:
-        endpoint = normalize_ollama_endpoint(
-            account.provider,
-            account.api_endpoint or "https://api.openai.com/v1"
-        )
-        response_text = await call_llm(
-            endpoint,
-            account.access_token,
-            model_to_use,
-            context,
-            msg.message
-        )
-        
-        return ChatResponse(
-            response=response_text,
-            model_used=f"{account.provider}:{model_to_use}"
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error calling LLM: {str(e)}")
+    if response_text is None:
+        try:
+            response_text = await call_llm(
+                http_clients,
+                chat.endpoint,
+                chat.access_token,
+                chat.model,
+                system_prompt,
+                msg.message,
+                history=history
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error calling LLM: {str(e)}")
+        if cache_key is not None:
+            await response_cache.put(cache_key, response_text)
+
+    if turn:
+        await conversations.record_turn(db, turn, msg.message, response_text, chat.model_used)
+    return ChatResponse(
+        response=response_text,
+        model_used=chat.model_used,
+        conversation_id=msg.conversation_id
+    )
+
+@router.post("/pm/stream")
+async def chat_with_pm_stream(
+    msg: ChatMessage,
+    request: Request,
+    current_user: UserDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients),
+    pm_context: PMContextCache = Depends(get_pm_context_cache),
+    response_cache: Optional[LLMResponseCache] = Depends(get_response_cache)
+):
+    """Chat with the Project Manager AI, streaming the answer as Server-Sent Events.
+
+    Emits `start` (model used), then one `token` event per content delta, then
+    `done`, or `error` if the LLM call fails midway. The upstream request is
+    dropped as soon as the browser disconnects, even while waiting on a stalled
+    upstream. In a conversation, the turn is saved with whatever part of the
+    answer was streamed, also when the server cancels the stream. A cached
+    answer is sent as a single token event, with `cached` set on `start`.
+    """
+    chat = await prepare_pm_chat(msg, current_user, db, pm_context)
+    turn = await start_conversation_turn(msg, current_user, db, chat)
+    system_prompt = turn.system_prompt if turn else chat.system_prompt
+    history = turn.history if turn else None
+
+    cache_key = None
+    cached = None
+    if response_cache is not None and chat.cache_responses:
+        cache_key = response_cache_key(chat, system_prompt, msg.message, history)
+        cached = await response_cache.get(cache_key)
+
+    async def llm_deltas():
+        if cached is not None:
+            yield cached
+            return
+        async for delta in stream_llm(
+            http_clients,
+            chat.endpoint,
+            chat.access_token,
+            chat.model,
+            system_prompt,
+            msg.message,
+            history=history
+        ):
+            yield delta
+
+    async def events():
+        yield sse_event("start", {
+            "model_used": chat.model_used,
+            "conversation_id": msg.conversation_id,
+            "cached": cached is not None
+        })
+        parts = []
+        failed = False
+        completed = False
+        deltas = llm_deltas()
+        next_delta = None
+        disconnected = asyncio.ensure_future(wait_for_disconnect(request))
+
+        async def finish():
+            # Stop the upstream read first; the generator cannot be closed while it runs
+            if next_delta is not None and not next_delta.done():
+                next_delta.cancel()
+                await asyncio.gather(next_delta, return_exceptions=True)
+            await deltas.aclose()
+            if completed and cached is None and cache_key is not None:
+                await response_cache.put(cache_key, "".join(parts))
+            if turn and (parts or not failed):
+                # The request's session may already be closed once the response is streaming
+                async with AsyncSessionLocal() as session:
+                    await conversations.record_turn(session, turn, msg.message, "".join(parts), chat.model_used)
+
+        try:
+            while True:
+                # Race each upstream read against the disconnect, so a stalled upstream cannot hide it
+                next_delta = asyncio.ensure_future(deltas.__anext__())
+                await asyncio.wait({next_delta, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_delta.done():
+                    logger.info(f"Client disconnected, cancelling {chat.model_used} stream")
+                    break
+                try:
+                    delta = next_delta.result()
+                except StopAsyncIteration:
+                    completed = True
+                    break
+                parts.append(delta)
+                yield sse_event("token", {"content": delta})
+        except Exception as e:
+            failed = True
+            yield sse_event("error", {"detail": f"Error calling LLM: {str(e)}"})
+        finally:
+            disconnected.cancel()
+            # Shielded, so the turn and cache entry are saved even if Starlette cancels the stream
+            await asyncio.shield(run_detached(finish(), f"{chat.model_used} stream cleanup"))
+        if not failed:
+            yield sse_event("done", {})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/conversations", response_model=ConversationResponse)
+async def create_conversation(
+    payload: ConversationCreate,
+    current_user: UserDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Start a PM conversation; pass its id as `conversation_id` to keep history server-side"""
+    return await conversations.create_conversation(db, current_user.id, payload.title)
+
+@router.get("/conversations", response_model=List[ConversationResponse])
+async def list_conversations(
+    limit: int = 50,
+    current_user: UserDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await conversations.list_conversations(db, current_user.id, min(limit, 200))
+
+@router.get("/conversations/{conversation_id}/messages", response_model=List[ConversationMessageResponse])
+async def list_conversation_messages(
+    conversation_id: str,
+    limit: int = 50,
+    before_seq: Optional[int] = None,
+    current_user: UserDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    conversation = await conversations.get_conversation(db, current_user.id, conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found.")
+    return await conversations.list_messages(db, conversation_id, min(limit, 200), before_seq)
+
+@router.delete("/conversations/{conversation_id}")
+async def delete_conversation(
+    conversation_id: str,
+    current_user: UserDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    conversation = await conversations.get_conversation(db, current_user.id, conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found.")
+    await conversations.delete_conversation(db, conversation)
+    return {"message": "Conversation deleted successfully"}
 
 def get_default_model(provider: str) -> str:
     """Get default model for a provider"""
@@ -125,27 +391,67 @@ def get_default_model(provider: str) -> str:
     }
     return defaults.get(provider, "gpt-4")
 
-async def call_llm(endpoint: str, api_key: str, model: str, system_prompt: str, user_message: str) -> str:
+def llm_headers(api_key: Optional[str]) -> dict:
+    # Authorization is optional for Ollama self-hosted
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    return headers
+
+def completion_request(model: str, system_prompt: str, user_message: str, stream: bool = False,
+                       history: Optional[List[dict]] = None) -> dict:
+    body = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            *(history or []),
+            {"role": "user", "content": user_message}
+        ],
+        "temperature": TEMPERATURE,
+        "max_tokens": MAX_TOKENS
+    }
+    if stream:
+        body["stream"] = True
+    return body
+
+def response_cache_key(chat: PreparedChat, system_prompt: str, message: str,
+                       history: Optional[List[dict]] = None) -> str:
+    return LLMResponseCache.key(chat.endpoint, chat.provider, chat.model, TEMPERATURE,
+                                system_prompt, message, history)
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def wait_for_disconnect(request: Request):
+    """Returns once the client has gone away; the request body must already be read."""
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+# Strong references to cleanup tasks, which the event loop only holds weakly
+_detached: Set[asyncio.Task] = set()
+
+def run_detached(coro, what: str) -> asyncio.Task:
+    """Runs `coro` to completion even if whoever awaits it is cancelled; failures are logged."""
+    task = asyncio.ensure_future(coro)
+    _detached.add(task)
+
+    def done(t: asyncio.Task):
+        _detached.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            logger.error(f"{what} failed: {t.exception()}")
+
+    task.add_done_callback(done)
+    return task
+
+async def call_llm(http_clients: HTTPClientRegistry, endpoint: str, api_key: str, model: str, system_prompt: str, user_message: str,
+                   history: Optional[List[dict]] = None) -> str:
     """Call OpenAI-compatible API"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.session(timeout=30.0) as client:
         try:
-            # Build headers - Authorization is optional for Ollama self-hosted
-            headers = {"Content-Type": "application/json"}
-            if api_key:
-                headers["Authorization"] = f"Bearer {api_key}"
-            
             response = await client.post(
                 f"{endpoint}/chat/completions",
-                headers=headers,
-                json={
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message}
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 500
-                }
+                headers=llm_headers(api_key),
+                json=completion_request(model, system_prompt, user_message, history=history)
             )
             response.raise_for_status()
             data = response.json()
@@ -155,11 +461,53 @@ async def call_llm(endpoint: str, api_key: str, model: str, system_prompt: str,
         except Exception as e:
             raise Exception(f"Failed to call LLM: {str(e)}")
 
+async def stream_llm(
+    http_clients: HTTPClientRegistry,
+    endpoint: str,
+    api_key: str,
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    history: Optional[List[dict]] = None
+) -> AsyncIterator[str]:
+    """Stream content deltas from an OpenAI-compatible API (OpenAI, Azure, Ollama /v1).
+
+    The timeout applies to each read rather than the whole answer, so a long
+    completion only fails if the endpoint stalls. Closing the generator closes
+    the upstream response.
+    """
+    async with http_clients.session(timeout=30.0) as client:
+        async with client.stream(
+            "POST",
+            f"{endpoint}/chat/completions",
+            headers=llm_headers(api_key),
+            json=completion_request(model, system_prompt, user_message, stream=True, history=history)
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                raise Exception(f"LLM API error: {response.status_code} - {response.text}")
+            async for line in response.aiter_lines():
+                # Lines look like `data: {...}`; blank lines separate events
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    return
+                try:
+                    choices = json.loads(payload).get("choices") or []
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed stream chunk from {endpoint}: {payload[:200]}")
+                    continue
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    yield delta
+
 @router.get("/models/{account_id}")
 async def list_models(
     account_id: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    model_catalog: ModelCatalog = Depends(get_model_catalog)
 ):
     """List available models for an account by querying the endpoint"""
     from src.models.user import AccountDB
@@ -187,39 +535,9 @@ async def list_models(
     )
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Build headers - Authorization is optional for Ollama self-hosted
-            headers = {}
-            if account.access_token:
-                headers["Authorization"] = f"Bearer {account.access_token}"
-            
-            response = await client.get(
-                f"{endpoint}/models",
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                models = [m["id"] for m in data.get("data", [])]
-                if models:
-                    return {"models": sorted(models)}
-            
-            # If we got a response but no models or error, raise
-            raise HTTPException(
-                status_code=502,
-                detail=f"Could not retrieve models from {endpoint}. Status: {response.status_code}. Please verify your API endpoint and credentials."
-            )
-            
-    except httpx.TimeoutException:
-        raise HTTPException(
-            status_code=504,
-            detail=f"Timeout connecting to {endpoint}. Please verify the endpoint is accessible."
-        )
-    except httpx.HTTPError as e:
-        raise HTTPException(
-            status_code=502,
-            detail=f"Error connecting to {endpoint}: {str(e)}. Please verify your API endpoint and credentials."
-        )
+        return {"models": await model_catalog.list_models(endpoint, account.access_token)}
+    except ModelCatalogError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -9,6 +9,8 @@ from pydantic import BaseModel
 import uuid
 
 from src.storage.postgres import get_db
+from src.api.services.http_clients import HTTPClientRegistry, get_http_clients
+from src.api.services.pm_context import PMContextCache, get_pm_context_cache
 from src.api.middleware.auth import get_current_user
 from src.core.auth import security
 from src.clients.coder_mcp_client import CoderMCPClient
@@ -97,7 +99,8 @@ async def github_status(
 @router.delete("/github/disconnect")
 async def github_disconnect(
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pm_context: PMContextCache = Depends(get_pm_context_cache)
 ):
     result = await db.execute(
         select(AccountDB).where(
@@ -109,13 +112,15 @@ async def github_disconnect(
         return {"ok": True}
     await db.delete(account)
     await db.commit()
+    pm_context.invalidate_account(account.id, account.user_id, account.is_global)
     return {"ok": True}
 
 
 @router.get("/github/repos")
 async def github_repos(
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(AccountDB).where(
@@ -126,7 +131,7 @@ async def github_repos(
     if not account or not account.access_token:
         raise HTTPException(status_code=400, detail="GitHub not connected.")
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_clients.session(timeout=10.0) as client:
         res = await client.get(
             "https://api.github.com/user/repos?per_page=100&sort=updated",
             headers={"Authorization": f"Bearer {account.access_token}"},
@@ -144,7 +149,8 @@ async def github_repos(
 @router.get("/github/codespaces")
 async def github_codespaces(
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(AccountDB).where(
@@ -155,7 +161,7 @@ async def github_codespaces(
     if not account or not account.access_token:
         raise HTTPException(status_code=400, detail="GitHub not connected.")
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_clients.session(timeout=10.0) as client:
         res = await client.get(
             "https://api.github.com/user/codespaces?per_page=100",
             headers={"Authorization": f"Bearer {account.access_token}"},
@@ -193,7 +199,8 @@ async def github_codespaces(
 async def github_codespace_start(
     codespace_name: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(AccountDB).where(
@@ -204,7 +211,7 @@ async def github_codespace_start(
     if not account or not account.access_token:
         raise HTTPException(status_code=400, detail="GitHub not connected.")
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_clients.session(timeout=10.0) as client:
         res = await client.post(
             f"https://api.github.com/user/codespaces/{codespace_name}/start",
             headers={"Authorization": f"Bearer {account.access_token}"},
@@ -219,7 +226,8 @@ async def github_codespace_start(
 async def github_codespace_stop(
     codespace_name: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(AccountDB).where(
@@ -230,7 +238,7 @@ async def github_codespace_stop(
     if not account or not account.access_token:
         raise HTTPException(status_code=400, detail="GitHub not connected.")
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_clients.session(timeout=10.0) as client:
         res = await client.post(
             f"https://api.github.com/user/codespaces/{codespace_name}/stop",
             headers={"Authorization": f"Bearer {account.access_token}"},
@@ -244,6 +252,7 @@ async def github_codespace_stop(
 @router.post("/coder/oauth/login")
 async def coder_oauth_login(
     current_user: UserDB = Depends(get_current_user),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     client_id = os.getenv("CODER_OAUTH_CLIENT_ID")
     client_secret = os.getenv("CODER_OAUTH_CLIENT_SECRET")
@@ -256,7 +265,7 @@ async def coder_oauth_login(
     base_url = base_url.rstrip("/")
     discovery_url = f"{base_url}/.well-known/oauth-authorization-server"
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session(timeout=10.0) as client:
             discovery_res = await client.get(discovery_url)
             if discovery_res.status_code != 200:
                 raise HTTPException(status_code=502, detail="Failed to load Coder OAuth discovery.")
@@ -318,7 +327,8 @@ async def coder_accounts(
 async def delete_coder_account(
     account_id: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pm_context: PMContextCache = Depends(get_pm_context_cache)
 ):
     result = await db.execute(
         select(AccountDB).where(AccountDB.id == account_id)
@@ -331,6 +341,7 @@ async def delete_coder_account(
 
     await db.delete(account)
     await db.commit()
+    pm_context.invalidate_account(account.id, account.user_id, account.is_global)
     return {"ok": True}
 
 
@@ -338,7 +349,8 @@ async def delete_coder_account(
 async def coder_connect(
     payload: "CoderConnectRequest",
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     url = payload.url
     token = payload.token
@@ -348,7 +360,7 @@ async def coder_connect(
 
     base_url = url.rstrip("/")
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session(timeout=10.0) as client:
             res = await client.get(
                 f"{base_url}/api/v2/users/me",
                 headers={"Coder-Session-Token": token},
@@ -400,7 +412,8 @@ async def coder_connect(
 async def coder_exchange(
     payload: "CoderConnectRequest",
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     url = payload.url
     session_token = payload.token
@@ -410,7 +423,7 @@ async def coder_exchange(
 
     base_url = url.rstrip("/")
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session(timeout=10.0) as client:
             me_res = await client.get(
                 f"{base_url}/api/v2/users/me",
                 headers={"Coder-Session-Token": session_token},
@@ -473,7 +486,8 @@ async def coder_exchange(
 async def coder_workspaces(
     account_id: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(AccountDB).where(AccountDB.id == account_id)
@@ -487,7 +501,7 @@ async def coder_workspaces(
         raise HTTPException(status_code=400, detail="Coder account is missing credentials.")
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session(timeout=10.0) as client:
             res = await client.get(
                 f"{account.api_endpoint}/api/v2/workspaces",
                 params={"q": "owner:me", "limit": 100},
@@ -547,7 +561,8 @@ async def coder_workspace_files(
     workspace_ref: str | None = None,
     path: str = "/",
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(AccountDB).where(AccountDB.id == account_id)
@@ -569,7 +584,7 @@ async def coder_workspace_files(
         auth_type = extra.get("auth_type")
         if auth_type == "bearer":
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with http_clients.session(timeout=10.0) as client:
                     ws_res = await client.get(
                         f"{account.api_endpoint}/api/v2/workspaces/{workspace_id}",
                         headers=_coder_auth_headers(account),
@@ -665,7 +680,7 @@ async def coder_workspace_files(
                 folders.append({"name": name or entry_path, "path": entry_path})
             return {"path": normalized_path, "folders": folders}
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session(timeout=10.0) as client:
             res = await client.get(
                 f"{account.api_endpoint}/api/v2/workspaces/{workspace_id}/files",
                 params={"path": normalized_path},
@@ -747,7 +762,8 @@ async def coder_workspace_start(
     account_id: str,
     workspace_id: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(AccountDB).where(AccountDB.id == account_id)
@@ -761,7 +777,7 @@ async def coder_workspace_start(
         raise HTTPException(status_code=400, detail="Coder account is missing credentials.")
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session(timeout=10.0) as client:
             res = await client.post(
                 f"{account.api_endpoint}/api/v2/workspaces/{workspace_id}/builds",
                 json={"transition": "start", "reason": "dashboard"},
@@ -786,7 +802,8 @@ async def coder_workspace_stop(
     account_id: str,
     workspace_id: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(AccountDB).where(AccountDB.id == account_id)
@@ -800,7 +817,7 @@ async def coder_workspace_stop(
         raise HTTPException(status_code=400, detail="Coder account is missing credentials.")
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session(timeout=10.0) as client:
             res = await client.post(
                 f"{account.api_endpoint}/api/v2/workspaces/{workspace_id}/builds",
                 json={"transition": "stop", "reason": "dashboard"},
@@ -6,6 +6,8 @@ from pydantic import BaseModel
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.storage.postgres import get_db
+from src.api.services.http_clients import HTTPClientRegistry, get_http_clients
+from src.api.services.pm_context import PMContextCache, get_pm_context_cache
 from sqlalchemy.future import select
 import httpx
 import uuid
@@ -72,7 +74,8 @@ class ProjectUpdate(BaseModel):
 async def create_project(
     project_in: ProjectCreate, 
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pm_context: PMContextCache = Depends(get_pm_context_cache)
 ):
     print(f"DEBUG: Creating project for user {current_user.id}: {project_in.model_dump()}")
     try:
@@ -85,6 +88,7 @@ async def create_project(
         db.add(db_project)
         await db.commit()
         await db.refresh(db_project)
+        pm_context.invalidate_user(current_user.id)
         print(f"DEBUG: Project created successfully: {project_id}")
         return db_project
     except Exception as e:
@@ -130,7 +134,8 @@ async def get_project_status(
 async def get_project_github_summary(
     project_id: str,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http_clients: HTTPClientRegistry = Depends(get_http_clients)
 ):
     result = await db.execute(
         select(ProjectDB).where(ProjectDB.id == project_id, ProjectDB.user_id == current_user.id)
@@ -164,7 +169,7 @@ async def get_project_github_summary(
     owner, repo = repo_full.split("/", 1)
     headers = {"Authorization": f"Bearer {account.access_token}"}
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session(timeout=10.0) as client:
             issues_res = await client.get(
                 f"https://api.github.com/repos/{owner}/{repo}/issues",
                 params={"state": "open", "per_page": 5},
@@ -199,7 +204,8 @@ async def update_project(
     project_id: str,
     project_in: ProjectUpdate,
     current_user: UserDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pm_context: PMContextCache = Depends(get_pm_context_cache)
 ):
     result = await db.execute(
         select(ProjectDB).where(ProjectDB.id == project_id, ProjectDB.user_id == current_user.id)
@@ -214,4 +220,5 @@ async def update_project(
 
     await db.commit()
     await db.refresh(project)
+    pm_context.invalidate_user(current_user.id)
     return project
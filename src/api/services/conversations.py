@@ -0,0 +1,127 @@
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src.core.conversation_context import (
+    build_window, estimate_tokens, fold_summary, history_budget, with_summary
+)
+from src.models.user import ConversationDB, ConversationMessageDB
+
+MAX_TURNS = int(os.getenv("CONVERSATION_MAX_TURNS", "10"))
+HISTORY_TOKEN_CAP = int(os.getenv("CONVERSATION_HISTORY_TOKENS", "3000"))
+SUMMARY_TOKEN_BUDGET = int(os.getenv("CONVERSATION_SUMMARY_TOKENS", "400"))
+TITLE_CHARS = 60
+
+class ConversationTurn:
+    """Context for one turn: history to send, and the summary state to save with the turn."""
+
+    def __init__(self, conversation_id: str, system_prompt: str, history: List[Dict[str, str]],
+                 summary: Optional[str], summarized_through: int):
+        self.conversation_id = conversation_id
+        self.system_prompt = system_prompt
+        self.history = history
+        self.summary = summary
+        self.summarized_through = summarized_through
+
+async def create_conversation(db: AsyncSession, user_id: str, title: Optional[str] = None) -> ConversationDB:
+    conversation = ConversationDB(id=str(uuid.uuid4()), user_id=user_id, title=title,
+                                  summarized_through=0, message_count=0)
+    db.add(conversation)
+    await db.commit()
+    await db.refresh(conversation)
+    return conversation
+
+async def get_conversation(db: AsyncSession, user_id: str, conversation_id: str) -> Optional[ConversationDB]:
+    result = await db.execute(
+        select(ConversationDB).where(ConversationDB.id == conversation_id, ConversationDB.user_id == user_id)
+    )
+    return result.scalars().first()
+
+async def list_conversations(db: AsyncSession, user_id: str, limit: int = 50) -> List[ConversationDB]:
+    result = await db.execute(
+        select(ConversationDB).where(ConversationDB.user_id == user_id)
+        .order_by(ConversationDB.updated_at.desc()).limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def list_messages(db: AsyncSession, conversation_id: str, limit: int = 50,
+                        before_seq: Optional[int] = None) -> List[ConversationMessageDB]:
+    """The `limit` messages before `before_seq` (default: the latest), oldest first."""
+    query = select(ConversationMessageDB).where(ConversationMessageDB.conversation_id == conversation_id)
+    if before_seq is not None:
+        query = query.where(ConversationMessageDB.seq < before_seq)
+    result = await db.execute(query.order_by(ConversationMessageDB.seq.desc()).limit(limit))
+    return list(reversed(result.scalars().all()))
+
+async def delete_conversation(db: AsyncSession, conversation: ConversationDB):
+    await db.execute(
+        delete(ConversationMessageDB).where(ConversationMessageDB.conversation_id == conversation.id)
+    )
+    await db.delete(conversation)
+    await db.commit()
+
+async def prepare_turn(db: AsyncSession, conversation: ConversationDB, system_prompt: str,
+                       user_message: str, model: str, max_tokens: int) -> ConversationTurn:
+    """Builds the bounded context for the next turn.
+
+    Only messages newer than the summary are loaded. Those that no longer fit
+    the window are folded into the summary, which is saved by `record_turn`,
+    so each turn reads a window-sized slice of the conversation.
+    """
+    result = await db.execute(
+        select(ConversationMessageDB.seq, ConversationMessageDB.role,
+               ConversationMessageDB.content, ConversationMessageDB.token_count)
+        .where(ConversationMessageDB.conversation_id == conversation.id,
+               ConversationMessageDB.seq > conversation.summarized_through)
+        .order_by(ConversationMessageDB.seq)
+    )
+    history = [tuple(row) for row in result.all()]
+
+    summary = conversation.summary
+    # Budget the window against the summary as it stands; folding only adds a few short lines
+    budget = history_budget(model, with_summary(system_prompt, summary), user_message, max_tokens,
+                            HISTORY_TOKEN_CAP)
+    window = build_window(history, budget, MAX_TURNS)
+    summarized_through = conversation.summarized_through
+    if window.evicted:
+        summary = fold_summary(summary, window.evicted, SUMMARY_TOKEN_BUDGET)
+        summarized_through = window.evicted_through
+    return ConversationTurn(conversation.id, with_summary(system_prompt, summary), window.messages,
+                            summary, summarized_through)
+
+async def record_turn(db: AsyncSession, turn: ConversationTurn, user_message: str,
+                      reply: Optional[str], model_used: str):
+    """Appends the user message and the reply (if any) and saves the folded summary."""
+    result = await db.execute(
+        select(ConversationDB).where(ConversationDB.id == turn.conversation_id).with_for_update()
+    )
+    conversation = result.scalars().first()
+    if conversation is None:
+        return
+    entries = [("user", user_message, None)]
+    if reply:
+        entries.append(("assistant", reply, model_used))
+    for role, content, model in entries:
+        conversation.message_count += 1
+        db.add(ConversationMessageDB(
+            id=str(uuid.uuid4()),
+            conversation_id=conversation.id,
+            seq=conversation.message_count,
+            role=role,
+            content=content,
+            token_count=estimate_tokens(content),
+            model_used=model,
+        ))
+    # A concurrent turn may have folded further already; never move the summary backwards
+    if turn.summarized_through > conversation.summarized_through:
+        conversation.summary = turn.summary
+        conversation.summarized_through = turn.summarized_through
+    if not conversation.title:
+        conversation.title = " ".join(user_message.split())[:TITLE_CHARS]
+    conversation.updated_at = datetime.utcnow()
+    await db.commit()
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (optional: pip install httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def origin_of(url: str) -> str:
+    """`scheme://host:port` of a URL, the unit connections are pooled by."""
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port or DEFAULT_PORTS.get(scheme)
+    return f"{scheme}://{host}:{port}"
+
+def _no_cookies() -> CookieJar:
+    """A cookie jar whose policy rejects every cookie."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+class HTTPClientRegistry:
+    """Application-scoped httpx clients, one per origin.
+
+    Each origin gets its own connection pool, so `max_connections_per_host` caps
+    concurrent connections to any one upstream (GitHub, an LLM endpoint, a Coder
+    deployment) and a slow host cannot starve the others. Connections are kept
+    alive between requests. HTTP/2 is used when `h2` is installed. Only the
+    `max_hosts` most recently used origins keep a client; an evicted client is
+    closed once no request or stream made through a `session()` is using it,
+    however long that stream runs.
+
+    Clients are shared by every account and user, so they never store cookies:
+    a Set-Cookie from one caller's upstream would otherwise ride along on the
+    next caller's requests to that origin.
+    """
+
+    def __init__(self, http2: bool = True, max_connections_per_host: int = 20,
+                 max_keepalive_per_host: int = 10, keepalive_expiry: float = 60.0,
+                 timeout: float = 10.0, max_hosts: int = 64):
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("h2 is not installed, outbound API clients will use HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.max_hosts = max_hosts
+        self._clients: "OrderedDict[str, httpx.AsyncClient]" = OrderedDict()
+        # Requests and streams in flight per client, and evicted clients waiting for theirs
+        self._active: Dict[httpx.AsyncClient, int] = {}
+        self._retiring: Set[httpx.AsyncClient] = set()
+        self._closing: Set[asyncio.Task] = set()
+        self._closed = False
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        if self._closed:
+            raise RuntimeError("HTTP client registry is closed")
+        origin = origin_of(url)
+        client = self._clients.get(origin)
+        if client is not None:
+            self._clients.move_to_end(origin)
+            return client
+        client = httpx.AsyncClient(http2=self.http2, limits=self.limits, timeout=self.timeout,
+                                   cookies=_no_cookies())
+        self._clients[origin] = client
+        if len(self._clients) > self.max_hosts:
+            evicted, old = self._clients.popitem(last=False)
+            logger.debug(f"Retiring HTTP client for {evicted}")
+            self._retire(old)
+        return client
+
+    def _checkout(self, url: str) -> httpx.AsyncClient:
+        client = self.client_for(url)
+        self._active[client] = self._active.get(client, 0) + 1
+        return client
+
+    def _checkin(self, client: httpx.AsyncClient):
+        remaining = self._active.pop(client) - 1
+        if remaining:
+            self._active[client] = remaining
+        elif client in self._retiring:
+            self._retiring.discard(client)
+            self._close_soon(client)
+
+    def _retire(self, client: httpx.AsyncClient):
+        if self._active.get(client):
+            self._retiring.add(client)
+        else:
+            self._close_soon(client)
+
+    def _close_soon(self, client: httpx.AsyncClient):
+        task = asyncio.get_running_loop().create_task(client.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def session(self, timeout: Optional[float] = None) -> "PooledSession":
+        return PooledSession(self, timeout)
+
+    def stats(self) -> dict:
+        return {"http2": self.http2, "hosts": list(self._clients)}
+
+    async def aclose(self):
+        self._closed = True
+        clients = list(self._clients.values()) + list(self._retiring)
+        self._clients.clear()
+        self._retiring.clear()
+        for client in clients:
+            await client.aclose()
+        await asyncio.gather(*self._closing, return_exceptions=True)
+
+class PooledSession:
+    """Routes requests to the registry's client for each URL's origin.
+
+    Usable with `async with` where a throwaway `httpx.AsyncClient` used to be;
+    leaving the block does not close anything. Requests and streams made here
+    keep their client open until they finish, even if its origin is evicted.
+    """
+
+    def __init__(self, registry: HTTPClientRegistry, timeout: Optional[float] = None):
+        self.registry = registry
+        self.timeout = timeout
+
+    async def __aenter__(self) -> "PooledSession":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def _options(self, kwargs: dict) -> dict:
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        return kwargs
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        client = self.registry._checkout(url)
+        try:
+            return await client.request(method, url, **self._options(kwargs))
+        finally:
+            self.registry._checkin(client)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        client = self.registry._checkout(url)
+        try:
+            async with client.stream(method, url, **self._options(kwargs)) as response:
+                yield response
+        finally:
+            self.registry._checkin(client)
+
+def get_http_clients(request: Request) -> HTTPClientRegistry:
+    """FastAPI dependency for the registry created in the app lifespan."""
+    return request.app.state.http_clients
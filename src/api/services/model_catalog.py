@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import Request
+
+from src.api.services.http_clients import HTTPClientRegistry
+
+logger = logging.getLogger(__name__)
+
+class ModelCatalogError(Exception):
+    """Listing models failed; carries the HTTP status the API should answer with."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+class _CatalogEntry:
+    def __init__(self, endpoint: str, api_key: Optional[str], models: List[str]):
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.models = models
+        self.fetched_at = time.monotonic()
+        self.used_at = self.fetched_at
+
+class ModelCatalog:
+    """Model lists of OpenAI-compatible endpoints (`GET {endpoint}/models`), cached per endpoint and key.
+
+    A list younger than `ttl` is served as is. Up to `stale_ttl` later it is
+    still served immediately while a refresh runs in the background. Concurrent
+    callers for the same endpoint share one upstream request. While running,
+    a background loop also refreshes lists that were used recently and are
+    about to go stale, so a slow host (a busy Ollama box) rarely blocks a page.
+    Endpoints and keys that are not saved in an account go through
+    `fetch_models`, which neither caches nor keeps the key.
+    """
+
+    def __init__(self, http_clients: HTTPClientRegistry, ttl: float = 300.0, stale_ttl: float = 3600.0,
+                 timeout: float = 10.0, max_entries: int = 256):
+        self.http_clients = http_clients
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], _CatalogEntry]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._refresher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(endpoint: str, api_key: Optional[str]) -> Tuple[str, str]:
+        # Different keys can see different models; only a digest of the key is kept in the index
+        return endpoint.rstrip("/"), hashlib.sha256((api_key or "").encode()).hexdigest()
+
+    async def list_models(self, endpoint: str, api_key: Optional[str] = None) -> List[str]:
+        key = self._key(endpoint, api_key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.used_at = time.monotonic()
+            self._entries.move_to_end(key)
+            age = entry.used_at - entry.fetched_at
+            if age < self.ttl:
+                return entry.models
+            if age < self.ttl + self.stale_ttl:
+                self._refresh(key, endpoint, api_key)
+                return entry.models
+        # Shielded so a caller that goes away does not cancel the fetch other callers wait on
+        return await asyncio.shield(self._refresh(key, endpoint, api_key))
+
+    async def fetch_models(self, endpoint: str, api_key: Optional[str] = None) -> List[str]:
+        """Lists models straight from the endpoint, bypassing the catalog."""
+        return await self._request(endpoint, api_key)
+
+    def invalidate(self, endpoint: str, api_key: Optional[str] = None):
+        """Forgets a list, e.g. when the account it belongs to changes or is deleted."""
+        key = self._key(endpoint, api_key)
+        self._entries.pop(key, None)
+        # A refresh already running must not store the list again
+        self._inflight.pop(key, None)
+
+    def _refresh(self, key: Tuple[str, str], endpoint: str, api_key: Optional[str]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fetch(key, endpoint, api_key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._fetched(key, t))
+        return task
+
+    def _fetched(self, key: Tuple[str, str], task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key)
+        if not task.cancelled() and task.exception() is not None:
+            # Also marks the exception retrieved when nobody awaited a background refresh
+            logger.debug(f"Model list refresh for {key[0]} failed: {task.exception()}")
+
+    async def _fetch(self, key: Tuple[str, str], endpoint: str, api_key: Optional[str]) -> List[str]:
+        models = await self._request(endpoint, api_key)
+        if self._inflight.get(key) is asyncio.current_task():
+            self._entries[key] = _CatalogEntry(endpoint, api_key, models)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return models
+
+    async def _request(self, endpoint: str, api_key: Optional[str]) -> List[str]:
+        # Authorization is optional for Ollama self-hosted
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        try:
+            async with self.http_clients.session(timeout=self.timeout) as client:
+                response = await client.get(f"{endpoint}/models", headers=headers)
+        except httpx.TimeoutException:
+            raise ModelCatalogError(
+                504, f"Timeout connecting to {endpoint}. Please verify the endpoint is accessible."
+            )
+        except httpx.HTTPError as e:
+            raise ModelCatalogError(
+                502, f"Error connecting to {endpoint}: {str(e)}. Please verify your API endpoint and credentials."
+            )
+
+        models = []
+        if response.status_code == 200:
+            try:
+                models = sorted(m["id"] for m in response.json().get("data", []))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                models = []
+        if not models:
+            raise ModelCatalogError(
+                502,
+                f"Could not retrieve models from {endpoint}. Status: {response.status_code}. "
+                "Please verify your API endpoint and credentials."
+            )
+        return models
+
+    def start(self, interval: Optional[float] = None):
+        """Starts refreshing recently used lists in the background, every `interval` seconds."""
+        if self._refresher is None:
+            self._refresher = asyncio.get_running_loop().create_task(self._refresh_loop(interval or self.ttl / 2))
+
+    async def _refresh_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for key, entry in list(self._entries.items()):
+                # Refresh what will go stale before the next pass, if anyone still uses it
+                if now - entry.fetched_at + interval >= self.ttl and now - entry.used_at < self.stale_ttl:
+                    self._refresh(key, entry.endpoint, entry.api_key)
+
+    async def aclose(self):
+        tasks = list(self._inflight.values())
+        if self._refresher is not None:
+            tasks.append(self._refresher)
+            self._refresher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def get_model_catalog(request: Request) -> ModelCatalog:
+    """FastAPI dependency for the catalog created in the app lifespan."""
+    return request.app.state.model_catalog
@@ -0,0 +1,71 @@
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+class PMContextCache:
+    """Per-user cache of prepared PM chat context (system prompt, account, model).
+
+    Entries are keyed by user and by the account/model the request asked for,
+    and remember the account they resolved to. Routes that change a user's
+    projects call `invalidate_user`; routes that change an account call
+    `invalidate_account`, which also reaches every other user whose context
+    resolved to that account. The TTL bounds how
+    long a change made by another process (another API worker, a migration)
+    can go unnoticed.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_users: int = 1024):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Dict[Hashable, tuple]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str, key: Hashable) -> Optional[Any]:
+        entries = self._users.get(user_id)
+        entry = entries.get(key) if entries is not None else None
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self.misses += 1
+            return None
+        self._users.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, user_id: str, key: Hashable, value: Any, account_id: Optional[str] = None):
+        self._users.setdefault(user_id, {})[key] = (time.monotonic(), value, account_id)
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    def invalidate_user(self, user_id: str):
+        if self._users.pop(user_id, None) is not None:
+            logger.debug(f"Invalidated PM context for user {user_id}")
+
+    def invalidate_all(self):
+        self._users.clear()
+
+    def invalidate_account(self, account_id: str, user_id: Optional[str], is_global: bool = False):
+        """Invalidates whoever can see an account: its owner, or everyone if it is global,
+        plus any entry of another user that resolved to it (e.g. while it was global)."""
+        if is_global or user_id is None:
+            self.invalidate_all()
+            return
+        self.invalidate_user(user_id)
+        for other, entries in list(self._users.items()):
+            stale = [key for key, entry in entries.items() if entry[2] == account_id]
+            for key in stale:
+                del entries[key]
+            if stale and not entries:
+                del self._users[other]
+
+    def stats(self) -> dict:
+        return {"users": len(self._users), "hits": self.hits, "misses": self.misses}
+
+def get_pm_context_cache(request: Request) -> PMContextCache:
+    """FastAPI dependency for the cache created in the app lifespan."""
+    return request.app.state.pm_context
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+class ResponseCacheBackend(ABC):
+    """Storage for cached LLM answers.
+
+    Subclass and register in BACKENDS to add one; BACKENDS entries are called
+    with `max_entries`.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float):
+        ...
+
+    @abstractmethod
+    async def clear(self):
+        ...
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    """Per-process LRU with a TTL per entry."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+BACKENDS = {"memory": InMemoryResponseCache}
+
+def normalize_prompt(text: str) -> str:
+    return " ".join(text.split())
+
+class LLMResponseCache:
+    """Caches LLM answers keyed by a hash of everything that shapes them.
+
+    The key covers endpoint, provider, model, temperature, the system prompt,
+    any conversation history and the whitespace-normalized user message. The
+    system prompt embeds the project list, so a project change is a new key.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend, ttl: float = 600.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(endpoint: str, provider: str, model: str, temperature: float, system_prompt: str,
+            message: str, history: Optional[List[Dict[str, str]]] = None) -> str:
+        payload = json.dumps(
+            [endpoint, provider, model, temperature, system_prompt,
+             [[m["role"], m["content"]] for m in history or []], normalize_prompt(message)],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM response cache lookup failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def put(self, key: str, value: str):
+        if not value:
+            return
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"LLM response cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self.backend).__name__, "ttl": self.ttl, "hits": self.hits, "misses": self.misses}
+
+def create_response_cache(backend: str = "memory", ttl: float = 600.0, max_entries: int = 1000) -> Optional[LLMResponseCache]:
+    """Builds the cache for a backend name from BACKENDS, or None when `backend` is "off"."""
+    if backend == "off":
+        return None
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM response cache backend {backend}, expected one of {sorted(BACKENDS)} or off")
+    return LLMResponseCache(BACKENDS[backend](max_entries=max_entries), ttl=ttl)
+
+def get_response_cache(request: Request) -> Optional[LLMResponseCache]:
+    """FastAPI dependency for the cache created in the app lifespan (None when disabled)."""
+    return getattr(request.app.state, "response_cache", None)
@@ -104,6 +104,7 @@ function showDashboard() {
 
 logoutBtn.addEventListener('click', () => {
     localStorage.removeItem('fulcrum_token');
+    localStorage.removeItem('pm_conversation_id');
     location.reload();
 });
 
@@ -1839,11 +1840,12 @@ if (sendChatBtn) {
             return;
         }
 
-        // Show typing indicator
-        const typingId = appendMessage('system', '...');
+        // Show typing indicator; the reply is streamed into this bubble
+        const typing = document.getElementById(appendMessage('system', '...'));
 
         try {
-            const res = await fetch(`${API_URL}/chat/pm`, {
+            const conversationId = await ensureConversation();
+            const res = await fetch(`${API_URL}/chat/pm/stream`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -1852,22 +1854,49 @@ if (sendChatBtn) {
                 body: JSON.stringify({
                     message: text,
                     model_name: localStorage.getItem('pm_model') || null,
-                    account_id: localStorage.getItem('pm_account_id') || null
+                    account_id: localStorage.getItem('pm_account_id') || null,
+                    conversation_id: conversationId
                 })
             });
 
-            const data = await res.json();
-
-            // Remove typing indicator
-            document.getElementById(typingId).remove();
-
-            if (res.ok) {
-                appendMessage('system', data.response);
-            } else {
+            if (!res.ok) {
+                if (res.status === 404) localStorage.removeItem('pm_conversation_id');
+                const data = await res.json();
+                typing.remove();
                 appendMessage('system', `Error: ${data.detail || 'Failed to get response'}`);
+                return;
+            }
+
+            // Server-Sent Events: "event: <name>\ndata: <json>\n\n"
+            const output = typing.querySelector('p');
+            const reader = res.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let started = false;
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    const block = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    const event = (block.match(/^event: (.*)$/m) || [])[1];
+                    const data = JSON.parse((block.match(/^data: (.*)$/m) || [, '{}'])[1]);
+                    if (event === 'token') {
+                        if (!started) {
+                            output.textContent = '';
+                            started = true;
+                        }
+                        output.textContent += data.content;
+                        chatMessages.scrollTop = chatMessages.scrollHeight;
+                    } else if (event === 'error') {
+                        output.textContent = `Error: ${data.detail || 'Failed to get response'}`;
+                    }
+                }
             }
         } catch (err) {
-            document.getElementById(typingId).remove();
+            typing.remove();
             console.error(err);
             appendMessage('system', 'Network error. Please try again.');
         }
@@ -1882,9 +1911,35 @@ if (sendChatBtn) {
     });
 }
 
+// History is kept server-side per conversation; the browser only remembers its id
+async function ensureConversation() {
+    let conversationId = localStorage.getItem('pm_conversation_id');
+    if (conversationId) return conversationId;
+    try {
+        const res = await fetch(`${API_URL}/chat/conversations`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${state.token}`
+            },
+            body: JSON.stringify({})
+        });
+        if (!res.ok) return null;
+        conversationId = (await res.json()).id;
+        localStorage.setItem('pm_conversation_id', conversationId);
+        return conversationId;
+    } catch (err) {
+        console.error(err);
+        return null;
+    }
+}
+
+// Messages appended within the same millisecond must still get distinct ids
+let messageCounter = 0;
+
 function appendMessage(sender, text) {
     const msgDiv = document.createElement('div');
-    const msgId = 'msg-' + Date.now();
+    const msgId = `msg-${Date.now()}-${++messageCounter}`;
     msgDiv.id = msgId;
     msgDiv.className = `message ${sender}`;
     msgDiv.style.alignSelf = sender === 'user' ? 'flex-end' : 'flex-start';
@@ -1,7 +1,8 @@
 import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Awaitable, Callable
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from src.clients.pool import CONNECTION_ERRORS
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,10 @@ class GitMCPClient:
             args=["mcp-server-git", "--repository", repository_path],
         )
         self.session: Optional[ClientSession] = None
-        self._exit_stack = None
+        self._client_context = None
+        # Bumped on every connect, so a failed call can tell whether someone already reconnected
+        self.generation = 0
+        self._reconnect_handler: Optional[Callable[[Optional[int]], Awaitable[None]]] = None
 
     async def __aenter__(self):
         await self.connect()
@@ -30,6 +34,7 @@ class GitMCPClient:
         self.session = ClientSession(read_stream, write_stream)
         await self.session.__aenter__()
         await self.session.initialize()
+        self.generation += 1
         logger.info(f"Connected to mcp-server-git for {self.repository_path}")
 
     async def disconnect(self):
@@ -42,11 +47,39 @@ class GitMCPClient:
             self._client_context = None
         logger.info(f"Disconnected from mcp-server-git for {self.repository_path}")
 
+    def set_reconnect_handler(self, handler: Optional[Callable[[Optional[int]], Awaitable[None]]]):
+        """Overrides how the client reconnects after the server process dies (used by MCPClientPool)."""
+        self._reconnect_handler = handler
+
+    async def reconnect(self, generation: Optional[int] = None):
+        """Reconnects after the session of `generation` (default: the current one) died."""
+        if self._reconnect_handler:
+            await self._reconnect_handler(generation)
+            return
+        try:
+            await self.disconnect()
+        except Exception as e:
+            logger.debug(f"Error tearing down dead mcp-server-git session: {e}")
+        await self.connect()
+
+    async def ping(self):
+        """Raises if the server is not responding."""
+        if not self.session:
+            raise RuntimeError("Not connected to mcp-server-git")
+        await self.session.send_ping()
+
     async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         if not self.session:
             raise RuntimeError("Not connected to mcp-server-git")
         
-        result = await self.session.call_tool(name, arguments)
+        generation = self.generation
+        try:
+            result = await self.session.call_tool(name, arguments)
+        except CONNECTION_ERRORS as e:
+            # The server crashed, restart it and retry once
+            logger.warning(f"mcp-server-git for {self.repository_path} went away ({e!r}), reconnecting")
+            await self.reconnect(generation)
+            result = await self.session.call_tool(name, arguments)
         if hasattr(result, "is_error") and result.is_error:
             raise RuntimeError(f"Tool {name} failed: {result.content}")
         
@@ -99,6 +132,11 @@ class GitMCPClient:
         # git_checkout: { "branch": string }
         return await self._call_tool("git_checkout", {"branch": branch})
 
+    async def list_remotes(self) -> List[Dict[str, str]]:
+        """Lists configured remotes."""
+        # remotes: [{"name": "origin", "url": "..."}]
+        return await self._call_tool("git_list_remotes", {})
+
     async def list_branches(self) -> List[Dict[str, Any]]:
         """Lists all local branches."""
         # git_list_branches doesn't exist in all versions, might be git_branches
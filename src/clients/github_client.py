@@ -1,22 +1,85 @@
+import asyncio
 import json
 import os
+import hashlib
 import subprocess
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Awaitable, Callable
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from src.clients.pool import CONNECTION_ERRORS
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds before retrying token resolution after neither gh nor GITHUB_TOKEN gave one
+TOKEN_RETRY_INTERVAL = 60.0
+
+_cached_token: Optional[str] = None
+_token_failed_at: Optional[float] = None
+
+# Substrings of github-mcp-server errors caused by a revoked or expired token
+_AUTH_ERROR_MARKERS = ("401", "Bad credentials", "Requires authentication")
+
+def resolve_github_token(refresh: bool = False) -> str:
+    """Resolves the GitHub token from the gh CLI or GITHUB_TOKEN, caching it per process.
+
+    Runs `gh auth token`, which blocks, so call it from a worker thread inside the
+    event loop. A failed lookup is only remembered for TOKEN_RETRY_INTERVAL seconds,
+    so a later `gh auth login` is picked up without a restart.
+    """
+    global _cached_token, _token_failed_at
+    if not refresh:
+        if _cached_token:
+            return _cached_token
+        if _token_failed_at is not None and time.monotonic() - _token_failed_at < TOKEN_RETRY_INTERVAL:
+            return ""
+    try:
+        result = subprocess.run(
+            ["gh", "auth", "token"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        token = result.stdout.strip()
+    except Exception as e:
+        logger.warning(f"Could not get GitHub token from gh CLI: {e}")
+        token = os.getenv("GITHUB_TOKEN", "")
+    _cached_token = token or None
+    _token_failed_at = None if token else time.monotonic()
+    return token
+
+def _is_auth_error(result: Any) -> bool:
+    if not getattr(result, "is_error", False):
+        return False
+    text = " ".join(getattr(part, "text", "") or "" for part in result.content or [])
+    return any(marker in text for marker in _AUTH_ERROR_MARKERS)
+
+def github_pool_key(token: str) -> str:
+    """Pool key for a token that is safe to log."""
+    return "github:" + hashlib.sha256(token.encode()).hexdigest()[:12]
+
 class GitHubMCPClient:
     def __init__(self, token: Optional[str] = None):
-        self.token = token or self._get_gh_token()
+        # Without a token, connect() resolves one off the event loop
+        self.token = token
+        self.session: Optional[ClientSession] = None
+        self._client_context = None
+        # Bumped on every connect, so a failed call can tell whether someone already reconnected
+        self.generation = 0
+        self._reconnect_handler: Optional[Callable[[Optional[int]], Awaitable[None]]] = None
+
+    async def _get_gh_token(self, refresh: bool = False) -> str:
+        """Attempts to get token from gh CLI."""
+        return await asyncio.to_thread(resolve_github_token, refresh)
+
+    def _server_params(self) -> StdioServerParameters:
         # Using npx to run the server as it's more portable than docker in some local envs
         # unless docker is specifically preferred. 
         # The official server is @modelcontextprotocol/server-github
         # or the github/github-mcp-server docker image.
         # Let's try to use the docker image as suggested in IMPLEMENTATION_PLAN.md
-        self.server_params = StdioServerParameters(
+        return StdioServerParameters(
             command="docker",
             args=[
                 "run", "--rm", "-i", 
@@ -25,22 +88,15 @@ class GitHubMCPClient:
             ],
             env={**os.environ, "GITHUB_TOKEN": self.token} if self.token else os.environ
         )
-        self.session: Optional[ClientSession] = None
-        self._client_context = None
 
-    def _get_gh_token(self) -> str:
-        """Attempts to get token from gh CLI."""
-        try:
-            result = subprocess.run(
-                ["gh", "auth", "token"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout.strip()
-        except Exception as e:
-            logger.warning(f"Could not get GitHub token from gh CLI: {e}")
-            return os.getenv("GITHUB_TOKEN", "")
+    async def _refresh_token(self, stale: Optional[str]) -> bool:
+        """Re-resolves the token after `stale` was rejected; True if there is a different one to use."""
+        if self.token == stale:
+            token = await self._get_gh_token(refresh=True)
+            if token and token != stale:
+                logger.info("GitHub token changed, restarting github-mcp-server with the new one")
+                self.token = token
+        return self.token != stale
 
     async def __aenter__(self):
         await self.connect()
@@ -51,14 +107,17 @@ class GitHubMCPClient:
 
     async def connect(self):
         """Connects to the github-mcp-server."""
+        if not self.token:
+            self.token = await self._get_gh_token()
         if not self.token:
             raise RuntimeError("GitHub token not found. Please set GITHUB_TOKEN or authenticate with 'gh auth login'.")
         
-        self._client_context = stdio_client(self.server_params)
+        self._client_context = stdio_client(self._server_params())
         read_stream, write_stream = await self._client_context.__aenter__()
         self.session = ClientSession(read_stream, write_stream)
         await self.session.__aenter__()
         await self.session.initialize()
+        self.generation += 1
         logger.info("Connected to github-mcp-server")
 
     async def disconnect(self):
@@ -71,11 +130,44 @@ class GitHubMCPClient:
             self._client_context = None
         logger.info("Disconnected from github-mcp-server")
 
+    def set_reconnect_handler(self, handler: Optional[Callable[[Optional[int]], Awaitable[None]]]):
+        """Overrides how the client reconnects after the container exits (used by MCPClientPool)."""
+        self._reconnect_handler = handler
+
+    async def reconnect(self, generation: Optional[int] = None):
+        """Reconnects after the session of `generation` (default: the current one) died."""
+        if self._reconnect_handler:
+            await self._reconnect_handler(generation)
+            return
+        try:
+            await self.disconnect()
+        except Exception as e:
+            logger.debug(f"Error tearing down dead github-mcp-server session: {e}")
+        await self.connect()
+
+    async def ping(self):
+        """Raises if the server is not responding."""
+        if not self.session:
+            raise RuntimeError("Not connected to github-mcp-server")
+        await self.session.send_ping()
+
     async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         if not self.session:
             raise RuntimeError("Not connected to github-mcp-server")
         
-        result = await self.session.call_tool(name, arguments)
+        generation, token = self.generation, self.token
+        try:
+            result = await self.session.call_tool(name, arguments)
+        except CONNECTION_ERRORS as e:
+            # The container exited, start a new one and retry once
+            logger.warning(f"github-mcp-server went away ({e!r}), reconnecting")
+            await self.reconnect(generation)
+            generation = self.generation
+            result = await self.session.call_tool(name, arguments)
+        if _is_auth_error(result) and await self._refresh_token(token):
+            # The token was revoked or rotated by `gh auth login`: restart with the new one, retry once
+            await self.reconnect(generation)
+            result = await self.session.call_tool(name, arguments)
         if hasattr(result, "is_error") and result.is_error:
             raise RuntimeError(f"Tool {name} failed: {result.content}")
         
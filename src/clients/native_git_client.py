@@ -0,0 +1,171 @@
+import asyncio
+import os
+import logging
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+FIELD_SEP = "\x1f"
+RECORD_SEP = "\x1e"
+
+class NativeGitClient:
+    """In-process replacement for the read side of GitMCPClient.
+
+    Runs `git` directly with machine-readable output (porcelain v2, for-each-ref,
+    custom log formats) instead of a stdio JSON-RPC round-trip to mcp-server-git,
+    and returns the same dict shapes. Write operations stay on GitMCPClient.
+    """
+
+    def __init__(self, repository_path: str, git_binary: str = "git"):
+        self.repository_path = repository_path
+        self.git_binary = git_binary
+        # Read-only polling must not take index.lock away from the user's own git commands
+        self._env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "LC_ALL": "C"}
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+    async def connect(self):
+        """Nothing to connect to; kept for interface parity with GitMCPClient."""
+
+    async def disconnect(self):
+        """Nothing to disconnect from; kept for interface parity with GitMCPClient."""
+
+    async def ping(self):
+        pass
+
+    async def _git(self, *args: str) -> str:
+        proc = await asyncio.create_subprocess_exec(
+            self.git_binary, "-C", self.repository_path, *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._env,
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {stderr.decode(errors='replace').strip()}")
+        return stdout.decode(errors="replace")
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Returns current branch, dirty state, etc."""
+        porcelain, last_commit = await asyncio.gather(
+            self._git("status", "--porcelain=v2", "--branch", "-z"),
+            self._last_commit(),
+        )
+        status = self._parse_porcelain_v2(porcelain)
+        status["last_commit"] = last_commit
+        return status
+
+    @staticmethod
+    def _parse_porcelain_v2(output: str) -> Dict[str, Any]:
+        branch = "unknown"
+        ahead = behind = 0
+        modified: List[str] = []
+        untracked: List[str] = []
+
+        tokens = output.split("\0")
+        i = 0
+        while i < len(tokens):
+            line = tokens[i]
+            i += 1
+            if not line:
+                continue
+            if line.startswith("# branch.head "):
+                head = line[len("# branch.head "):]
+                branch = "HEAD" if head == "(detached)" else head
+            elif line.startswith("# branch.ab "):
+                a, b = line[len("# branch.ab "):].split()
+                ahead, behind = int(a), abs(int(b))
+            elif line.startswith("1 "):
+                modified.append(line.split(" ", 8)[8])
+            elif line.startswith("2 "):
+                modified.append(line.split(" ", 9)[9])
+                i += 1  # the original path of a rename follows as its own field
+            elif line.startswith("u "):
+                modified.append(line.split(" ", 10)[10])
+            elif line.startswith("? "):
+                untracked.append(line[2:])
+
+        return {
+            "branch": branch,
+            "is_dirty": bool(modified),
+            "ahead": ahead,
+            "behind": behind,
+            "modified_files": modified,
+            "untracked_files": untracked,
+        }
+
+    async def _last_commit(self) -> Dict[str, str]:
+        try:
+            log = await self.get_log(max_count=1)
+        except RuntimeError:
+            # Empty repository, no HEAD yet
+            return {}
+        return log[0] if log else {}
+
+    async def get_log(self, max_count: int = 10) -> List[Dict[str, Any]]:
+        """Returns commit history."""
+        fmt = FIELD_SEP.join(["%H", "%an", "%ae", "%aI", "%s"]) + RECORD_SEP
+        output = await self._git("log", f"-n{max_count}", f"--format={fmt}")
+        commits = []
+        for record in output.split(RECORD_SEP):
+            record = record.strip("\n")
+            if not record:
+                continue
+            sha, author, email, date, message = record.split(FIELD_SEP, 4)
+            commits.append({
+                "hash": sha,
+                "author": author,
+                "email": email,
+                "date": date,
+                "message": message,
+            })
+        return commits
+
+    async def list_branches(self) -> List[Dict[str, Any]]:
+        """Lists all local branches."""
+        fmt = FIELD_SEP.join(["%(HEAD)", "%(refname:short)", "%(objectname)", "%(committerdate:iso-strict)", "%(subject)"])
+        output = await self._git("for-each-ref", f"--format={fmt}", "refs/heads")
+        branches = []
+        for line in output.splitlines():
+            if not line:
+                continue
+            head, name, sha, date, subject = line.split(FIELD_SEP, 4)
+            branches.append({
+                "name": name,
+                "is_current": head == "*",
+                "commit": sha,
+                "last_commit_date": date,
+                "message": subject,
+            })
+        return branches
+
+    async def list_remotes(self) -> List[Dict[str, str]]:
+        """Lists configured remotes with their fetch URLs."""
+        try:
+            output = await self._git("config", "--get-regexp", r"^remote\..*\.url$")
+        except RuntimeError:
+            # git config exits with 1 when nothing matches
+            return []
+        remotes = []
+        for line in output.splitlines():
+            key, _, url = line.partition(" ")
+            name = key[len("remote."):-len(".url")]
+            remotes.append({"name": name, "url": url})
+        return remotes
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Dispatches the mcp-server-git read tools so callers can swap backends transparently."""
+        tools = {
+            "git_status": self.get_status,
+            "git_branches": self.list_branches,
+            "git_list_remotes": self.list_remotes,
+            "git_log": lambda: self.get_log(arguments.get("count", 10)),
+        }
+        if name not in tools:
+            raise RuntimeError(f"Tool {name} is not supported by the native git backend")
+        return await tools[name]()
@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+import anyio
+
+logger = logging.getLogger(__name__)
+
+# Raised by the stdio transport when the server process has died under us
+CONNECTION_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError)
+
+
+class _PooledClient:
+    """A connected MCP client owned by a dedicated keeper task.
+
+    The MCP stdio transport is built on anyio task groups, which must be
+    entered and exited from the same task. The keeper task connects the
+    client, parks until it is asked to stop, and then disconnects it, so
+    borrowers running in other tasks never touch the transport lifecycle.
+    """
+
+    def __init__(self, key: str, factory: Callable[[], Any]):
+        self.key = key
+        self.factory = factory
+        self.client: Any = None
+        self.refcount = 0
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self._stop: Optional[asyncio.Event] = None
+        self._ready: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _keep(self, ready: asyncio.Future, stop: asyncio.Event):
+        # The same client object is reconnected on restart so borrowers keep a valid handle
+        if self.client is None:
+            self.client = self.factory()
+        client = self.client
+        try:
+            await client.connect()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            return
+        if ready.done():
+            # The borrower that started us was cancelled while we were connecting
+            stop.set()
+        else:
+            ready.set_result(client)
+        try:
+            await stop.wait()
+        finally:
+            try:
+                await client.disconnect()
+            except Exception as e:
+                logger.debug(f"Error disconnecting pooled client {self.key}: {e}")
+
+    async def start(self):
+        async with self._lock:
+            await self._start_locked()
+
+    async def _start_locked(self):
+        if self.is_running:
+            return
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        self._stop = asyncio.Event()
+        self._ready = ready
+        self._task = asyncio.create_task(self._keep(ready, self._stop))
+        await ready
+        self.last_checked = time.monotonic()
+
+    async def stop(self):
+        async with self._lock:
+            await self._stop_locked()
+
+    async def _stop_locked(self):
+        if self._stop:
+            self._stop.set()
+        if self._task:
+            if self._ready is not None and (not self._ready.done() or self._ready.cancelled()):
+                # Still connecting: nobody holds the client, so don't wait out a slow connect
+                self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._stop = None
+        self._ready = None
+
+    def _generation(self) -> Optional[int]:
+        return getattr(self.client, "generation", None)
+
+    async def restart(self, generation: Optional[int] = None):
+        """Replaces the session of `generation` (default: whatever is running now).
+
+        Borrowers that saw the same session die all call this; only the first
+        respawns the server, the others find a newer generation and reuse it.
+        """
+        async with self._lock:
+            if generation is not None and self.is_running and self._generation() != generation:
+                return
+            logger.info(f"Restarting pooled MCP client for {self.key}")
+            await self._stop_locked()
+            await self._start_locked()
+
+    async def ensure_healthy(self, check_interval: float):
+        """Pings the server if it has not been checked recently and restarts it on failure."""
+        if not self.is_running:
+            await self.start()
+            return
+        if time.monotonic() - self.last_checked < check_interval:
+            return
+        generation = self._generation()
+        try:
+            await self.client.ping()
+            self.last_checked = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Health check failed for pooled MCP client {self.key}: {e}")
+            await self.restart(generation)
+
+
+class MCPClientPool:
+    """Bounded, process-wide pool of live MCP client sessions keyed by an arbitrary string.
+
+    A key maps to one connected client that is shared by every borrower, since an
+    MCP session multiplexes concurrent requests. Unused sessions are evicted after
+    `idle_timeout` seconds or when the pool is full and a new key is requested.
+    """
+
+    def __init__(self, max_size: int = 8, idle_timeout: float = 300.0, health_check_interval: float = 30.0):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._entries: Dict[str, _PooledClient] = {}
+        self._cond = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def acquire(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Returns a connected client for `key`, creating it with `factory` if needed."""
+        async with self._cond:
+            evicted = self._pop_idle_locked()
+            entry = self._entries.get(key)
+            while entry is None and len(self._entries) >= self.max_size:
+                lru = self._pop_lru_locked()
+                if lru is None:
+                    await self._cond.wait()
+                else:
+                    evicted.append(lru)
+                entry = self._entries.get(key)
+            if entry is None:
+                entry = _PooledClient(key, factory)
+                self._entries[key] = entry
+            entry.refcount += 1
+            entry.last_used = time.monotonic()
+        # Subprocess shutdown can be slow; never hold the pool lock for it
+        await self._stop_entries(evicted)
+
+        try:
+            await entry.ensure_healthy(self.health_check_interval)
+        except BaseException:
+            # Includes cancellation: the caller never gets a client, so it can never release it
+            await asyncio.shield(self.release(key, discard=True))
+            raise
+
+        client = entry.client
+        if hasattr(client, "set_reconnect_handler"):
+            client.set_reconnect_handler(entry.restart)
+        return client
+
+    async def release(self, key: str, discard: bool = False):
+        """Returns a borrowed client to the pool. `discard` drops the session immediately."""
+        async with self._cond:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount = max(0, entry.refcount - 1)
+            entry.last_used = time.monotonic()
+            if discard and entry.refcount == 0:
+                del self._entries[key]
+            else:
+                entry = None
+            self._cond.notify_all()
+        if entry is not None:
+            await entry.stop()
+
+    async def evict_idle(self):
+        """Disconnects every session that has been unused for longer than `idle_timeout`."""
+        async with self._cond:
+            evicted = self._pop_idle_locked()
+        await self._stop_entries(evicted)
+
+    async def close(self):
+        """Disconnects every pooled session."""
+        async with self._cond:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._cond.notify_all()
+        for entry in entries:
+            await entry.stop()
+
+    async def _stop_entries(self, entries):
+        for entry in entries:
+            await entry.stop()
+
+    def _pop_idle_locked(self) -> list:
+        now = time.monotonic()
+        idle = [
+            k for k, e in self._entries.items()
+            if e.refcount == 0 and now - e.last_used > self.idle_timeout
+        ]
+        evicted = []
+        for key in idle:
+            logger.info(f"Evicting idle MCP client for {key}")
+            evicted.append(self._entries.pop(key))
+        if idle:
+            self._cond.notify_all()
+        return evicted
+
+    def _pop_lru_locked(self) -> Optional[_PooledClient]:
+        candidates = [e for e in self._entries.values() if e.refcount == 0]
+        if not candidates:
+            return None
+        lru = min(candidates, key=lambda e: e.last_used)
+        del self._entries[lru.key]
+        return lru
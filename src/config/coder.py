@@ -1,29 +1,41 @@
 import os
 import subprocess
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic_settings import BaseSettings
-from pydantic import Field
+from pydantic import Field, PrivateAttr
+from src.config.discovery import ProjectIndex
 
 class CoderSettings(BaseSettings):
     workspace_name: Optional[str] = Field(default=None, env="CODER_WORKSPACE_NAME")
     projects_root: str = Field(default="/home/coder/Projects", env="PROJECTS_ROOT")
+    # "mcp" talks to mcp-server-git, "native" runs read-only git commands in-process
+    git_backend: str = Field(default="mcp", env="GIT_BACKEND")
+    # Upper bound on how stale the project index can get when a change is not seen by inotify
+    discovery_rescan_interval: float = Field(default=300.0, env="PROJECTS_RESCAN_INTERVAL")
+
+    _project_index: Optional[ProjectIndex] = PrivateAttr(default=None)
     
     @property
     def is_coder_workspace(self) -> bool:
         """Detects if running inside a Coder workspace."""
         return self.workspace_name is not None or os.getenv("CODER") == "true"
 
+    @property
+    def project_index(self) -> ProjectIndex:
+        """The discovery index for the current projects root, rebuilt if the root changed."""
+        if self._project_index is None or self._project_index.root != self.projects_root:
+            if self._project_index is not None:
+                self._project_index.close()
+            self._project_index = ProjectIndex(self.projects_root, self.discovery_rescan_interval)
+        return self._project_index
+
     def get_available_projects(self) -> List[str]:
         """Lists all git repositories in the projects root."""
-        if not os.path.exists(self.projects_root):
-            return []
-        
-        projects = []
-        for d in os.listdir(self.projects_root):
-            path = os.path.join(self.projects_root, d)
-            if os.path.isdir(path) and os.path.exists(os.path.join(path, ".git")):
-                projects.append(d)
-        return sorted(projects)
+        return self.project_index.projects()
+
+    def get_projects_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """Default branch and last commit time (unix seconds) of every available project."""
+        return self.project_index.metadata()
 
     def verify_gh_auth(self) -> bool:
         """Checks if gh CLI is authenticated."""
@@ -0,0 +1,202 @@
+import ctypes
+import ctypes.util
+import os
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) event bits
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+
+REFLOG_TAIL = 64 * 1024
+
+class _Inotify:
+    """Non-blocking inotify descriptor; `changed()` drains pending events without a thread."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def watch(self, path: str):
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+
+    def changed(self) -> bool:
+        seen = False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    return seen
+                seen = True
+            except BlockingIOError:
+                return seen
+
+    def close(self):
+        os.close(self.fd)
+
+def _git_dir(project_path: str) -> Optional[str]:
+    dot_git = os.path.join(project_path, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        # Worktrees and submodules use a `gitdir: <path>` file
+        with open(dot_git, "r") as f:
+            line = f.readline().strip()
+    except OSError:
+        return None
+    if line.startswith("gitdir:"):
+        return os.path.join(project_path, line[len("gitdir:"):].strip())
+    return None
+
+def read_git_metadata(git_dir: str) -> Dict[str, Any]:
+    """Default branch and last commit time, read from files in .git without running git."""
+    default_branch = None
+    try:
+        # Set by clone: refs/remotes/origin/HEAD -> refs/remotes/origin/<default>
+        with open(os.path.join(git_dir, "refs", "remotes", "origin", "HEAD"), "r") as f:
+            ref = f.read().strip()
+        # Branch names may contain slashes (release/2.x), so strip the prefix rather than split
+        prefix = "ref: refs/remotes/origin/"
+        default_branch = ref[len(prefix):] if ref.startswith(prefix) else None
+    except OSError:
+        # No remote HEAD recorded, fall back to the checked-out branch
+        try:
+            with open(os.path.join(git_dir, "HEAD"), "r") as f:
+                head = f.read().strip()
+            if head.startswith("ref: refs/heads/"):
+                default_branch = head[len("ref: refs/heads/"):]
+        except OSError:
+            pass
+
+    last_commit_time = None
+    try:
+        with open(os.path.join(git_dir, "logs", "HEAD"), "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - REFLOG_TAIL))
+            lines = f.read().decode(errors="replace").splitlines()
+        # "<old> <new> Name <email> <unix time> <tz>\t<message>", newest last
+        for line in reversed(lines):
+            meta, _, message = line.partition("\t")
+            if message.startswith("commit"):
+                last_commit_time = int(meta.rsplit(" ", 2)[-2])
+                break
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return {"default_branch": default_branch, "last_commit_time": last_commit_time}
+
+class ProjectIndex:
+    """In-memory index of the git repositories directly under a projects root.
+
+    Listing is served from memory. The index is rebuilt only when inotify reports
+    an entry created, deleted or renamed in the root or in one of its project
+    directories. Without inotify (not Linux, or out of watches), the mtimes of the
+    root and of the directories in it are polled instead. A full rescan every `rescan_interval` seconds catches
+    anything the watches cannot see.
+    """
+
+    def __init__(self, root: str, rescan_interval: float = 300.0, use_inotify: bool = True):
+        self.root = root
+        self.rescan_interval = rescan_interval
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._scanned_at: Optional[float] = None
+        self._root_mtime: Optional[int] = None
+        self._dir_mtimes: Dict[str, Optional[int]] = {}
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.debug(f"inotify unavailable, polling {root} instead: {e}")
+
+    def projects(self) -> List[str]:
+        self._refresh_if_stale()
+        return list(self._projects)
+
+    def metadata(self) -> Dict[str, Dict[str, Any]]:
+        self._refresh_if_stale()
+        return {name: dict(meta) for name, meta in self._projects.items()}
+
+    def invalidate(self):
+        self._scanned_at = None
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _refresh_if_stale(self):
+        if self._scanned_at is None or time.monotonic() - self._scanned_at > self.rescan_interval:
+            self.refresh()
+        elif self._inotify is not None and self._root_mtime is not None:
+            if self._inotify.changed():
+                self.refresh(full=False)
+        elif self._stat_root() != self._root_mtime or self._dirs_changed():
+            # Also how a root that did not exist yet (so had no watch) gets picked up
+            self.refresh(full=False)
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _stat_root(self) -> Optional[int]:
+        return self._mtime(self.root)
+
+    def _dirs_changed(self) -> bool:
+        # A directory's mtime moves when .git is created or removed in it
+        return any(self._mtime(path) != mtime for path, mtime in self._dir_mtimes.items())
+
+    def _watch(self, path: str):
+        if self._inotify is None:
+            return
+        try:
+            self._inotify.watch(path)
+        except OSError as e:
+            logger.warning(f"Could not watch {path}, falling back to polling: {e}")
+            self.close()
+
+    def refresh(self, full: bool = True):
+        """Rescans the root. Unless `full`, metadata of already indexed projects is kept."""
+        if self._inotify is not None:
+            self._inotify.changed()  # events up to now are covered by this scan
+        self._root_mtime = self._stat_root()
+        self._scanned_at = time.monotonic()
+        projects: Dict[str, Dict[str, Any]] = {}
+        dir_mtimes: Dict[str, Optional[int]] = {}
+        if self._root_mtime is None:
+            self._projects = projects
+            self._dir_mtimes = dir_mtimes
+            return
+
+        self._watch(self.root)
+        try:
+            entries = sorted(os.scandir(self.root), key=lambda e: e.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            # Catches `git init` or a removed .git inside an existing directory
+            self._watch(entry.path)
+            dir_mtimes[entry.path] = self._mtime(entry.path)
+            git_dir = _git_dir(entry.path)
+            if git_dir is None:
+                continue
+            known = None if full else self._projects.get(entry.name)
+            projects[entry.name] = known if known is not None else read_git_metadata(git_dir)
+        self._projects = projects
+        self._dir_mtimes = dir_mtimes
@@ -0,0 +1,113 @@
+import json
+import os
+import sqlite3
+import logging
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    project TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest TEXT,
+    language TEXT,
+    manifest TEXT,
+    PRIMARY KEY (project, dir, name)
+) WITHOUT ROWID
+"""
+
+# (size, mtime_ns, inode, digest, language, manifest)
+CachedFile = Tuple[int, int, int, Optional[str], Optional[str], Optional[Dict[str, Any]]]
+
+class AnalysisCache:
+    """On-disk per-file metadata from earlier codebase scans, keyed by project root.
+
+    Lets CodebaseAnalyzer skip hashing and manifest parsing for files whose size,
+    mtime and inode are unchanged since the last scan.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+
+    def open(self, project: str) -> "ProjectScanCache":
+        return ProjectScanCache(sqlite3.connect(self.db_path, timeout=30), project)
+
+    def clear(self, project: Optional[str] = None):
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            if project is None:
+                conn.execute("DELETE FROM files")
+            else:
+                conn.execute("DELETE FROM files WHERE project = ?", (project,))
+
+class ProjectScanCache:
+    """One scan's view of the cache. Not thread-safe: used by the walker thread only.
+
+    Writes are buffered and committed together by `close()`, which also drops
+    rows of directories the scan no longer visited.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, project: str):
+        self.conn = conn
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.project = project
+        self._writes = []
+        self._visited: Set[str] = set()
+
+    def directory(self, rel_dir: str) -> Dict[str, CachedFile]:
+        self._visited.add(rel_dir)
+        rows = self.conn.execute(
+            "SELECT name, size, mtime_ns, inode, digest, language, manifest FROM files WHERE project = ? AND dir = ?",
+            (self.project, rel_dir),
+        )
+        return {
+            name: (size, mtime_ns, inode, digest, language, json.loads(manifest) if manifest else None)
+            for name, size, mtime_ns, inode, digest, language, manifest in rows
+        }
+
+    def put(self, rel_dir: str, name: str, size: int, mtime_ns: int, inode: int, digest: Optional[str],
+            language: Optional[str], manifest: Optional[Dict[str, Any]]):
+        self._writes.append((self.project, rel_dir, name, size, mtime_ns, inode, digest, language,
+                             json.dumps(manifest) if manifest is not None else None))
+        if len(self._writes) >= WRITE_BATCH:
+            self._flush()
+
+    def drop(self, rel_dir: str, names: Iterable[str]):
+        self.conn.executemany(
+            "DELETE FROM files WHERE project = ? AND dir = ? AND name = ?",
+            [(self.project, rel_dir, name) for name in names],
+        )
+
+    def _flush(self):
+        if self._writes:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._writes)
+            self._writes = []
+
+    def close(self, completed: bool = False):
+        """Commits the scan. Only a `completed` walk prunes directories it did not visit."""
+        try:
+            self._flush()
+            if completed:
+                cached_dirs = [row[0] for row in self.conn.execute(
+                    "SELECT DISTINCT dir FROM files WHERE project = ?", (self.project,)
+                )]
+                self.conn.executemany(
+                    "DELETE FROM files WHERE project = ? AND dir = ?",
+                    [(self.project, d) for d in cached_dirs if d not in self._visited],
+                )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not save analysis cache for {self.project}: {e}")
+        finally:
+            self.conn.close()
@@ -0,0 +1,169 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import logging
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install fulcrum-project-manager[zstd]
+    zstandard = None
+
+MANIFEST_NAME = "manifest.json"
+CHUNK_SIZE = 1 << 20
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+def atomic_write(path: str, write) -> None:
+    """Writes through a temp file in the target directory, then renames it into place."""
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+class ArtifactStore:
+    """Content-addressed blob store with a manifest per task.
+
+    Payloads are stored once under `blobs/<aa>/<sha256>[.gz|.zst]`, whatever task
+    or name they were saved under. `<task_id>/manifest.json` maps artifact file
+    names to blobs. Blobs and manifests are written to a temp file and renamed
+    into place, so readers never see partial data. Payloads smaller than
+    `compress_min_size` are stored raw, where compression would not pay off.
+    """
+
+    def __init__(self, root: str, compression: str = "gzip", compress_min_size: int = 1024):
+        if compression not in SUFFIXES:
+            raise ValueError(f"Unknown compression {compression}, expected one of {sorted(SUFFIXES)}")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, storing artifacts with gzip instead")
+            compression = "gzip"
+        self.root = root
+        self.compression = compression
+        self.compress_min_size = compress_min_size
+        self.blob_root = os.path.join(root, "blobs")
+        os.makedirs(self.blob_root, exist_ok=True)
+        self._manifest_lock = threading.Lock()
+
+    def task_path(self, task_id: str) -> str:
+        path = os.path.join(self.root, task_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _blob_dir(self, digest: str) -> str:
+        return os.path.join(self.blob_root, digest[:2])
+
+    def find_blob(self, digest: str) -> Optional[str]:
+        directory = self._blob_dir(digest)
+        for suffix in SUFFIXES.values():
+            path = os.path.join(directory, digest + suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def put_blob(self, data: bytes) -> Dict[str, Any]:
+        """Stores `data` unless an identical payload is already present."""
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self.find_blob(digest)
+        if existing is not None:
+            return {"blob": digest, "path": existing, "encoding": self._encoding_of(existing),
+                    "size": len(data), "stored_size": os.path.getsize(existing), "deduplicated": True}
+
+        encoding = self.compression if len(data) >= self.compress_min_size else "none"
+        if encoding == "gzip":
+            stored = gzip.compress(data, compresslevel=6, mtime=0)
+        elif encoding == "zstd":
+            stored = zstandard.ZstdCompressor(level=3).compress(data)
+        else:
+            stored = data
+        if encoding != "none" and len(stored) >= len(data):
+            encoding, stored = "none", data
+
+        directory = self._blob_dir(digest)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, digest + SUFFIXES[encoding])
+        atomic_write(path, lambda f: f.write(stored))
+        return {"blob": digest, "path": path, "encoding": encoding,
+                "size": len(data), "stored_size": len(stored), "deduplicated": False}
+
+    @staticmethod
+    def _encoding_of(path: str) -> str:
+        for encoding, suffix in SUFFIXES.items():
+            if suffix and path.endswith(suffix):
+                return encoding
+        return "none"
+
+    def open_blob(self, digest: str) -> BinaryIO:
+        """Opens a blob for streaming reads, decompressing on the fly."""
+        path = self.find_blob(digest)
+        if path is None:
+            raise FileNotFoundError(f"Blob {digest} not found")
+        encoding = self._encoding_of(path)
+        if encoding == "gzip":
+            return gzip.open(path, "rb")
+        if encoding == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd artifacts")
+            return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return open(path, "rb")
+
+    def load_manifest(self, task_id: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.root, task_id, MANIFEST_NAME), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def put(self, task_id: str, file_name: str, data: bytes) -> Dict[str, Any]:
+        """Stores `data` and records it in the task manifest under `file_name`."""
+        entry = self.put_blob(data)
+        record = {
+            "blob": entry["blob"],
+            "encoding": entry["encoding"],
+            "size": entry["size"],
+            "stored_size": entry["stored_size"],
+            "created_at": datetime.now().isoformat(),
+        }
+        manifest_path = os.path.join(self.task_path(task_id), MANIFEST_NAME)
+        with self._manifest_lock:
+            manifest = self.load_manifest(task_id)
+            manifest[file_name] = record
+            payload = json.dumps(manifest, indent=2).encode()
+            atomic_write(manifest_path, lambda f: f.write(payload))
+        return {**record, "path": entry["path"], "deduplicated": entry["deduplicated"]}
+
+    def open(self, task_id: str, file_name: str) -> BinaryIO:
+        record = self.load_manifest(task_id).get(file_name)
+        if record is not None:
+            return self.open_blob(record["blob"])
+        # Artifacts written before the blob store are plain files in the task directory
+        legacy = os.path.join(self.root, task_id, file_name)
+        if os.path.isfile(legacy):
+            return open(legacy, "rb")
+        raise FileNotFoundError(f"Artifact {file_name} not found for task {task_id}")
+
+    def iter_chunks(self, task_id: str, file_name: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        with self.open(task_id, file_name) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def read(self, task_id: str, file_name: str) -> bytes:
+        with self.open(task_id, file_name) as f:
+            return f.read()
@@ -0,0 +1,417 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import tomllib
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from src.core.analysis_cache import AnalysisCache
+
+logger = logging.getLogger(__name__)
+
+ALWAYS_SKIPPED = {".git", ".hg", ".svn"}
+PROGRESS_EVERY = 5000
+# Walker waits for hashing/parsing to catch up past this many in-flight files
+MAX_PENDING = 2000
+
+LANGUAGES = {
+    ".py": "Python", ".pyi": "Python", ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".jsx": "JavaScript", ".ts": "TypeScript", ".tsx": "TypeScript", ".go": "Go", ".rs": "Rust",
+    ".java": "Java", ".kt": "Kotlin", ".c": "C", ".h": "C", ".cc": "C++", ".cpp": "C++", ".hpp": "C++",
+    ".cs": "C#", ".rb": "Ruby", ".php": "PHP", ".swift": "Swift", ".scala": "Scala", ".sh": "Shell",
+    ".html": "HTML", ".css": "CSS", ".scss": "CSS", ".vue": "Vue", ".svelte": "Svelte", ".sql": "SQL",
+    ".md": "Markdown", ".rst": "reStructuredText", ".yml": "YAML", ".yaml": "YAML", ".toml": "TOML",
+    ".json": "JSON",
+}
+
+# Root manifests decide the project type, in this order of precedence
+PROJECT_TYPES = [
+    ("pyproject.toml", "Python"), ("requirements.txt", "Python"), ("setup.py", "Python"),
+    ("package.json", "Node.js"), ("go.mod", "Go"), ("Cargo.toml", "Rust"),
+]
+
+_REQUIREMENT_NAME = re.compile(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+def _requirement_name(spec: str) -> Optional[str]:
+    match = _REQUIREMENT_NAME.match(spec)
+    return match.group(1) if match else None
+
+def parse_pyproject(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    project = data.get("project", {})
+    poetry = data.get("tool", {}).get("poetry", {})
+    specs = list(project.get("dependencies") or data.get("dependencies") or [])
+    specs += [name for name in poetry.get("dependencies", {}) if name != "python"]
+    return {"ecosystem": "python", "name": project.get("name") or poetry.get("name"), "dependencies": specs}
+
+def parse_requirements(path: str) -> Dict[str, Any]:
+    specs = []
+    with open(path, "r", errors="replace") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line and not line.startswith("-"):
+                specs.append(line)
+    return {"ecosystem": "python", "name": None, "dependencies": specs}
+
+def parse_package_json(path: str) -> Dict[str, Any]:
+    with open(path, "r", errors="replace") as f:
+        data = json.load(f)
+    deps = list(data.get("dependencies", {})) + list(data.get("devDependencies", {}))
+    return {"ecosystem": "node", "name": data.get("name"), "dependencies": deps}
+
+def parse_go_mod(path: str) -> Dict[str, Any]:
+    name, deps, in_block = None, [], False
+    with open(path, "r", errors="replace") as f:
+        for line in f:
+            line = line.split("//", 1)[0].strip()
+            if line.startswith("module "):
+                name = line.split()[1]
+            elif line.startswith("require ("):
+                in_block = True
+            elif in_block and line == ")":
+                in_block = False
+            elif in_block and line:
+                deps.append(line.split()[0])
+            elif line.startswith("require "):
+                deps.append(line.split()[1])
+    return {"ecosystem": "go", "name": name, "dependencies": deps}
+
+def parse_cargo_toml(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    deps = list(data.get("dependencies", {})) + list(data.get("dev-dependencies", {}))
+    return {"ecosystem": "rust", "name": data.get("package", {}).get("name"), "dependencies": deps}
+
+MANIFEST_PARSERS: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "pyproject.toml": parse_pyproject,
+    "requirements.txt": parse_requirements,
+    "package.json": parse_package_json,
+    "go.mod": parse_go_mod,
+    "Cargo.toml": parse_cargo_toml,
+}
+
+def _glob_to_regex(pattern: str) -> str:
+    out, i = [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+class IgnoreRules:
+    """The .gitignore rules in effect for one directory, including inherited ones.
+
+    Supports the common subset of gitignore syntax: `*`, `?`, `**`, character
+    classes, `!` negation, trailing `/` for directories and `/` anchoring.
+    """
+
+    def __init__(self, rules: Optional[List[Tuple[re.Pattern, bool, bool, bool]]] = None):
+        self.rules = rules or []
+
+    def extend(self, base: str, lines: List[str]) -> "IgnoreRules":
+        rules = list(self.rules)
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            line = line.rstrip()
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if not line:
+                continue
+            if anchored:
+                prefix = re.escape(base + "/") if base else ""
+                regex = re.compile(prefix + _glob_to_regex(line) + r"\Z")
+            else:
+                regex = re.compile(_glob_to_regex(line) + r"\Z")
+            rules.append((regex, negate, dir_only, anchored))
+        return IgnoreRules(rules)
+
+    def ignored(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        # The last matching rule wins, so walk them backwards
+        for regex, negate, dir_only, anchored in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                return not negate
+        return False
+
+def _inspect(path: str, parser: Optional[Callable[[str], Dict[str, Any]]], with_digest: bool):
+    """Hashes a file and parses it if it is a manifest; runs in the thread pool."""
+    digest = None
+    if with_digest:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+    return digest, parser(path) if parser else None
+
+class _Cancelled(Exception):
+    pass
+
+class CodebaseAnalyzer:
+    """Walks a project tree once and reports languages, file counts and manifest dependencies.
+
+    The walk runs in a worker thread with os.scandir and never keeps per-file state,
+    so memory stays flat regardless of repository size. Manifests are parsed in a
+    thread pool while the walk continues. `stream()` yields progress and manifest
+    events as they happen, followed by a final `complete` event.
+
+    With an AnalysisCache, files whose size, mtime and inode match the previous
+    scan are neither read nor parsed again.
+    """
+
+    def __init__(self, root: str, max_workers: int = 4, respect_gitignore: bool = True,
+                 queue_size: int = 64, cache: Optional[AnalysisCache] = None):
+        self.root = os.path.abspath(root)
+        self.cache = cache
+        self.max_workers = max_workers
+        self.respect_gitignore = respect_gitignore
+        self.queue_size = queue_size
+
+    async def analyze(self) -> Dict[str, Any]:
+        analysis: Dict[str, Any] = {}
+        async for event in self.stream():
+            if event["event"] == "complete":
+                analysis = event["analysis"]
+        return analysis
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        # Bounded, so a slow consumer pauses the walk instead of buffering events
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        cancelled = threading.Event()
+        done = object()
+
+        def emit(event):
+            if cancelled.is_set():
+                raise _Cancelled()
+            asyncio.run_coroutine_threadsafe(queue.put(event), loop).result()
+
+        def run():
+            try:
+                return self._walk(emit)
+            finally:
+                if not cancelled.is_set():
+                    asyncio.run_coroutine_threadsafe(queue.put(done), loop).result()
+
+        walker = loop.run_in_executor(None, run)
+        try:
+            while True:
+                event = await queue.get()
+                if event is done:
+                    break
+                yield event
+            yield {"event": "complete", "analysis": await walker}
+        finally:
+            cancelled.set()
+            # Unblock a walker waiting on a full queue so its thread can exit
+            while not walker.done():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    await asyncio.sleep(0.01)
+
+    def _read_gitignore(self, directory: str) -> List[str]:
+        try:
+            with open(os.path.join(directory, ".gitignore"), "r", errors="replace") as f:
+                return f.readlines()
+        except OSError:
+            return []
+
+    def _walk(self, emit: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        files = directories = total_bytes = ignored = reused = 0
+        languages: Dict[str, Dict[str, int]] = {}
+        structure: List[str] = []
+        root_files = set()
+        manifests: List[Dict[str, Any]] = []
+        # (rel_dir, name, stat, language, future of (digest, manifest))
+        pending: List[Tuple[str, str, os.stat_result, Optional[str], Future]] = []
+        scan_cache = self.cache.open(self.root) if self.cache is not None else None
+
+        def add_manifest(rel: str, manifest: Dict[str, Any]):
+            manifests.append({"path": rel, **manifest})
+            emit({"event": "manifest", "path": rel, **manifest})
+
+        def collect(finished_only: bool):
+            remaining = []
+            for item in pending:
+                rel_dir, name, st, language, future = item
+                if finished_only and not future.done():
+                    remaining.append(item)
+                    continue
+                rel = f"{rel_dir}/{name}" if rel_dir else name
+                try:
+                    digest, manifest = future.result()
+                except Exception as e:
+                    logger.warning(f"Could not inspect {rel}: {e}")
+                    continue
+                if scan_cache is not None:
+                    scan_cache.put(rel_dir, name, st.st_size, st.st_mtime_ns, st.st_ino, digest, language, manifest)
+                if manifest is not None:
+                    add_manifest(rel, manifest)
+            pending[:] = remaining
+
+        root_rules = IgnoreRules()
+        if self.respect_gitignore:
+            root_rules = root_rules.extend("", self._read_gitignore(self.root))
+        stack: List[Tuple[str, str, IgnoreRules]] = [(self.root, "", root_rules)]
+
+        completed = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="manifest") as pool:
+                while stack:
+                    path, rel_dir, rules = stack.pop()
+                    directories += 1
+                    try:
+                        it = os.scandir(path)
+                    except OSError:
+                        continue
+                    cached = scan_cache.directory(rel_dir) if scan_cache is not None else {}
+                    seen = set()
+                    with it:
+                        for entry in it:
+                            name = entry.name
+                            rel = f"{rel_dir}/{name}" if rel_dir else name
+                            try:
+                                is_dir = entry.is_dir(follow_symlinks=False)
+                                if is_dir:
+                                    if name in ALWAYS_SKIPPED or rules.ignored(rel, name, True):
+                                        ignored += 1
+                                        continue
+                                    if not rel_dir and not name.startswith("."):
+                                        structure.append(name)
+                                    child_rules = rules
+                                    if self.respect_gitignore:
+                                        lines = self._read_gitignore(entry.path)
+                                        if lines:
+                                            child_rules = rules.extend(rel, lines)
+                                    stack.append((entry.path, rel, child_rules))
+                                    continue
+                                if not entry.is_file(follow_symlinks=False):
+                                    continue
+                                if rules.ignored(rel, name, False):
+                                    ignored += 1
+                                    continue
+                                st = entry.stat(follow_symlinks=False)
+                            except OSError:
+                                continue
+
+                            seen.add(name)
+                            files += 1
+                            total_bytes += st.st_size
+                            if not rel_dir:
+                                root_files.add(name)
+                            dot = name.rfind(".")
+                            language = LANGUAGES.get(name[dot:].lower()) if dot > 0 else None
+                            if language:
+                                stats = languages.setdefault(language, {"files": 0, "bytes": 0})
+                                stats["files"] += 1
+                                stats["bytes"] += st.st_size
+
+                            parser = MANIFEST_PARSERS.get(name)
+                            hit = cached.get(name)
+                            if hit is not None and hit[:3] == (st.st_size, st.st_mtime_ns, st.st_ino):
+                                # Unchanged since the last scan: no read, no hash, no parse
+                                reused += 1
+                                if hit[5] is not None:
+                                    add_manifest(rel, hit[5])
+                            elif scan_cache is not None or parser:
+                                pending.append((rel_dir, name, st, language,
+                                                pool.submit(_inspect, entry.path, parser, scan_cache is not None)))
+                                if len(pending) >= MAX_PENDING:
+                                    collect(finished_only=False)
+
+                            if files % PROGRESS_EVERY == 0:
+                                collect(finished_only=True)
+                                emit({"event": "progress", "files": files, "directories": directories,
+                                      "bytes": total_bytes})
+                    if scan_cache is not None and len(seen) < len(cached):
+                        scan_cache.drop(rel_dir, [name for name in cached if name not in seen])
+                collect(finished_only=False)
+            completed = True
+        finally:
+            if scan_cache is not None:
+                scan_cache.close(completed)
+
+        result = self._build_result(files, directories, total_bytes, ignored, languages, sorted(structure),
+                                    root_files, manifests)
+        if scan_cache is not None:
+            result["cache"] = {"reused": reused, "scanned": files - reused}
+        return result
+
+    def _build_result(self, files, directories, total_bytes, ignored, languages, structure, root_files,
+                      manifests) -> Dict[str, Any]:
+        project_type = next((t for manifest, t in PROJECT_TYPES if manifest in root_files), None)
+        if project_type is None:
+            code = {k: v for k, v in languages.items() if k not in ("Markdown", "reStructuredText", "YAML", "TOML", "JSON")}
+            project_type = max(code, key=lambda k: code[k]["bytes"]) if code else "unknown"
+
+        manifests.sort(key=lambda m: m["path"])
+        nodes = []
+        for m in manifests:
+            names = []
+            for spec in m["dependencies"]:
+                dep = _requirement_name(spec) if m["ecosystem"] == "python" else spec
+                if dep and dep not in names:
+                    names.append(dep)
+            nodes.append({"path": m["path"], "name": m["name"], "ecosystem": m["ecosystem"], "dependencies": names})
+
+        # Edges link manifests that depend on another package defined in the same tree
+        by_name = {(n["ecosystem"], n["name"]): n["path"] for n in nodes if n["name"]}
+        edges = [
+            [n["path"], by_name[(n["ecosystem"], dep)]]
+            for n in nodes
+            for dep in n["dependencies"]
+            if (n["ecosystem"], dep) in by_name and by_name[(n["ecosystem"], dep)] != n["path"]
+        ]
+
+        root_deps: List[str] = []
+        for n in nodes:
+            if "/" not in n["path"]:
+                root_deps.extend(d for d in n["dependencies"] if d not in root_deps)
+
+        return {
+            "type": project_type,
+            "structure": structure,
+            "dependencies": root_deps,
+            "files": files,
+            "directories": directories,
+            "bytes": total_bytes,
+            "ignored": ignored,
+            "languages": dict(sorted(languages.items(), key=lambda kv: -kv[1]["bytes"])),
+            "dependency_graph": {"nodes": nodes, "edges": edges},
+        }
@@ -0,0 +1,105 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Context windows in tokens, matched by longest model-name prefix
+CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "claude": 200000,
+    "llama3.1": 128000,
+    "llama3.2": 128000,
+    "llama3": 8192,
+    "mistral": 32768,
+    "qwen2.5": 32768,
+}
+DEFAULT_CONTEXT_WINDOW = 4096
+
+MESSAGE_OVERHEAD = 4  # role and separators per chat message
+SUMMARY_LINE_CHARS = 200
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Rough token count (about 4 characters per token for English text and code)."""
+    if not text:
+        return 0
+    return (len(text) + 3) // 4
+
+def context_window(model: str) -> int:
+    name = (model or "").lower().split("/")[-1]
+    best = None
+    for prefix in CONTEXT_WINDOWS:
+        if name.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return CONTEXT_WINDOWS[best] if best else DEFAULT_CONTEXT_WINDOW
+
+def history_budget(model: str, system_prompt: str, user_message: str, max_tokens: int, cap: int) -> int:
+    """Tokens left for history once the prompt, the new message and the answer are accounted for.
+
+    `cap` bounds the history even on very large context windows, so requests stay
+    small however long the conversation gets.
+    """
+    fixed = estimate_tokens(system_prompt) + estimate_tokens(user_message) + 2 * MESSAGE_OVERHEAD
+    return max(0, min(cap, context_window(model) - max_tokens - fixed))
+
+class ContextWindow:
+    """History to send with one turn, plus the messages that no longer fit."""
+
+    def __init__(self, messages: List[Dict[str, str]], evicted: List[Tuple[int, str, str]]):
+        self.messages = messages
+        self.evicted = evicted
+
+    @property
+    def evicted_through(self) -> Optional[int]:
+        return self.evicted[-1][0] if self.evicted else None
+
+def build_window(history: Sequence[Tuple[int, str, str, Optional[int]]], budget: int, max_turns: int) -> ContextWindow:
+    """Keeps the newest messages that fit in `budget` tokens and `max_turns` user/assistant pairs.
+
+    `history` holds `(seq, role, content, token_count)` for the messages not yet
+    folded into the summary, oldest first. Everything older than the kept
+    suffix is returned as evicted, oldest first.
+    """
+    kept = 0
+    used = 0
+    for seq, role, content, tokens in reversed(history):
+        cost = (tokens if tokens is not None else estimate_tokens(content)) + MESSAGE_OVERHEAD
+        if kept >= max_turns * 2 or used + cost > budget:
+            break
+        kept += 1
+        used += cost
+    # Never start the window on an assistant reply without the question it answers
+    while kept and history[len(history) - kept][1] != "user":
+        kept -= 1
+    split = len(history) - kept
+    return ContextWindow(
+        [{"role": role, "content": content} for _, role, content, _ in history[split:]],
+        [(seq, role, content) for seq, role, content, _ in history[:split]],
+    )
+
+def _first_sentence(text: str) -> str:
+    text = " ".join(text.split())
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    sentence = match.group(1) if match else text
+    if len(sentence) > SUMMARY_LINE_CHARS:
+        sentence = sentence[:SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+    return sentence
+
+def fold_summary(summary: Optional[str], evicted: Sequence[Tuple[int, str, str]], budget: int) -> str:
+    """Appends one line per evicted message to the rolling summary.
+
+    The summary is extractive (the opening sentence of each message), so folding
+    costs no extra LLM call. Its oldest lines are dropped to stay within `budget`.
+    """
+    lines = summary.splitlines() if summary else []
+    for _, role, content in evicted:
+        lines.append(f"- {role}: {_first_sentence(content)}")
+    total = sum(estimate_tokens(line) for line in lines)
+    while lines and total > budget:
+        total -= estimate_tokens(lines.pop(0))
+    return "\n".join(lines)
+
+def with_summary(system_prompt: str, summary: Optional[str]) -> str:
+    if not summary:
+        return system_prompt
+    return f"{system_prompt}\n\nEarlier in this conversation:\n{summary}"
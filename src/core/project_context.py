@@ -1,56 +1,134 @@
 import os
+import asyncio
 import logging
 from typing import List, Tuple, Optional, Dict, Any
 from src.clients.git_client import GitMCPClient
-from src.clients.github_client import GitHubMCPClient
+from src.clients.native_git_client import NativeGitClient
+from src.clients.github_client import GitHubMCPClient, resolve_github_token, github_pool_key
+from src.clients.pool import MCPClientPool
 from src.storage.db import TaskStorage
 from src.models.project import ProjectStatus, GitInfo, GitHubInfo, TaskSummary, Suggestion
 from src.config.coder import CoderSettings
 from src.core.suggestions import SuggestionsEngine
+from src.core.status_cache import StatusCache, git_state_fingerprint
 
 logger = logging.getLogger(__name__)
 
+# Per-source timeouts (seconds) for get_status; a source that times out is left empty
+DEFAULT_TIMEOUTS = {"git": 10.0, "github": 8.0, "tasks": 5.0, "linked_issues": 5.0}
+
+class _Uncached:
+    """A usable but incomplete status section, returned to the caller but kept out of the cache."""
+
+    def __init__(self, value: Any):
+        self.value = value
+
 class ProjectContext:
-    def __init__(self, project_name: str, coder_settings: CoderSettings, storage: TaskStorage):
+    def __init__(self, project_name: str, coder_settings: CoderSettings, storage: TaskStorage,
+                 git_pool: Optional[MCPClientPool] = None, github_pool: Optional[MCPClientPool] = None,
+                 timeouts: Optional[Dict[str, float]] = None, status_cache: Optional[StatusCache] = None,
+                 suggestions_engine: Optional[SuggestionsEngine] = None):
         self.project_name = project_name
         self.coder_settings = coder_settings
         self.storage = storage
         self.project_path = os.path.join(coder_settings.projects_root, project_name)
-        self.git_client = GitMCPClient(self.project_path)
-        self.github_client: Optional[GitHubMCPClient] = None # Will be initialized if needed
-        self.suggestions_engine = SuggestionsEngine()
+        # The native backend needs no session; with a pool we borrow a warm MCP session
+        # in initialize(), otherwise we own a one-shot client
+        self.git_pool = git_pool if coder_settings.git_backend != "native" else None
+        self.git_client: Optional[GitMCPClient | NativeGitClient] = None
+        if coder_settings.git_backend == "native":
+            self.git_client = NativeGitClient(self.project_path)
+        elif self.git_pool is None:
+            self.git_client = GitMCPClient(self.project_path)
+        self.github_pool = github_pool
+        self.github_client: Optional[GitHubMCPClient] = None # Connected lazily by _get_github_client
+        self._github_key: Optional[str] = None
+        self._github_unavailable = False
+        self.suggestions_engine = suggestions_engine or SuggestionsEngine()
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.status_cache = status_cache
 
     async def initialize(self):
         """Connects to MCP clients."""
-        await self.git_client.connect()
-        # GitHub client connection might need a token, we handle it inside
-        try:
-            self.github_client = GitHubMCPClient()
-            await self.github_client.connect()
-        except Exception as e:
-            logger.warning(f"Could not connect to GitHub MCP server: {e}")
-            self.github_client = None
+        if self.git_pool is not None:
+            self.git_client = await self.git_pool.acquire(
+                self.project_path, lambda: GitMCPClient(self.project_path)
+            )
+        else:
+            await self.git_client.connect()
+        # The GitHub session is only started once a GitHub remote is found, see _get_github_client
 
     async def close(self):
         """Disconnects from MCP clients."""
-        await self.git_client.disconnect()
+        if self.git_pool is not None:
+            if self.git_client:
+                await self.git_pool.release(self.project_path)
+                self.git_client = None
+        else:
+            await self.git_client.disconnect()
         if self.github_client:
-            await self.github_client.disconnect()
+            if self._github_key:
+                await self.github_pool.release(self._github_key)
+                self._github_key = None
+            else:
+                await self.github_client.disconnect()
+            self.github_client = None
+
+    async def _get_github_client(self) -> Optional[GitHubMCPClient]:
+        """Connects to GitHub MCP on first use, borrowing the shared session when pooled."""
+        if self.github_client or self._github_unavailable:
+            return self.github_client
+        try:
+            # Shells out to `gh auth token`, keep it off the event loop
+            token = await asyncio.to_thread(resolve_github_token)
+            if self.github_pool is not None:
+                key = github_pool_key(token)
+                self.github_client = await self.github_pool.acquire(key, lambda: GitHubMCPClient(token))
+                self._github_key = key
+            else:
+                client = GitHubMCPClient(token)
+                await client.connect()
+                self.github_client = client
+        except Exception as e:
+            logger.warning(f"Could not connect to GitHub MCP server: {e}")
+            self._github_unavailable = True
+        return self.github_client
 
     async def get_status(self, include_suggestions: bool = True) -> ProjectStatus:
-        """Aggregates data from multi MCP sources."""
-        git_info = await self.get_git_info()
-        github_info = await self.get_github_info(git_info)
-        tasks = self.storage.list_tasks(project_name=self.project_name)
-        
-        task_summary = self._create_task_summary(tasks)
+        """Aggregates data from multi MCP sources.
+
+        Git, GitHub and the task store are queried concurrently, each under its own
+        timeout, so a slow source only degrades its own section of the status.
+        Sections still valid in the status cache are not fetched at all.
+        """
+        task_revision = self.storage.revision(self.project_name)
+        # Walks .git/refs, so keep it off the event loop
+        git_token = await asyncio.to_thread(git_state_fingerprint, self.project_path)
+        sources = [
+            self._fetch("git", self._git_status_source, self._empty_git_info, token=git_token),
+            self._fetch("github", self.get_github_info, GitHubInfo),
+            # Counts and recent tasks are aggregated in SQL, so this stays flat as history grows
+            self._fetch("tasks", lambda: self.storage.summarize(self.project_name),
+                        self._empty_task_summary, token=task_revision),
+        ]
+        if include_suggestions:
+            # Only the linked issue numbers are needed, not the task history
+            sources.append(self._fetch(
+                "linked_issues",
+                lambda: self.storage.linked_issue_numbers(self.project_name),
+                set,
+                token=task_revision
+            ))
+        results = await asyncio.gather(*sources)
+        git_info, github_info, task_summary = results[:3]
         
         suggestions = []
         if include_suggestions:
             suggestions = self.suggestions_engine.generate_suggestions(
                 git_info=git_info,
                 github_info=github_info,
-                tasks=tasks
+                linked_issues=results[3],
+                task_summary=task_summary
             )
 
         return ProjectStatus(
@@ -62,14 +140,56 @@ class ProjectContext:
             suggestions=suggestions
         )
 
+    async def _fetch(self, source: str, fetch, fallback, token: Any = None):
+        """Loads one status source from the cache or via `fetch()` under its timeout.
+
+        Returns `fallback()` if the fetch fails or times out; fallbacks are never cached.
+        Neither are partial results, which `fetch()` returns wrapped in `_Uncached`.
+        """
+        if self.status_cache is not None:
+            cached = self.status_cache.get(self.project_name, source, token)
+            if cached is not None:
+                return cached
+        try:
+            value = await asyncio.wait_for(fetch(), timeout=self.timeouts[source])
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching {source} info for {self.project_name}")
+            return fallback()
+        except Exception as e:
+            logger.warning(f"Failed to fetch {source} info for {self.project_name}: {e}")
+            return fallback()
+        if isinstance(value, _Uncached):
+            return value.value
+        if self.status_cache is not None:
+            self.status_cache.put(self.project_name, source, value, token)
+        return value
+
+    @staticmethod
+    def _empty_task_summary() -> TaskSummary:
+        return TaskSummary(total=0, by_status={}, recent=[])
+
+    @staticmethod
+    def _empty_git_info() -> GitInfo:
+        return GitInfo(
+            branch="unknown", is_dirty=False, ahead=0, behind=0,
+            last_commit={}, modified_files=[], untracked_files=[]
+        )
+
     async def get_git_info(self) -> GitInfo:
         """Fetches git status from GitMCPClient."""
-        status = await self.git_client.get_status()
-        branches = []
-        try:
-            branches = await self.git_client.list_branches()
-        except Exception:
-            logger.debug("Failed to fetch branches")
+        info, _ = await self._read_git_info()
+        return info
+
+    async def _git_status_source(self):
+        info, complete = await self._read_git_info()
+        # Without branches the status is still worth showing, but not worth caching
+        return info if complete else _Uncached(info)
+
+    async def _read_git_info(self) -> Tuple[GitInfo, bool]:
+        status, branches = await asyncio.gather(
+            self.git_client.get_status(),
+            self._list_branches()
+        )
 
         return GitInfo(
             branch=status.get("branch", "unknown"),
@@ -79,29 +199,36 @@ class ProjectContext:
             last_commit=status.get("last_commit", {}),
             modified_files=status.get("modified_files", []),
             untracked_files=status.get("untracked_files", []),
-            branches=branches
-        )
+            branches=branches or []
+        ), branches is not None
 
-    async def get_github_info(self, git_info: GitInfo) -> GitHubInfo:
-        """Fetches GitHub info if possible."""
-        if not self.github_client:
-            return GitHubInfo()
-        
-        # Try to parse owner/repo from remote or last commit perhaps?
-        # Usually from `git remote -v` but GitMCP doesn't have a direct tool for it?
-        # Wait, mcp-server-git might have git_list_remotes
+    async def _list_branches(self) -> Optional[List[Dict[str, Any]]]:
         try:
-            remotes = await self.git_client._call_tool("git_list_remotes", {})
-            # remotes: [{"name": "origin", "url": "..."}]
-            origin = next((r["url"] for r in remotes if r["name"] == "origin"), None)
-            if origin:
-                owner, repo = self._parse_github_remote(origin)
-                issues = await self.github_client.list_issues(owner, repo)
-                return GitHubInfo(owner=owner, repo=repo, issues=issues)
+            return await self.git_client.list_branches()
         except Exception as e:
-            logger.debug(f"Failed to get GitHub info: {e}")
-            
-        return GitHubInfo()
+            logger.debug(f"Failed to fetch branches: {e}")
+            return None
+
+    async def get_github_info(self, git_info: Optional[GitInfo] = None) -> GitHubInfo:
+        """Fetches GitHub info if possible.
+
+        Returns an empty GitHubInfo when the project has no GitHub origin or no
+        GitHub access. Errors talking to git or GitHub propagate, so a transient
+        failure (5xx, rate limit) is not cached as "no issues".
+        """
+        remotes = await self.git_client.list_remotes()
+        origin = next((r["url"] for r in remotes if r["name"] == "origin"), None)
+        if not origin:
+            return GitHubInfo()
+        try:
+            owner, repo = self._parse_github_remote(origin)
+        except (ValueError, IndexError):
+            return GitHubInfo()
+        github_client = await self._get_github_client()
+        if not github_client:
+            return GitHubInfo()
+        issues = await github_client.list_issues(owner, repo)
+        return GitHubInfo(owner=owner, repo=repo, issues=issues)
 
     def _parse_github_remote(self, url: str) -> Tuple[str, str]:
         """Extracts owner/repo from GitHub URL."""
@@ -117,19 +244,3 @@ class ProjectContext:
             return parts[0], parts[1]
         
         raise ValueError(f"Not a GitHub URL: {url}")
-
-    def _create_task_summary(self, tasks: List[Any]) -> TaskSummary:
-        by_status = {}
-        for t in tasks:
-            by_status[t.status] = by_status.get(t.status, 0) + 1
-        
-        recent = [
-            {"id": t.id, "title": t.title, "status": t.status}
-            for t in sorted(tasks, key=lambda x: x.updated_at, reverse=True)[:5]
-        ]
-        
-        return TaskSummary(
-            total=len(tasks),
-            by_status=by_status,
-            recent=recent
-        )
@@ -1,44 +1,187 @@
 import os
 import json
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from src.models.task import Task, Deliverable
+from typing import BinaryIO, Iterator, List, Dict, Any, Optional, Tuple
+from src.models.task import Task, Deliverable, Artifact
+from src.core.artifact_store import ArtifactStore, MANIFEST_NAME, atomic_write
+from src.storage.db import TaskStorage
 
 logger = logging.getLogger(__name__)
 
+REPORT_NAME = "report.md"
+REPORT_FINGERPRINT = ".report.sha256"
+PREVIEW_BYTES = 4096
+PREVIEW_CHARS = 200
+
 class ResearchEngine:
-    def __init__(self, base_artifact_path: str):
+    """Stores research artifacts and renders task reports from them.
+
+    With `storage`, artifact listings come from its artifact index; the task
+    directory is only scanned for tasks that have nothing indexed.
+    """
+
+    def __init__(self, base_artifact_path: str, compression: str = "gzip", compress_min_size: int = 1024,
+                 storage: Optional[TaskStorage] = None):
         self.base_artifact_path = base_artifact_path
         os.makedirs(base_artifact_path, exist_ok=True)
+        self.store = ArtifactStore(base_artifact_path, compression, compress_min_size)
+        self.storage = storage
+        # Rendered artifact sections keyed by (file name, content hash), shared by all tasks.
+        # Reports are written from worker threads, hence the lock.
+        self._sections: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._sections_lock = threading.Lock()
+        self.max_cached_sections = 4096
 
     def get_task_artifact_path(self, task_id: str) -> str:
-        path = os.path.join(self.base_artifact_path, task_id)
-        os.makedirs(path, exist_ok=True)
-        return path
+        """Directory of a task's manifest and report; created by the first write, not here."""
+        return os.path.join(self.base_artifact_path, task_id)
+
+    def put_artifact(self, task_id: str, name: str, content: Any, format: str = "json") -> Tuple[str, Artifact]:
+        """Stores an artifact in the blob store.
+
+        Returns its logical path (`<task dir>/<name>.<format>`, as resolved by
+        `open_artifact`) and the Artifact record for the artifact index. Identical
+        payloads are stored once, across all tasks. Compresses and fsyncs, so async
+        callers should run it in a thread.
+        """
+        if format == "json":
+            data = json.dumps(content, indent=2).encode()
+        else:
+            data = str(content).encode()
+
+        file_name = f"{name}.{format}"
+        entry = self.store.put(task_id, file_name, data)
+        file_path = os.path.join(self.get_task_artifact_path(task_id), file_name)
+
+        logger.info(f"Saved artifact {name} for task {task_id} in blob {entry['path']}"
+                    f"{' (deduplicated)' if entry['deduplicated'] else ''}")
+        return file_path, Artifact(
+            task_id=task_id, name=file_name, format=format, size=entry["size"],
+            hash=entry["blob"], created_at=datetime.fromisoformat(entry["created_at"])
+        )
 
     def save_artifact(self, task_id: str, name: str, content: Any, format: str = "json"):
-        path = self.get_task_artifact_path(task_id)
-        file_path = os.path.join(path, f"{name}.{format}")
-        
-        with open(file_path, "w") as f:
-            if format == "json":
-                json.dump(content, f, indent=2)
-            else:
-                f.write(str(content))
-        
-        logger.info(f"Saved artifact {name} for task {task_id} at {file_path}")
-        return file_path
+        """Stores an artifact and returns its logical path."""
+        return self.put_artifact(task_id, name, content, format)[0]
 
-    def list_artifacts(self, task_id: str) -> List[str]:
-        path = self.get_task_artifact_path(task_id)
-        return os.listdir(path)
+    async def indexed_artifacts(self, task_id: str) -> Optional[List[Artifact]]:
+        """A task's artifacts from the artifact index, oldest first.
 
-    def generate_report(self, task: Task) -> str:
-        """Generates a markdown report summarizing all artifacts for a task."""
-        path = self.get_task_artifact_path(task.id)
-        artifacts = self.list_artifacts(task.id)
-        
+        None when there is no index or nothing of the task is indexed (artifacts
+        saved with `save_artifact` alone), meaning callers must scan the directory.
+        """
+        if self.storage is None:
+            return None
+        artifacts = await self.storage.list_artifacts(task_id=task_id, limit=None)
+        return list(reversed(artifacts)) or None
+
+    def list_artifacts(self, task_id: str, indexed: Optional[List[Artifact]] = None) -> List[str]:
+        """Artifact file names of a task, from `indexed` records when given, else from disk."""
+        if indexed:
+            return [a.name for a in indexed]
+        artifacts = list(self.store.load_manifest(task_id))
+        # Plain files from before the blob store, and the generated report
+        try:
+            names = os.listdir(self.get_task_artifact_path(task_id))
+        except FileNotFoundError:
+            return artifacts
+        for name in names:
+            if name not in (MANIFEST_NAME, REPORT_FINGERPRINT) and not name.startswith(".tmp-") and name not in artifacts:
+                artifacts.append(name)
+        return artifacts
+
+    def iter_indexed_artifacts(self) -> Iterator[Artifact]:
+        """Artifact records of every task, for (re)building the artifact index.
+
+        Covers manifest entries and plain files from before the blob store; the
+        latter are hashed like blobs, so identical payloads share a hash.
+        """
+        with os.scandir(self.base_artifact_path) as it:
+            for entry in it:
+                if not entry.is_dir() or entry.name == "blobs":
+                    continue
+                manifest = self.store.load_manifest(entry.name)
+                for file_name, record in manifest.items():
+                    yield Artifact(
+                        task_id=entry.name, name=file_name, format=file_name.rsplit(".", 1)[-1],
+                        size=record["size"], hash=record["blob"],
+                        created_at=datetime.fromisoformat(record["created_at"])
+                    )
+                for file_name in self.list_artifacts(entry.name):
+                    if file_name in manifest or file_name == REPORT_NAME:
+                        continue
+                    path = os.path.join(entry.path, file_name)
+                    try:
+                        with open(path, "rb") as f:
+                            digest = hashlib.file_digest(f, "sha256").hexdigest()
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield Artifact(
+                        task_id=entry.name, name=file_name, format=file_name.rsplit(".", 1)[-1],
+                        size=st.st_size, hash=digest, created_at=datetime.fromtimestamp(st.st_mtime)
+                    )
+
+    def open_artifact(self, task_id: str, file_name: str) -> BinaryIO:
+        """Streams an artifact back without loading it whole; `file_name` is `<name>.<format>`."""
+        return self.store.open(task_id, file_name)
+
+    def read_artifact(self, task_id: str, file_name: str) -> bytes:
+        return self.store.read(task_id, file_name)
+
+    def _artifact_keys(self, task_id: str, indexed: Optional[List[Artifact]] = None) -> List[Tuple[str, str]]:
+        """(file name, content key) per artifact; the key changes whenever the content does."""
+        if indexed:
+            return [(a.name, a.hash) for a in indexed if a.name != REPORT_NAME]
+        manifest = self.store.load_manifest(task_id)
+        keys = []
+        for name in self.list_artifacts(task_id):
+            if name == REPORT_NAME:
+                continue
+            record = manifest.get(name)
+            if record is not None:
+                keys.append((name, record["blob"]))
+                continue
+            try:
+                st = os.stat(os.path.join(self.base_artifact_path, task_id, name))
+            except OSError:
+                continue
+            # Unlike blob hashes, these say nothing about content, so they must not be shared across tasks
+            keys.append((name, f"legacy:{task_id}:{st.st_size}:{st.st_mtime_ns}"))
+        return keys
+
+    def _artifact_section(self, task_id: str, name: str, key: str) -> str:
+        with self._sections_lock:
+            cached = self._sections.get((name, key))
+            if cached is not None:
+                self._sections.move_to_end((name, key))
+                return cached
+
+        section = f"- {name}"
+        try:
+            # Only the head of the artifact is read, however large it is
+            with self.open_artifact(task_id, name) as f:
+                head = f.read(PREVIEW_BYTES).decode(errors="replace")
+            preview = next((line.strip() for line in head.splitlines() if line.strip()), "")
+            if preview:
+                if len(preview) > PREVIEW_CHARS:
+                    preview = preview[:PREVIEW_CHARS] + "..."
+                section += f"\n  > {preview}"
+        except OSError as e:
+            logger.warning(f"Could not preview artifact {name} of task {task_id}: {e}")
+
+        with self._sections_lock:
+            self._sections[(name, key)] = section
+            self._sections.move_to_end((name, key))
+            while len(self._sections) > self.max_cached_sections:
+                self._sections.popitem(last=False)
+        return section
+
+    def _report_header(self, task: Task) -> List[str]:
         report = [
             f"# Research Report: {task.title}",
             f"**Task ID**: {task.id}",
@@ -51,11 +194,51 @@ class ResearchEngine:
             report.append(f"- [{ 'x' if task.status == 'done' else ' ' }] {d.description or d.type} ({d.format})")
             
         report.append("\n## Artifacts Found")
-        for art in artifacts:
-            report.append(f"- {art}")
-            
-        report_path = os.path.join(path, "report.md")
-        with open(report_path, "w") as f:
-            f.write("\n".join(report))
-            
-        return "\n".join(report)
+        return report
+
+    def iter_report(self, task: Task, artifact_keys: Optional[List[Tuple[str, str]]] = None) -> Iterator[str]:
+        """Yields the markdown report line by line; unchanged artifact sections come from cache."""
+        lines = self._report_header(task)
+        for i, line in enumerate(lines):
+            yield line if i == 0 else "\n" + line
+        for name, key in artifact_keys if artifact_keys is not None else self._artifact_keys(task.id):
+            yield "\n" + self._artifact_section(task.id, name, key)
+
+    def write_report(self, task: Task, indexed: Optional[List[Artifact]] = None) -> str:
+        """Writes report.md by streaming it to disk, skipping the write if nothing changed.
+
+        `indexed` are the task's records from `indexed_artifacts`, if any. Returns
+        the report path.
+        """
+        path = self.store.task_path(task.id)
+        report_path = os.path.join(path, REPORT_NAME)
+        fingerprint_path = os.path.join(path, REPORT_FINGERPRINT)
+        artifact_keys = self._artifact_keys(task.id, indexed)
+
+        h = hashlib.sha256()
+        for line in self._report_header(task):
+            h.update(line.encode())
+        for name, key in artifact_keys:
+            h.update(f"\0{name}\0{key}".encode())
+        fingerprint = h.hexdigest()
+
+        try:
+            with open(fingerprint_path, "r") as f:
+                unchanged = f.read().strip() == fingerprint and os.path.exists(report_path)
+        except OSError:
+            unchanged = False
+        if unchanged:
+            return report_path
+
+        def write(f):
+            for chunk in self.iter_report(task, artifact_keys):
+                f.write(chunk.encode())
+
+        atomic_write(report_path, write)
+        atomic_write(fingerprint_path, lambda f: f.write(fingerprint.encode()))
+        return report_path
+
+    def generate_report(self, task: Task) -> str:
+        """Generates a markdown report summarizing all artifacts for a task."""
+        with open(self.write_report(task), "r") as f:
+            return f.read()
@@ -0,0 +1,69 @@
+import os
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {"git": 30.0, "github": 120.0, "tasks": 60.0, "linked_issues": 60.0}
+
+def git_state_fingerprint(project_path: str) -> Tuple:
+    """Cheap fingerprint of the repository state from .git/HEAD, .git/index and refs mtimes.
+
+    Any commit, checkout, stage, fetch or branch change rewrites at least one of these,
+    so a changed fingerprint means cached git data is stale.
+    """
+    git_dir = os.path.join(project_path, ".git")
+    stamps = []
+    for name in ("HEAD", "index", "packed-refs", "FETCH_HEAD"):
+        try:
+            stamps.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+        except OSError:
+            stamps.append(None)
+
+    # Ref updates write a lock file and rename it into place, which also bumps the directory mtime
+    latest_ref = 0
+    stack = [os.path.join(git_dir, "refs")]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    st = entry.stat(follow_symlinks=False)
+                    latest_ref = max(latest_ref, st.st_mtime_ns)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    stamps.append(latest_ref)
+    return tuple(stamps)
+
+class StatusCache:
+    """Per-project cache of the git, GitHub and task sections of a ProjectStatus.
+
+    Every section has its own TTL. Entries are also stored with a validity token
+    (the git fingerprint, the task storage revision) and are dropped as soon as the
+    caller presents a different token.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any, Any]] = {}
+
+    def get(self, project: str, section: str, token: Any = None) -> Optional[Any]:
+        entry = self._entries.get((project, section))
+        if entry is None:
+            return None
+        stored_at, stored_token, value = entry
+        if stored_token != token or time.monotonic() - stored_at > self.ttls.get(section, 0):
+            del self._entries[(project, section)]
+            return None
+        return value
+
+    def put(self, project: str, section: str, value: Any, token: Any = None):
+        self._entries[(project, section)] = (time.monotonic(), token, value)
+
+    def invalidate(self, project: str, section: Optional[str] = None):
+        """Drops one section of a project, or all of them."""
+        for key in list(self._entries):
+            if key[0] == project and (section is None or key[1] == section):
+                del self._entries[key]
@@ -1,68 +1,213 @@
-from typing import List, Dict, Any
-from src.models.project import GitInfo, GitHubInfo, Suggestion
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Optional, Set, Tuple
+from src.models.project import GitInfo, GitHubInfo, Suggestion, TaskSummary
 from src.models.task import Task, TaskStatus
 
+logger = logging.getLogger(__name__)
+
+INPUTS = ("git", "github", "tasks")
+
+class TaskState:
+    """The task facts rules may depend on: issue numbers linked to a task and counts per status."""
+
+    def __init__(self, linked_issues: Set[int], by_status: Dict[str, int]):
+        self.linked_issues = linked_issues
+        self.by_status = by_status
+
+    def serialize(self, fields: Optional[Tuple[str, ...]] = None) -> str:
+        parts = {"linked_issues": sorted(self.linked_issues), "by_status": sorted(self.by_status.items())}
+        return repr([parts[f] for f in fields or parts])
+
+class SuggestionRule:
+    """A named check over some of the status inputs.
+
+    `evaluate` is called with one keyword argument per declared input and returns
+    a list of suggestions. Results are memoized per fingerprint of those inputs;
+    `fields` narrows the fingerprint of an input to the attributes the rule reads
+    (e.g. {"git": ("ahead",)}), so changes elsewhere in it do not re-run the rule.
+    Rules whose output also depends on the clock set `max_age` in seconds.
+    """
+
+    def __init__(self, name: str, inputs: Tuple[str, ...], evaluate: Callable[..., List[Suggestion]],
+                 max_age: Optional[float] = None, fields: Optional[Dict[str, Tuple[str, ...]]] = None):
+        unknown = set(inputs) - set(INPUTS)
+        if unknown:
+            raise ValueError(f"Rule {name} depends on unknown inputs: {sorted(unknown)}")
+        undeclared = set(fields or {}) - set(inputs)
+        if undeclared:
+            raise ValueError(f"Rule {name} narrows inputs it does not declare: {sorted(undeclared)}")
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.evaluate = evaluate
+        self.max_age = max_age
+        self.fields = {name: tuple(names) for name, names in (fields or {}).items()}
+
+DEFAULT_RULES: List[SuggestionRule] = []
+
+def rule(name: str, inputs: Tuple[str, ...], max_age: Optional[float] = None,
+         fields: Optional[Dict[str, Tuple[str, ...]]] = None):
+    """Registers a function as one of the default suggestion rules."""
+    def decorator(func):
+        DEFAULT_RULES.append(SuggestionRule(name, inputs, func, max_age, fields))
+        return func
+    return decorator
+
+@rule("uncommitted_changes", ("git",), fields={"git": ("is_dirty", "modified_files")})
+def uncommitted_changes(git: GitInfo) -> List[Suggestion]:
+    if not git.is_dirty:
+        return []
+    return [Suggestion(
+        priority="high",
+        action="commit_changes",
+        description=f"You have {len(git.modified_files)} modified files that need to be committed.",
+        files=git.modified_files
+    )]
+
+@rule("unpushed_commits", ("git",), fields={"git": ("ahead",)})
+def unpushed_commits(git: GitInfo) -> List[Suggestion]:
+    if git.ahead <= 0:
+        return []
+    return [Suggestion(
+        priority="medium",
+        action="push_changes",
+        description=f"Your local branch is ahead of origin by {git.ahead} commits."
+    )]
+
+# Branches cross the 30 day mark as time passes, so the memoized result is refreshed hourly
+@rule("stale_branches", ("git",), max_age=3600.0, fields={"git": ("branch", "branches")})
+def stale_branches(git: GitInfo) -> List[Suggestion]:
+    suggestions = []
+    now = datetime.now()
+    for b in git.branches:
+        if b.get("name") == git.branch:
+            continue
+
+        # last_commit_date format depends on mcp-server-git, usually ISO string
+        last_date_str = b.get("last_commit_date")
+        if last_date_str:
+            try:
+                # Strip Z if present for fromisoformat in older python
+                last_date = datetime.fromisoformat(last_date_str.replace('Z', '+00:00'))
+                if now - last_date.replace(tzinfo=None) > timedelta(days=30):
+                    suggestions.append(Suggestion(
+                        priority="low",
+                        action="cleanup_branch",
+                        description=f"Branch '{b['name']}' hasn't been updated in over 30 days."
+                    ))
+            except (ValueError, TypeError):
+                pass
+    return suggestions
+
+@rule("unlinked_issues", ("github", "tasks"), fields={"github": ("issues",), "tasks": ("linked_issues",)})
+def unlinked_issues(github: GitHubInfo, tasks: TaskState) -> List[Suggestion]:
+    # If an issue is open and not linked to any task
+    return [
+        Suggestion(
+            priority="medium",
+            action="create_task_from_issue",
+            description=f"New GitHub issue: {issue['title']}",
+            issue_number=issue["number"]
+        )
+        for issue in github.issues
+        if issue["number"] not in tasks.linked_issues
+    ]
+
+@rule("idle_backlog", ("tasks",), fields={"tasks": ("by_status",)})
+def idle_backlog(tasks: TaskState) -> List[Suggestion]:
+    if tasks.by_status.get(TaskStatus.IN_PROGRESS.value) or not tasks.by_status.get(TaskStatus.TODO.value):
+        return []
+    return [Suggestion(
+        priority="low",
+        action="start_task",
+        description="You don't have any tasks in progress. Consider starting a new one."
+    )]
+
 class SuggestionsEngine:
-    def generate_suggestions(self, git_info: GitInfo, github_info: GitHubInfo, tasks: List[Task]) -> List[Suggestion]:
+    """Runs the registered rules, reusing earlier results for inputs that did not change.
+
+    Memoized results are keyed by rule and input fingerprint, so one engine can be
+    shared by every project. `rule_stats()` reports per-rule call counts, memo hits
+    and evaluation time.
+    """
+
+    def __init__(self, rules: Optional[List[SuggestionRule]] = None, max_entries: int = 512):
+        self.rules: List[SuggestionRule] = list(DEFAULT_RULES if rules is None else rules)
+        self.max_entries = max_entries
+        self._memo: "OrderedDict[Tuple[str, Tuple], Tuple[float, List[Suggestion]]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def register(self, rule: SuggestionRule):
+        self.rules = [r for r in self.rules if r.name != rule.name] + [rule]
+
+    def rule_stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def generate_suggestions(self, git_info: GitInfo, github_info: GitHubInfo,
+                             tasks: Optional[List[Task]] = None,
+                             linked_issues: Optional[Set[int]] = None,
+                             task_summary: Optional[TaskSummary] = None) -> List[Suggestion]:
+        """Builds suggestions from the project state.
+
+        Callers that already have `linked_issues` (issue numbers referenced by a task)
+        and a `task_summary` from storage can omit `tasks` entirely.
+        """
+        tasks = tasks or []
+        if linked_issues is None:
+            linked_issues = {t.github_issue_number for t in tasks if t.github_issue_number is not None}
+        if task_summary is not None:
+            by_status = task_summary.by_status
+        else:
+            by_status = {}
+            for t in tasks:
+                by_status[t.status.value] = by_status.get(t.status.value, 0) + 1
+
+        values = {"git": git_info, "github": github_info, "tasks": TaskState(linked_issues, by_status)}
+        fingerprints: Dict[Tuple[str, Optional[Tuple[str, ...]]], str] = {}
+
+        def fingerprint(name: str, fields: Optional[Tuple[str, ...]]):
+            # Computed at most once per call, and only for the inputs and fields some rule reads
+            if (name, fields) not in fingerprints:
+                value = values[name]
+                if isinstance(value, TaskState):
+                    serialized = value.serialize(fields)
+                else:
+                    serialized = value.model_dump_json(include=set(fields) if fields else None)
+                fingerprints[name, fields] = hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+            return fingerprints[name, fields]
+
         suggestions = []
-        
-        # 1. Check Git status
-        if git_info.is_dirty:
-            suggestions.append(Suggestion(
-                priority="high",
-                action="commit_changes",
-                description=f"You have {len(git_info.modified_files)} modified files that need to be committed.",
-                files=git_info.modified_files
-            ))
-        
-        if git_info.ahead > 0:
-            suggestions.append(Suggestion(
-                priority="medium",
-                action="push_changes",
-                description=f"Your local branch is ahead of origin by {git_info.ahead} commits."
-            ))
-
-        # 1b. Check for stale branches
-        from datetime import datetime, timedelta
-        now = datetime.now()
-        for b in git_info.branches:
-            if b.get("name") == git_info.branch:
+        for r in self.rules:
+            key = (r.name, tuple(fingerprint(name, r.fields.get(name)) for name in r.inputs))
+            stats = self._stats.setdefault(r.name, {"calls": 0, "hits": 0, "total_seconds": 0.0, "last_seconds": 0.0})
+            stats["calls"] += 1
+
+            cached = self._memo.get(key)
+            if cached is not None and (r.max_age is None or time.monotonic() - cached[0] <= r.max_age):
+                self._memo.move_to_end(key)
+                stats["hits"] += 1
+                suggestions.extend(cached[1])
                 continue
-            
-            # last_commit_date format depends on mcp-server-git, usually ISO string
-            last_date_str = b.get("last_commit_date")
-            if last_date_str:
-                try:
-                    # Strip Z if present for fromisoformat in older python
-                    last_date = datetime.fromisoformat(last_date_str.replace('Z', '+00:00'))
-                    if now - last_date.replace(tzinfo=None) > timedelta(days=30):
-                        suggestions.append(Suggestion(
-                            priority="low",
-                            action="cleanup_branch",
-                            description=f"Branch '{b['name']}' hasn't been updated in over 30 days."
-                        ))
-                except (ValueError, TypeError):
-                    pass
-
-        # 2. Check GitHub issues
-        for issue in github_info.issues:
-            # If an issue is open and not linked to any task
-            linked = any(t.github_issue_number == issue["number"] for t in tasks)
-            if not linked:
-                suggestions.append(Suggestion(
-                    priority="medium",
-                    action="create_task_from_issue",
-                    description=f"New GitHub issue: {issue['title']}",
-                    issue_number=issue["number"]
-                ))
-
-        # 3. Check Tasks
-        in_progress = [t for t in tasks if t.status == TaskStatus.IN_PROGRESS]
-        if not in_progress and any(t for t in tasks if t.status == TaskStatus.TODO):
-            suggestions.append(Suggestion(
-                priority="low",
-                action="start_task",
-                description="You don't have any tasks in progress. Consider starting a new one."
-            ))
+
+            start = time.perf_counter()
+            try:
+                result = r.evaluate(**{name: values[name] for name in r.inputs})
+            except Exception as e:
+                logger.warning(f"Suggestion rule {r.name} failed: {e}")
+                result = None
+            elapsed = time.perf_counter() - start
+            stats["total_seconds"] += elapsed
+            stats["last_seconds"] = elapsed
+            if result is None:
+                # Not memoized, so the rule is retried on the next call
+                continue
+
+            self._memo[key] = (time.monotonic(), result)
+            if len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+            suggestions.extend(result)
 
         return suggestions
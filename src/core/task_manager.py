@@ -26,10 +26,32 @@ class TaskManager:
             # For now, let's assume we can't do it without owner/repo known.
             pass
             
-        return self.storage.create_task(task)
+        return await self.storage.create_task(task)
+
+    async def create_tasks(self, project_name: str, items: List[Dict]) -> List[Task]:
+        """Creates many tasks in one transaction. Each item holds `title` plus any Task fields.
+
+        Uses full UUIDs: a single clash of the short ids would abort the whole batch.
+        """
+        tasks = [
+            Task(id=str(uuid.uuid4()), project_name=project_name, **item)
+            for item in items
+        ]
+        return await self.storage.create_tasks(tasks)
+
+    async def update_tasks_status(self, updates: Dict[str, TaskStatus]) -> List[Task]:
+        """Applies several status changes (task_id -> status) in one transaction."""
+        return await self.storage.update_statuses(updates, datetime.now())
+
+    async def upsert_tasks(self, tasks: List[Task]) -> List[Task]:
+        """Creates or overwrites tasks by id, e.g. when re-importing a GitHub backlog."""
+        now = datetime.now()
+        for task in tasks:
+            task.updated_at = now
+        return await self.storage.upsert_tasks(tasks)
 
     async def update_task_status(self, task_id: str, new_status: TaskStatus) -> Task:
-        task = self.storage.get_task(task_id)
+        task = await self.storage.get_task(task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
         
@@ -38,15 +60,15 @@ class TaskManager:
         if new_status == TaskStatus.DONE:
             task.completed_at = datetime.now()
             
-        return self.storage.update_task(task)
+        return await self.storage.update_task(task)
 
     async def link_github_issue(self, task_id: str, issue_number: int) -> Task:
-        task = self.storage.get_task(task_id)
+        task = await self.storage.get_task(task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
             
         task.github_issue_number = issue_number
-        return self.storage.update_task(task)
+        return await self.storage.update_task(task)
 
     async def get_tasks_for_project(self, project_name: str) -> List[Task]:
-        return self.storage.list_tasks(project_name=project_name)
+        return await self.storage.list_tasks(project_name=project_name)
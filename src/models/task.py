@@ -26,9 +26,17 @@ class Deliverable(BaseModel):
     format: str  # "markdown", "json", "python"
     description: Optional[str] = None
 
+class Artifact(BaseModel):
+    task_id: str
+    name: str  # file name, "<name>.<format>"
+    format: str
+    size: int
+    hash: str  # sha256 of the content, also the blob id in the artifact store
+    created_at: datetime = Field(default_factory=datetime.now)
+
 class Task(BaseModel):
     id: str
-    user_id: str
+    user_id: Optional[str] = None
     project_name: str
     type: TaskType
     title: str
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import Column, String, DateTime, Boolean, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, JSON, Integer, Text, Index
 from src.storage.base import Base
 
 class UserDB(Base):
@@ -55,3 +55,30 @@ class ProjectDB(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     extra_metadata = Column(JSON)
+
+class ConversationDB(Base):
+    __tablename__ = "conversations"
+
+    id = Column(String, primary_key=True, index=True)
+    user_id = Column(String, index=True, nullable=False)
+    title = Column(String)
+    summary = Column(Text)  # Rolling summary of the messages folded out of the context window
+    summarized_through = Column(Integer, default=0, nullable=False)  # Last seq covered by the summary
+    message_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ConversationMessageDB(Base):
+    __tablename__ = "conversation_messages"
+    __table_args__ = (
+        Index("ix_conversation_messages_conversation_seq", "conversation_id", "seq", unique=True),
+    )
+
+    id = Column(String, primary_key=True)
+    conversation_id = Column(String, nullable=False)
+    seq = Column(Integer, nullable=False)  # 1-based position in the conversation
+    role = Column(String, nullable=False)  # "user" or "assistant"
+    content = Column(Text, nullable=False)
+    token_count = Column(Integer)
+    model_used = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,8 +1,13 @@
+import asyncio
 import os
 import logging
 from mcp.server.fastmcp import FastMCP
 from src.config.coder import CoderSettings
 from src.storage.db import TaskStorage
+from src.clients.pool import MCPClientPool
+from src.core.status_cache import StatusCache
+from src.core.suggestions import SuggestionsEngine
+from src.core.analysis_cache import AnalysisCache
 from src.server.tools.project_tools import register_project_tools
 from src.server.tools.task_tools import register_task_tools
 from src.server.tools.intelligence_tools import register_intelligence_tools
@@ -19,16 +24,69 @@ class ProjectAssistantServer:
         self.storage = TaskStorage(db_path)
         
         artifact_path = os.getenv("PROJECT_ASSISTANT_ARTIFACTS", os.path.expanduser("~/.project-assistant/artifacts"))
-        self.research_engine = ResearchEngine(artifact_path)
+        self.research_engine = ResearchEngine(
+            artifact_path, compression=os.getenv("PROJECT_ASSISTANT_ARTIFACT_COMPRESSION", "gzip"),
+            storage=self.storage
+        )
+
+        # Warm mcp-server-git sessions shared by every ProjectContext, keyed by repository path
+        self.git_pool = MCPClientPool(
+            max_size=int(os.getenv("PROJECT_ASSISTANT_GIT_POOL_SIZE", "8")),
+            idle_timeout=float(os.getenv("PROJECT_ASSISTANT_GIT_POOL_IDLE_TIMEOUT", "300")),
+        )
+        # One long-lived github-mcp-server container per token, shared by every ProjectContext
+        self.github_pool = MCPClientPool(
+            max_size=2,
+            idle_timeout=float(os.getenv("PROJECT_ASSISTANT_GITHUB_IDLE_TIMEOUT", "3600")),
+        )
+        # Lets back-to-back status, suggestion and health calls reuse each other's work
+        self.status_cache = StatusCache()
+        # Shared so suggestion rules can reuse results across calls
+        self.suggestions_engine = SuggestionsEngine()
+        # Per-file scan metadata, so repeated codebase analyses only re-read changed files
+        self.analysis_cache = AnalysisCache(os.getenv(
+            "PROJECT_ASSISTANT_ANALYSIS_CACHE", os.path.expanduser("~/.project-assistant/analysis.sqlite")
+        ))
         
         self._register_tools()
 
     def _register_tools(self):
-        register_project_tools(self.mcp, self.coder_settings, self.storage)
+        register_project_tools(self.mcp, self.coder_settings, self.storage, self.git_pool, self.github_pool, self.status_cache, self.suggestions_engine)
         register_task_tools(self.mcp, self.storage)
-        register_intelligence_tools(self.mcp, self.coder_settings, self.storage, self.research_engine)
+        register_intelligence_tools(self.mcp, self.coder_settings, self.storage, self.research_engine, self.git_pool, self.github_pool,
+                                    self.status_cache, self.suggestions_engine, self.analysis_cache)
+
+    async def _backfill_artifact_index(self):
+        """Indexes artifacts saved before the artifact index existed, once."""
+        if await self.storage.list_artifacts(limit=1):
+            return
+        artifacts = await asyncio.to_thread(lambda: list(self.research_engine.iter_indexed_artifacts()))
+        if artifacts:
+            await self.storage.record_artifacts(artifacts)
+            logger.info(f"Indexed {len(artifacts)} existing artifacts")
+
+    async def _reap_idle_sessions(self):
+        """Evicts idle pooled sessions even while no tool call is acquiring one."""
+        pools = (self.git_pool, self.github_pool)
+        interval = max(1.0, min(pool.idle_timeout for pool in pools) / 2)
+        while True:
+            await asyncio.sleep(interval)
+            for pool in pools:
+                try:
+                    await pool.evict_idle()
+                except Exception as e:
+                    logger.warning(f"Evicting idle MCP sessions failed: {e}")
 
     async def run(self):
         """Starts the STDIO server."""
         logger.info("Starting Project Assistant MCP Server...")
-        await self.mcp.run_stdio_async()
+        reaper = asyncio.create_task(self._reap_idle_sessions())
+        try:
+            await self._backfill_artifact_index()
+            await self.mcp.run_stdio_async()
+        finally:
+            reaper.cancel()
+            await asyncio.gather(reaper, return_exceptions=True)
+            await self.git_pool.close()
+            await self.github_pool.close()
+            await self.storage.close()
@@ -1,60 +1,64 @@
+import asyncio
 import json
 import os
+import logging
 from typing import Optional, List, Dict, Any
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from src.config.coder import CoderSettings
 from src.storage.db import TaskStorage
 from src.core.research_engine import ResearchEngine
+from src.core.codebase_analyzer import CodebaseAnalyzer
+from src.core.analysis_cache import AnalysisCache
+from src.clients.pool import MCPClientPool
+from src.core.status_cache import StatusCache
+from src.core.suggestions import SuggestionsEngine
 from src.models.task import TaskStatus
 
-def register_intelligence_tools(mcp: FastMCP, coder_settings: CoderSettings, storage: TaskStorage, research_engine: ResearchEngine):
+logger = logging.getLogger(__name__)
+
+MAX_INLINE_REPORT = 1_000_000
+
+async def _report_progress(ctx: Context, progress: float, event: Dict[str, Any], total: Optional[float] = None):
+    try:
+        try:
+            await ctx.report_progress(progress, total, message=json.dumps(event))
+        except TypeError:
+            # Older mcp releases have no progress messages; send the bare progress instead
+            await ctx.report_progress(progress, total)
+    except ValueError:
+        # Called outside of an MCP request, nobody to stream to
+        pass
+
+def register_intelligence_tools(mcp: FastMCP, coder_settings: CoderSettings, storage: TaskStorage, research_engine: ResearchEngine,
+                                git_pool: Optional[MCPClientPool] = None, github_pool: Optional[MCPClientPool] = None,
+                                status_cache: Optional[StatusCache] = None,
+                                suggestions_engine: Optional[SuggestionsEngine] = None,
+                                analysis_cache: Optional[AnalysisCache] = None):
     
     @mcp.tool()
-    async def project_analyze_codebase(project_name: str) -> str:
-        """Deep code analysis to detect project type, structure and dependencies."""
+    async def project_analyze_codebase(project_name: str, ctx: Context = None) -> str:
+        """Deep code analysis to detect project type, structure, languages and dependencies.
+
+        Walks the whole tree (respecting .gitignore) and streams progress and parsed
+        manifests to the client as progress notifications while it runs.
+        """
         project_path = os.path.join(coder_settings.projects_root, project_name)
         if not os.path.exists(project_path):
             return json.dumps({"error": f"Project {project_name} not found"})
-        
-        analysis = {
-            "project": project_name,
-            "type": "unknown",
-            "structure": [],
-            "dependencies": []
-        }
-        
-        # Detect project type
-        files = os.listdir(project_path)
-        if "pyproject.toml" in files or "requirements.txt" in files or "setup.py" in files:
-            analysis["type"] = "Python"
-        elif "package.json" in files:
-            analysis["type"] = "Node.js"
-        elif "go.mod" in files:
-            analysis["type"] = "Go"
-            
-        # Basic structure
-        for item in files:
-            if os.path.isdir(os.path.join(project_path, item)) and not item.startswith("."):
-                analysis["structure"].append(item)
-                
-        # Basic dependencies (Python example)
-        if "pyproject.toml" in files:
-            try:
-                with open(os.path.join(project_path, "pyproject.toml"), "r") as f:
-                    content = f.read()
-                    # Basic parser for dependencies
-                    if "dependencies =" in content:
-                        deps_block = content.split("dependencies = [")[1].split("]")[0]
-                        analysis["dependencies"] = [d.strip().strip('"').strip("'") for d in deps_block.split(",") if d.strip()]
-            except Exception:
-                pass
-                
-        return json.dumps(analysis, indent=2)
+
+        analysis: Dict[str, Any] = {}
+        async for event in CodebaseAnalyzer(project_path, cache=analysis_cache).stream():
+            if event["event"] == "complete":
+                analysis = event["analysis"]
+            elif ctx is not None:
+                await _report_progress(ctx, event.get("files", 0), event)
+
+        return json.dumps({"project": project_name, **analysis}, indent=2)
 
     @mcp.tool()
     async def tasks_save_artifact(task_id: str, artifact_name: str, content: str, format: str = "json") -> str:
         """Saves a research artifact for a specific task."""
-        task = storage.get_task(task_id)
+        task = await storage.get_task(task_id)
         if not task:
             return json.dumps({"error": f"Task {task_id} not found"})
             
@@ -68,32 +72,62 @@ def register_intelligence_tools(mcp: FastMCP, coder_settings: CoderSettings, sto
             else:
                 data = content
                 
-            file_path = research_engine.save_artifact(task_id, artifact_name, data, format)
+            # Compression and fsync stay off the event loop
+            file_path, artifact = await asyncio.to_thread(
+                research_engine.put_artifact, task_id, artifact_name, data, format
+            )
+            await storage.record_artifact(artifact)
             
             # Update task with artifact_path if not set
             if not task.artifact_path:
-                task.artifact_path = os.path.dirname(file_path)
-                storage.update_task(task)
+                task.artifact_path = research_engine.get_task_artifact_path(task_id)
+                await storage.update_task(task)
                 
-            return json.dumps({"success": True, "path": file_path})
+            return json.dumps({"success": True, "name": artifact.name, "path": file_path})
         except Exception as e:
             return json.dumps({"error": str(e)})
 
     @mcp.tool()
-    async def tasks_generate_research_report(task_id: str) -> str:
-        """Generates a summary research report for a task based on its artifacts."""
-        task = storage.get_task(task_id)
+    async def artifacts_list(task_id: Optional[str] = None, format: Optional[str] = None,
+                             hash: Optional[str] = None, name_prefix: Optional[str] = None,
+                             limit: int = 100) -> str:
+        """Lists research artifacts from the artifact index, newest first.
+
+        Filters combine; without task_id the search spans every task.
+        """
+        artifacts = await storage.list_artifacts(task_id=task_id, format=format, hash=hash,
+                                                 name_prefix=name_prefix, limit=limit)
+        return json.dumps({"artifacts": [a.model_dump(mode="json") for a in artifacts]})
+
+    @mcp.tool()
+    async def artifacts_latest(format: str, task_id: Optional[str] = None) -> str:
+        """The most recent artifact of a format, optionally within one task."""
+        artifact = await storage.latest_artifact(format, task_id=task_id)
+        if artifact is None:
+            return json.dumps({"error": f"No {format} artifact found"})
+        return json.dumps(artifact.model_dump(mode="json"))
+
+    @mcp.tool()
+    async def tasks_generate_research_report(task_id: str, max_chars: int = MAX_INLINE_REPORT) -> str:
+        """Generates a summary research report for a task based on its artifacts.
+
+        The report is written to report.md; at most `max_chars` of it are returned inline.
+        """
+        task = await storage.get_task(task_id)
         if not task:
             return json.dumps({"error": f"Task {task_id} not found"})
             
-        report = research_engine.generate_report(task)
-        return json.dumps({"report": report})
+        indexed = await research_engine.indexed_artifacts(task_id)
+        report_path = await asyncio.to_thread(research_engine.write_report, task, indexed)
+        with open(report_path, "r") as f:
+            report = f.read(max_chars + 1)
+        truncated = len(report) > max_chars
+        return json.dumps({"report": report[:max_chars], "path": report_path, "truncated": truncated})
 
-    @mcp.tool()
-    async def project_health_check(project_name: str) -> str:
-        """Comprehensive health report for a project."""
+    async def _project_health(project_name: str) -> Dict[str, Any]:
         from src.core.project_context import ProjectContext
-        ctx = ProjectContext(project_name, coder_settings, storage)
+        ctx = ProjectContext(project_name, coder_settings, storage, git_pool=git_pool, github_pool=github_pool,
+                             status_cache=status_cache, suggestions_engine=suggestions_engine)
         try:
             await ctx.initialize()
             status = await ctx.get_status(include_suggestions=True)
@@ -112,7 +146,7 @@ def register_intelligence_tools(mcp: FastMCP, coder_settings: CoderSettings, sto
                     "git_is_clean": not status.git.is_dirty,
                     "has_recent_commits": len(status.git.last_commit) > 0,
                     "has_open_issues": len(status.github.issues),
-                    "has_stale_branches": any("stale" in s.description.lower() for s in status.suggestions),
+                    "has_stale_branches": any(s.action == "cleanup_branch" for s in status.suggestions),
                     "has_tests": has_tests,
                     "has_readme": has_readme,
                     "task_completion": 0 if status.tasks.total == 0 else (status.tasks.by_status.get("done", 0) / status.tasks.total * 100)
@@ -128,6 +162,54 @@ def register_intelligence_tools(mcp: FastMCP, coder_settings: CoderSettings, sto
             
             health["overall_score"] = max(0, score)
             
-            return json.dumps(health, indent=2)
+            return health
+        finally:
+            # Shielded so a second cancellation (e.g. the client dropping a
+            # projects_health_all call) cannot interrupt returning the pool slots
+            await asyncio.shield(ctx.close())
+
+    @mcp.tool()
+    async def project_health_check(project_name: str) -> str:
+        """Comprehensive health report for a project."""
+        return json.dumps(await _project_health(project_name), indent=2)
+
+    @mcp.tool()
+    async def projects_health_all(max_concurrency: int = 8, timeout: float = 60.0, ctx: Context = None) -> str:
+        """Health reports for every available project, checked concurrently.
+
+        Each report is streamed to the client as a progress notification as soon as
+        its project finishes. Projects still running after `timeout` seconds are
+        cancelled and listed under `timed_out`.
+        """
+        projects = coder_settings.get_available_projects()
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def check(project_name: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await _project_health(project_name)
+                except Exception as e:
+                    logger.warning(f"Health check failed for {project_name}: {e}")
+                    return {"project": project_name, "error": str(e)}
+
+        running = {asyncio.create_task(check(name)): name for name in projects}
+        results: List[Dict[str, Any]] = []
+        try:
+            for finished in asyncio.as_completed(running, timeout=timeout):
+                health = await finished
+                results.append(health)
+                if ctx is not None:
+                    await _report_progress(ctx, len(results), health, total=len(projects))
+        except asyncio.TimeoutError:
+            pass
         finally:
-            await ctx.close()
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        done = {r["project"] for r in results}
+        return json.dumps({
+            "projects": results,
+            "total": len(projects),
+            "timed_out": [name for name in projects if name not in done],
+        }, indent=2)
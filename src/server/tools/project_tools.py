@@ -4,17 +4,25 @@ from mcp.server.fastmcp import FastMCP
 from src.config.coder import CoderSettings
 from src.core.project_context import ProjectContext
 from src.storage.db import TaskStorage
+from src.clients.pool import MCPClientPool
+from src.core.status_cache import StatusCache
+from src.core.suggestions import SuggestionsEngine
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-def register_project_tools(mcp: FastMCP, coder_settings: CoderSettings, storage: TaskStorage):
+def register_project_tools(mcp: FastMCP, coder_settings: CoderSettings, storage: TaskStorage,
+                           git_pool: Optional[MCPClientPool] = None, github_pool: Optional[MCPClientPool] = None,
+                           status_cache: Optional[StatusCache] = None,
+                           suggestions_engine: Optional[SuggestionsEngine] = None):
     
     @mcp.tool()
     async def project_list_available() -> str:
-        """Lists all projects available in the /Projects directory."""
+        """Lists all projects available in the /Projects directory, with their default branch and last commit time."""
         projects = coder_settings.get_available_projects()
         return json.dumps({
             "projects": projects,
+            "metadata": coder_settings.get_projects_metadata(),
             "total": len(projects),
             "location": coder_settings.projects_root
         }, indent=2)
@@ -22,7 +30,8 @@ def register_project_tools(mcp: FastMCP, coder_settings: CoderSettings, storage:
     @mcp.tool()
     async def project_status(project_name: str, include_suggestions: bool = True) -> str:
         """Gets a comprehensive status of a project including Git, GitHub and Tasks."""
-        ctx = ProjectContext(project_name, coder_settings, storage)
+        ctx = ProjectContext(project_name, coder_settings, storage, git_pool=git_pool, github_pool=github_pool,
+                             status_cache=status_cache, suggestions_engine=suggestions_engine)
         try:
             await ctx.initialize()
             status = await ctx.get_status(include_suggestions=include_suggestions)
@@ -33,10 +42,18 @@ def register_project_tools(mcp: FastMCP, coder_settings: CoderSettings, storage:
     @mcp.tool()
     async def project_suggest_next_steps(project_name: str) -> str:
         """Gets AI-powered suggestions based on current project state."""
-        ctx = ProjectContext(project_name, coder_settings, storage)
+        ctx = ProjectContext(project_name, coder_settings, storage, git_pool=git_pool, github_pool=github_pool,
+                             status_cache=status_cache, suggestions_engine=suggestions_engine)
         try:
             await ctx.initialize()
             status = await ctx.get_status(include_suggestions=True)
             return json.dumps({"suggestions": [s.model_dump() for s in status.suggestions]}, indent=2)
         finally:
             await ctx.close()
+
+    @mcp.tool()
+    async def project_suggestion_stats() -> str:
+        """Per-rule call counts, memo hits and evaluation time of the suggestions engine."""
+        if suggestions_engine is None:
+            return json.dumps({"rules": {}})
+        return json.dumps({"rules": suggestions_engine.rule_stats()}, indent=2)
@@ -1,19 +1,43 @@
 import json
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from mcp.server.fastmcp import FastMCP
 from src.storage.db import TaskStorage
 from src.core.task_manager import TaskManager
 from src.models.task import TaskStatus, TaskType, TaskPriority
 
+MAX_PAGE_SIZE = 500
+
 def register_task_tools(mcp: FastMCP, storage: TaskStorage):
     task_manager = TaskManager(storage)
 
     @mcp.tool()
-    async def tasks_list(project_name: Optional[str] = None, status: Optional[str] = None) -> str:
-        """Lists tasks with optional filtering by project and status."""
+    async def tasks_list(
+        project_name: Optional[str] = None,
+        status: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order: str = "desc"
+    ) -> str:
+        """Lists tasks with optional filtering by project and status, most recently updated first.
+
+        Results are paginated: pass the returned `next_cursor` back as `cursor` to get the
+        next page. `fields` selects which task columns to return (e.g. ["title", "status"]).
+        """
         task_status = TaskStatus(status) if status else None
-        tasks = storage.list_tasks(project_name=project_name, status=task_status)
-        return json.dumps([t.model_dump() for t in tasks], indent=2, default=str)
+        try:
+            tasks, next_cursor = await storage.list_tasks_page(
+                project_name=project_name,
+                status=task_status,
+                fields=fields,
+                limit=max(1, min(limit, MAX_PAGE_SIZE)),
+                cursor=cursor,
+                descending=order != "asc"
+            )
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        # Compact separators: pages can be large and are read by agents, not humans
+        return json.dumps({"tasks": tasks, "next_cursor": next_cursor}, separators=(",", ":"))
 
     @mcp.tool()
     async def tasks_create(
@@ -32,6 +56,51 @@ def register_task_tools(mcp: FastMCP, storage: TaskStorage):
         task = await task_manager.create_task(project_name, title, data)
         return task.model_dump_json(indent=2)
 
+    @mcp.tool()
+    async def tasks_create_batch(project_name: str, tasks: List[Dict[str, Any]]) -> str:
+        """Creates many tasks in one transaction. Each item needs a title and may set
+        description, task_type, priority and github_issue_number."""
+        items = []
+        for index, t in enumerate(tasks):
+            if not t.get("title"):
+                return json.dumps({"error": f"Item {index}: title is required"})
+            try:
+                items.append({
+                    "title": t["title"],
+                    "description": t.get("description"),
+                    "type": TaskType(t.get("task_type", "standard")),
+                    "priority": TaskPriority(t.get("priority", "medium")),
+                    "github_issue_number": t.get("github_issue_number"),
+                })
+            except ValueError as e:
+                return json.dumps({"error": f"Item {index}: {e}"})
+        created = await task_manager.create_tasks(project_name, items)
+        return json.dumps({"created": len(created), "ids": [t.id for t in created]}, indent=2)
+
+    @mcp.tool()
+    async def tasks_update_batch(updates: List[Dict[str, Any]]) -> str:
+        """Updates the status of many tasks in one transaction. Each item is {"task_id", "status"}."""
+        changes = {}
+        for index, u in enumerate(updates):
+            if not isinstance(u, dict):
+                return json.dumps({"error": f"Item {index}: expected an object with task_id and status"})
+            task_id, status = u.get("task_id"), u.get("status")
+            if not task_id:
+                return json.dumps({"error": f"Item {index}: task_id is required"})
+            if not status:
+                return json.dumps({"error": f"Item {index}: status is required"})
+            if task_id in changes:
+                return json.dumps({"error": f"Item {index}: task {task_id} is listed more than once"})
+            try:
+                changes[task_id] = TaskStatus(status)
+            except ValueError as e:
+                return json.dumps({"error": f"Item {index}: {e}"})
+        try:
+            updated = await task_manager.update_tasks_status(changes)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        return json.dumps({"updated": len(updated), "ids": [t.id for t in updated]}, indent=2)
+
     @mcp.tool()
     async def tasks_update(task_id: str, status: str) -> str:
         """Updates a task status."""
@@ -41,7 +110,7 @@ def register_task_tools(mcp: FastMCP, storage: TaskStorage):
     @mcp.tool()
     async def tasks_get(task_id: str) -> str:
         """Gets detailed information about a single task."""
-        task = storage.get_task(task_id)
+        task = await storage.get_task(task_id)
         if not task:
             return json.dumps({"error": f"Task {task_id} not found"})
         return task.model_dump_json(indent=2)
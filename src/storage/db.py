@@ -1,14 +1,23 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Enum as SQLEnum, JSON, create_engine
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Enum as SQLEnum, JSON, Index, event, select, func, lambda_stmt, insert, update, bindparam, tuple_, text, literal_column
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from datetime import datetime
+from enum import Enum
+import asyncio
+import base64
 import json
 import os
-from typing import List, Optional
-from src.models.task import Task, TaskType, TaskStatus, TaskPriority, Deliverable
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from src.models.task import Task, TaskType, TaskStatus, TaskPriority, Deliverable, Artifact
+from src.models.project import TaskSummary
 
 Base = declarative_base()
 
+# Sort-key floor for task rows with neither timestamp, in SQLAlchemy's SQLite DateTime format
+_EPOCH = "'1970-01-01 00:00:00.000000'"
+
 class TaskDB(Base):
     __tablename__ = "tasks"
     id = Column(String, primary_key=True)
@@ -29,13 +38,139 @@ class TaskDB(Base):
     tags = Column(JSON)
     artifact_path = Column(String)
 
+    __table_args__ = (
+        # Per-project summaries and pages: filter by project, then walk the sort key (see TASK_SORT_KEY)
+        Index("ix_tasks_project_sort_key", "project_name",
+              func.coalesce(updated_at, created_at, literal_column(_EPOCH)), "id"),
+        # Issue-to-task linking in the suggestions engine
+        Index("ix_tasks_project_issue", "project_name", "github_issue_number"),
+    )
+
+class ArtifactDB(Base):
+    """Index of research artifacts, so listings and searches never walk the artifact directory."""
+    __tablename__ = "artifacts"
+    task_id = Column(String, primary_key=True)
+    name = Column(String, primary_key=True)
+    format = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    hash = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    __table_args__ = (
+        # Per-task listings, newest first
+        Index("ix_artifacts_task_created_at", "task_id", "created_at"),
+        # "Latest artifact of format X", across tasks or within one
+        Index("ix_artifacts_format_created_at", "format", "created_at"),
+        # Which tasks share a payload
+        Index("ix_artifacts_hash", "hash"),
+    )
+
+TASK_COLUMNS = [c.name for c in TaskDB.__table__.columns]
+
+# Tasks are listed by last update; rows written without updated_at (e.g. by older
+# versions or by hand) fall back to created_at, so the key is never NULL and cursors
+# always have a value to continue from. Must stay identical to the expression in
+# ix_tasks_project_sort_key for SQLite to use the index.
+TASK_SORT_KEY = func.coalesce(TaskDB.updated_at, TaskDB.created_at, literal_column(_EPOCH))
+
+# Indexes created by earlier versions, dropped when the schema is ensured
+RETIRED_INDEXES = ("ix_tasks_updated_at_id", "ix_tasks_project_updated_at")
+
+def encode_cursor(updated_at: datetime, task_id: str) -> str:
+    raw = json.dumps([updated_at.isoformat(), task_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        updated_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(updated_at), task_id
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+# Storage profile applied to every pooled connection. WAL lets readers proceed while a
+# writer commits; with WAL, synchronous=NORMAL only fsyncs at checkpoints and stays
+# crash-safe (a power loss can drop the last commits but never corrupts the file).
+SQLITE_PROFILE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -64000,  # negative means KiB, so 64 MiB of page cache
+    "mmap_size": 268435456,  # 256 MiB of memory-mapped reads
+    "temp_store": "MEMORY",
+}
+
+def _pragma_listener(pragmas: Dict[str, Any]):
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    return set_sqlite_pragmas
+
+# Max ids per IN (...) lookup in the bulk APIs
+BATCH_LOOKUP_SIZE = 500
+
 class TaskStorage:
-    def __init__(self, db_path: str):
+    """Async task store on SQLite (aiosqlite), used by the MCP server.
+
+    `pragmas` overrides the connection profile; None applies SQLITE_PROFILE and an
+    empty dict leaves SQLite's defaults (useful for benchmarking).
+    """
+
+    def __init__(self, db_path: str, pool_size: int = 5, max_overflow: int = 10,
+                 pragmas: Optional[Dict[str, Any]] = None):
         self.db_path = db_path
-        engine_url = f"sqlite:///{db_path}"
-        self.engine = create_engine(engine_url)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        engine_url = f"sqlite+aiosqlite:///{db_path}"
+        self.engine = create_async_engine(
+            engine_url,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=False,
+            # Room for every compiled variant of the hot task queries
+            query_cache_size=1000,
+        )
+        self.pragmas = SQLITE_PROFILE if pragmas is None else pragmas
+        event.listen(self.engine.sync_engine, "connect", _pragma_listener(self.pragmas))
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+        self._revisions: Dict[str, int] = {}
+        self._schema_ready = False
+        self._schema_lock = asyncio.Lock()
+
+    async def _ensure_schema(self):
+        """Creates the tables on first use, since __init__ cannot await."""
+        if self._schema_ready:
+            return
+        async with self._schema_lock:
+            if not self._schema_ready:
+                async with self.engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                    # create_all skips the indexes of tables that already exist
+                    # (IF NOT EXISTS rather than checkfirst, which cannot reflect expression indexes)
+                    for table in Base.metadata.sorted_tables:
+                        for index in table.indexes:
+                            await conn.execute(CreateIndex(index, if_not_exists=True))
+                    for name in RETIRED_INDEXES:
+                        await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                self._schema_ready = True
+
+    async def close(self):
+        await self.engine.dispose()
+
+    def revision(self, project_name: str) -> int:
+        """Counter bumped on every write to a project's tasks, used to invalidate cached reads."""
+        return self._revisions.get(project_name, 0)
+
+    def _touch(self, project_name: str):
+        self._revisions[project_name] = self._revisions.get(project_name, 0) + 1
 
     def _to_pydantic(self, db_task: TaskDB) -> Task:
         return Task(
@@ -58,72 +193,310 @@ class TaskStorage:
             artifact_path=db_task.artifact_path
         )
 
+    def _to_row(self, task: Task) -> Dict[str, Any]:
+        return {
+            "id": task.id,
+            "project_name": task.project_name,
+            "type": task.type,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status,
+            "priority": task.priority,
+            "assigned_to": task.assigned_to,
+            "deliverables": [d.model_dump() for d in task.deliverables],
+            "context_files": task.context_files,
+            "approval_required": task.approval_required,
+            "created_at": task.created_at,
+            "updated_at": task.updated_at,
+            "completed_at": task.completed_at,
+            "github_issue_number": task.github_issue_number,
+            "tags": task.tags,
+            "artifact_path": task.artifact_path
+        }
+
     def _to_db(self, task: Task) -> TaskDB:
-        return TaskDB(
-            id=task.id,
-            project_name=task.project_name,
-            type=task.type,
-            title=task.title,
-            description=task.description,
-            status=task.status,
-            priority=task.priority,
-            assigned_to=task.assigned_to,
-            deliverables=[d.model_dump() for d in task.deliverables],
-            context_files=task.context_files,
-            approval_required=task.approval_required,
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at,
-            github_issue_number=task.github_issue_number,
-            tags=task.tags,
-            artifact_path=task.artifact_path
-        )
+        return TaskDB(**self._to_row(task))
 
-    def create_task(self, task: Task) -> Task:
-        with self.Session() as session:
+    async def _existing_projects(self, conn, task_ids: Iterable[str]) -> Dict[str, str]:
+        """Maps the ids that already exist to their current project_name."""
+        ids = list(task_ids)
+        found: Dict[str, str] = {}
+        # Stay well below SQLite's bound-variable limit
+        for offset in range(0, len(ids), BATCH_LOOKUP_SIZE):
+            chunk = ids[offset:offset + BATCH_LOOKUP_SIZE]
+            result = await conn.execute(
+                select(TaskDB.id, TaskDB.project_name).where(TaskDB.id.in_(chunk))
+            )
+            found.update({row.id: row.project_name for row in result})
+        return found
+
+    async def create_task(self, task: Task) -> Task:
+        await self._ensure_schema()
+        async with self.Session() as session:
             db_task = self._to_db(task)
             session.add(db_task)
-            session.commit()
+            await session.commit()
+            self._touch(task.project_name)
             return task
 
-    def get_task(self, task_id: str) -> Optional[Task]:
-        with self.Session() as session:
-            db_task = session.get(TaskDB, task_id)
+    async def get_task(self, task_id: str) -> Optional[Task]:
+        await self._ensure_schema()
+        async with self.Session() as session:
+            db_task = await session.get(TaskDB, task_id)
             if db_task:
                 return self._to_pydantic(db_task)
             return None
 
-    def list_tasks(self, project_name: Optional[str] = None, 
-                   status: Optional[TaskStatus] = None) -> List[Task]:
-        with self.Session() as session:
-            query = session.query(TaskDB)
+    async def list_tasks(self, project_name: Optional[str] = None, 
+                         status: Optional[TaskStatus] = None) -> List[Task]:
+        await self._ensure_schema()
+        async with self.Session() as session:
+            # Lambda statements are cached by code location, skipping statement construction
+            # and compilation on repeat calls; the filter values become bound parameters
+            query = lambda_stmt(lambda: select(TaskDB))
             if project_name:
-                query = query.filter(TaskDB.project_name == project_name)
+                query += lambda q: q.where(TaskDB.project_name == project_name)
             if status:
-                query = query.filter(TaskDB.status == status)
+                query += lambda q: q.where(TaskDB.status == status)
             
-            return [self._to_pydantic(db_t) for db_t in query.all()]
+            result = await session.execute(query)
+            return [self._to_pydantic(db_t) for db_t in result.scalars().all()]
 
-    def update_task(self, task: Task) -> Task:
-        with self.Session() as session:
-            db_task = session.get(TaskDB, task.id)
-            if not db_task:
-                raise ValueError(f"Task {task.id} not found")
-            
-            # Simple update by merging
-            updated_db_task = self._to_db(task)
-            for column in TaskDB.__table__.columns:
-                if column.name != 'id':
-                    setattr(db_task, column.name, getattr(updated_db_task, column.name))
-            
-            session.commit()
-            return task
+    async def list_tasks_page(self, project_name: Optional[str] = None,
+                              status: Optional[TaskStatus] = None,
+                              fields: Optional[List[str]] = None,
+                              limit: int = 100,
+                              cursor: Optional[str] = None,
+                              descending: bool = True) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Returns one page of tasks as plain dicts plus the cursor of the next page.
+
+        Pages are ordered by (TASK_SORT_KEY, id) and continue from `cursor` with a keyset
+        predicate, so every page costs the same regardless of how deep it is. `fields`
+        restricts the selected columns; `id` is always included.
+        """
+        columns = list(dict.fromkeys(["id", *(fields or TASK_COLUMNS)]))
+        unknown = [f for f in columns if f not in TASK_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown task fields: {', '.join(unknown)}")
+
+        table = TaskDB.__table__
+        sort_key = TASK_SORT_KEY.label("sort_key")
+        selected = [table.c[name] for name in columns] + [sort_key]
+
+        query = select(*selected)
+        if project_name:
+            query = query.where(table.c.project_name == project_name)
+        if status:
+            query = query.where(table.c.status == status)
+        key = tuple_(TASK_SORT_KEY, table.c.id)
+        if cursor:
+            after = tuple_(*decode_cursor(cursor))
+            query = query.where(key < after if descending else key > after)
+        if descending:
+            query = query.order_by(TASK_SORT_KEY.desc(), table.c.id.desc())
+        else:
+            query = query.order_by(TASK_SORT_KEY.asc(), table.c.id.asc())
+        # One extra row tells us whether there is a next page
+        query = query.limit(limit + 1)
+
+        await self._ensure_schema()
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.sort_key, last.id)
+        page = [{name: _jsonable(getattr(row, name)) for name in columns} for row in rows]
+        return page, next_cursor
+
+    async def summarize(self, project_name: str, recent_limit: int = 5) -> TaskSummary:
+        """Counts tasks per status and fetches the most recently updated ones, all in SQL."""
+        await self._ensure_schema()
+        async with self.engine.connect() as conn:
+            counts = await conn.execute(
+                select(TaskDB.status, func.count())
+                .where(TaskDB.project_name == project_name)
+                .group_by(TaskDB.status)
+            )
+            by_status = {_jsonable(status): n for status, n in counts}
+            recent = await conn.execute(
+                select(TaskDB.id, TaskDB.title, TaskDB.status)
+                .where(TaskDB.project_name == project_name)
+                .order_by(TASK_SORT_KEY.desc(), TaskDB.id.desc())
+                .limit(recent_limit)
+            )
+            recent_tasks = [
+                {"id": row.id, "title": row.title, "status": _jsonable(row.status)}
+                for row in recent
+            ]
+        return TaskSummary(
+            total=sum(by_status.values()),
+            by_status=by_status,
+            recent=recent_tasks
+        )
+
+    async def linked_issue_numbers(self, project_name: str) -> Set[int]:
+        """GitHub issue numbers referenced by at least one of the project's tasks."""
+        await self._ensure_schema()
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(TaskDB.github_issue_number)
+                .where(TaskDB.project_name == project_name, TaskDB.github_issue_number.is_not(None))
+                .distinct()
+            )
+            return set(result.scalars())
+
+    async def get_tasks(self, task_ids: List[str]) -> Dict[str, Task]:
+        """Fetches several tasks by id; missing ids are left out of the result."""
+        await self._ensure_schema()
+        tasks: Dict[str, Task] = {}
+        async with self.Session() as session:
+            for offset in range(0, len(task_ids), BATCH_LOOKUP_SIZE):
+                chunk = task_ids[offset:offset + BATCH_LOOKUP_SIZE]
+                result = await session.execute(select(TaskDB).where(TaskDB.id.in_(chunk)))
+                tasks.update({db_t.id: self._to_pydantic(db_t) for db_t in result.scalars()})
+        return tasks
+
+    async def update_task(self, task: Task) -> Task:
+        return (await self.update_tasks([task]))[0]
+
+    async def create_tasks(self, tasks: List[Task]) -> List[Task]:
+        """Inserts every task in one transaction with a single executemany."""
+        if not tasks:
+            return []
+        await self._ensure_schema()
+        async with self.engine.begin() as conn:
+            await conn.execute(insert(TaskDB), [self._to_row(t) for t in tasks])
+        for project_name in {t.project_name for t in tasks}:
+            self._touch(project_name)
+        return tasks
 
-    def delete_task(self, task_id: str) -> bool:
-        with self.Session() as session:
-            db_task = session.get(TaskDB, task_id)
+    async def update_tasks(self, tasks: List[Task]) -> List[Task]:
+        """Rewrites every task in one transaction. Raises ValueError if any id is unknown."""
+        if not tasks:
+            return []
+        await self._ensure_schema()
+        async with self.engine.begin() as conn:
+            previous = await self._existing_projects(conn, (t.id for t in tasks))
+            missing = [t.id for t in tasks if t.id not in previous]
+            if missing:
+                raise ValueError(f"Task {missing[0]} not found")
+
+            rows = []
+            for t in tasks:
+                row = self._to_row(t)
+                row["_id"] = row.pop("id")
+                rows.append(row)
+            stmt = update(TaskDB.__table__).where(TaskDB.__table__.c.id == bindparam("_id"))
+            await conn.execute(stmt, rows)
+        for project_name in set(previous.values()) | {t.project_name for t in tasks}:
+            self._touch(project_name)
+        return tasks
+
+    async def update_statuses(self, updates: Dict[str, TaskStatus], now: datetime) -> List[Task]:
+        """Sets the status of several tasks (task_id -> status), reading and writing in one transaction.
+
+        Raises ValueError if any id is unknown; nothing is written in that case.
+        """
+        if not updates:
+            return []
+        await self._ensure_schema()
+        task_ids = list(updates)
+        async with self.Session() as session:
+            async with session.begin():
+                rows: Dict[str, TaskDB] = {}
+                for offset in range(0, len(task_ids), BATCH_LOOKUP_SIZE):
+                    chunk = task_ids[offset:offset + BATCH_LOOKUP_SIZE]
+                    result = await session.execute(select(TaskDB).where(TaskDB.id.in_(chunk)))
+                    rows.update({db_t.id: db_t for db_t in result.scalars()})
+                missing = [task_id for task_id in task_ids if task_id not in rows]
+                if missing:
+                    raise ValueError(f"Task {missing[0]} not found")
+
+                for task_id, new_status in updates.items():
+                    db_task = rows[task_id]
+                    db_task.status = new_status
+                    db_task.updated_at = now
+                    if new_status == TaskStatus.DONE:
+                        db_task.completed_at = now
+            tasks = [self._to_pydantic(rows[task_id]) for task_id in task_ids]
+        for project_name in {t.project_name for t in tasks}:
+            self._touch(project_name)
+        return tasks
+
+    async def upsert_tasks(self, tasks: List[Task]) -> List[Task]:
+        """Inserts new tasks and overwrites existing ones (by id) with INSERT ... ON CONFLICT."""
+        if not tasks:
+            return []
+        await self._ensure_schema()
+        table = TaskDB.__table__
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={c.name: stmt.excluded[c.name] for c in table.c if c.name not in ("id", "created_at")}
+        )
+        async with self.engine.begin() as conn:
+            previous = await self._existing_projects(conn, (t.id for t in tasks))
+            await conn.execute(stmt, [self._to_row(t) for t in tasks])
+        for project_name in set(previous.values()) | {t.project_name for t in tasks}:
+            self._touch(project_name)
+        return tasks
+
+    async def delete_task(self, task_id: str) -> bool:
+        await self._ensure_schema()
+        async with self.Session() as session:
+            db_task = await session.get(TaskDB, task_id)
             if db_task:
-                session.delete(db_task)
-                session.commit()
+                project_name = db_task.project_name
+                await session.delete(db_task)
+                await session.commit()
+                self._touch(project_name)
                 return True
             return False
+
+    async def record_artifact(self, artifact: Artifact) -> Artifact:
+        return (await self.record_artifacts([artifact]))[0]
+
+    async def record_artifacts(self, artifacts: List[Artifact]) -> List[Artifact]:
+        """Adds artifacts to the index, replacing entries with the same task and name."""
+        if not artifacts:
+            return []
+        await self._ensure_schema()
+        table = ArtifactDB.__table__
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.task_id, table.c.name],
+            set_={c: stmt.excluded[c] for c in ("format", "size", "hash", "created_at")}
+        )
+        async with self.engine.begin() as conn:
+            await conn.execute(stmt, [a.model_dump() for a in artifacts])
+        return artifacts
+
+    async def list_artifacts(self, task_id: Optional[str] = None, format: Optional[str] = None,
+                             hash: Optional[str] = None, name_prefix: Optional[str] = None,
+                             limit: Optional[int] = 100) -> List[Artifact]:
+        """Artifacts matching every given filter, newest first. `limit=None` returns them all."""
+        await self._ensure_schema()
+        query = select(ArtifactDB)
+        if task_id:
+            query = query.where(ArtifactDB.task_id == task_id)
+        if format:
+            query = query.where(ArtifactDB.format == format)
+        if hash:
+            query = query.where(ArtifactDB.hash == hash)
+        if name_prefix:
+            query = query.where(ArtifactDB.name.startswith(name_prefix, autoescape=True))
+        query = query.order_by(ArtifactDB.created_at.desc(), ArtifactDB.name).limit(limit)
+        async with self.Session() as session:
+            result = await session.execute(query)
+            return [
+                Artifact(task_id=a.task_id, name=a.name, format=a.format, size=a.size,
+                         hash=a.hash, created_at=a.created_at)
+                for a in result.scalars()
+            ]
+
+    async def latest_artifact(self, format: str, task_id: Optional[str] = None) -> Optional[Artifact]:
+        artifacts = await self.list_artifacts(task_id=task_id, format=format, limit=1)
+        return artifacts[0] if artifacts else None
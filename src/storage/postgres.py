@@ -3,7 +3,7 @@ from sqlalchemy import Column, String, Integer, Boolean, DateTime, Enum as SQLEn
 from datetime import datetime
 import os
 from src.storage.base import Base
-from src.models.user import UserDB, AccountDB, ProjectDB
+from src.models.user import UserDB, AccountDB, ProjectDB, ConversationDB, ConversationMessageDB
 from src.models.task import TaskType, TaskStatus, TaskPriority
 
 class TaskDB(Base):
@@ -0,0 +1,70 @@
+import os
+import pytest
+from unittest.mock import patch
+from src.core.analysis_cache import AnalysisCache
+from src.core.codebase_analyzer import CodebaseAnalyzer
+
+def write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    write(root / "pyproject.toml", '[project]\nname = "app"\ndependencies = ["httpx"]\n')
+    write(root / "src" / "a.py", "a = 1\n")
+    write(root / "src" / "b.py", "b = 2\n")
+    return root
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalysisCache(str(tmp_path / "cache" / "analysis.sqlite"))
+
+@pytest.mark.asyncio
+async def test_rescan_reuses_unchanged_files(project, cache):
+    first = await CodebaseAnalyzer(str(project), cache=cache).analyze()
+    assert first["cache"] == {"reused": 0, "scanned": 3}
+
+    with patch("src.core.codebase_analyzer._inspect") as inspect:
+        second = await CodebaseAnalyzer(str(project), cache=cache).analyze()
+
+    inspect.assert_not_called()
+    assert second["cache"] == {"reused": 3, "scanned": 0}
+    # Manifest data comes back from the cache
+    assert second["dependencies"] == ["httpx"]
+    assert {k: v for k, v in second.items() if k != "cache"} == {k: v for k, v in first.items() if k != "cache"}
+
+@pytest.mark.asyncio
+async def test_rescan_picks_up_changes_and_deletions(project, cache):
+    await CodebaseAnalyzer(str(project), cache=cache).analyze()
+
+    write(project / "pyproject.toml", '[project]\nname = "app"\ndependencies = ["httpx", "rich"]\n')
+    st = os.stat(project / "pyproject.toml")
+    os.utime(project / "pyproject.toml", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    os.remove(project / "src" / "b.py")
+
+    result = await CodebaseAnalyzer(str(project), cache=cache).analyze()
+
+    assert result["dependencies"] == ["httpx", "rich"]
+    assert result["cache"] == {"reused": 1, "scanned": 1}
+    conn = cache.open(str(project))
+    try:
+        assert set(conn.directory("src")) == {"a.py"}
+    finally:
+        conn.close()
+
+@pytest.mark.asyncio
+async def test_removed_directories_are_dropped(project, cache):
+    await CodebaseAnalyzer(str(project), cache=cache).analyze()
+    os.remove(project / "src" / "a.py")
+    os.remove(project / "src" / "b.py")
+    os.rmdir(project / "src")
+
+    await CodebaseAnalyzer(str(project), cache=cache).analyze()
+
+    scan = cache.open(str(project))
+    try:
+        assert scan.directory("src") == {}
+        assert set(scan.directory("")) == {"pyproject.toml"}
+    finally:
+        scan.close()
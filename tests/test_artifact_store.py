@@ -0,0 +1,92 @@
+import gzip
+import os
+import pytest
+from src.core.artifact_store import ArtifactStore
+from src.core.research_engine import ResearchEngine
+from src.models.task import Task, TaskType
+
+def blob_files(root):
+    return [f for _, _, files in os.walk(os.path.join(root, "blobs")) for f in files]
+
+def test_identical_payloads_are_stored_once(tmp_path):
+    engine = ResearchEngine(str(tmp_path))
+    payload = {"rows": list(range(2000))}
+
+    first = engine.save_artifact("t1", "data", payload)
+    second = engine.save_artifact("t2", "copy", payload)
+
+    assert first == os.path.join(str(tmp_path), "t1", "data.json")
+    assert second == os.path.join(str(tmp_path), "t2", "copy.json")
+    assert blob_files(tmp_path)[0].endswith(".gz")
+    assert len(blob_files(tmp_path)) == 1
+    assert engine.list_artifacts("t2") == ["copy.json"]
+
+def test_large_payloads_are_compressed_and_streamed_back(tmp_path):
+    store = ArtifactStore(str(tmp_path), compress_min_size=16)
+    data = b"observation\n" * 100_000
+
+    entry = store.put("t1", "log.txt", data)
+
+    assert entry["encoding"] == "gzip"
+    assert entry["stored_size"] < entry["size"] // 10
+    with open(entry["path"], "rb") as f:
+        assert gzip.decompress(f.read()) == data
+    chunks = list(store.iter_chunks("t1", "log.txt", chunk_size=64 * 1024))
+    assert len(chunks) > 1 and b"".join(chunks) == data
+
+def test_small_payloads_stay_raw(tmp_path):
+    store = ArtifactStore(str(tmp_path), compression="gzip", compress_min_size=1024)
+    entry = store.put("t1", "note.txt", b"short")
+    assert entry["encoding"] == "none"
+    assert store.read("t1", "note.txt") == b"short"
+
+def test_overwrite_updates_manifest_atomically(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put("t1", "a.txt", b"v1")
+    store.put("t1", "a.txt", b"v2")
+
+    assert store.read("t1", "a.txt") == b"v2"
+    assert not [f for f in os.listdir(tmp_path / "t1") if f.startswith(".tmp-")]
+
+def test_legacy_plain_artifacts_are_still_readable(tmp_path):
+    (tmp_path / "t1").mkdir()
+    (tmp_path / "t1" / "old.txt").write_text("before the blob store")
+    engine = ResearchEngine(str(tmp_path))
+
+    assert engine.list_artifacts("t1") == ["old.txt"]
+    assert engine.read_artifact("t1", "old.txt") == b"before the blob store"
+    with pytest.raises(FileNotFoundError):
+        engine.read_artifact("t1", "missing.txt")
+
+def test_unknown_compression_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ArtifactStore(str(tmp_path), compression="lz4")
+
+def test_reads_do_not_create_task_directories(tmp_path):
+    engine = ResearchEngine(str(tmp_path))
+
+    assert engine.list_artifacts("unknown") == []
+    assert not os.path.exists(engine.get_task_artifact_path("unknown"))
+
+def test_manifests_rebuild_the_artifact_index(tmp_path):
+    engine = ResearchEngine(str(tmp_path))
+    path, artifact = engine.put_artifact("t1", "data", {"a": 1})
+    engine.save_artifact("t2", "notes", "hello", "txt")
+
+    records = sorted(engine.iter_indexed_artifacts(), key=lambda a: a.task_id)
+
+    assert [(a.task_id, a.name, a.format) for a in records] == [("t1", "data.json", "json"), ("t2", "notes.txt", "txt")]
+    assert records[0] == artifact
+
+def test_legacy_sections_are_not_shared_across_tasks(tmp_path):
+    for task_id, text in (("t1", "task one"), ("t2", "task two")):
+        (tmp_path / task_id).mkdir()
+        (tmp_path / task_id / "old.txt").write_text(text)
+        os.utime(tmp_path / task_id / "old.txt", ns=(1_700_000_000_000_000_000,) * 2)
+    engine = ResearchEngine(str(tmp_path))
+
+    first = engine.generate_report(Task(id="t1", project_name="p", type=TaskType.RESEARCH, title="One"))
+    second = engine.generate_report(Task(id="t2", project_name="p", type=TaskType.RESEARCH, title="Two"))
+
+    assert first.endswith("- old.txt\n  > task one")
+    assert second.endswith("- old.txt\n  > task two")
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import httpx
+import pytest
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api.routers import chat
+from src.api.services.http_clients import HTTPClientRegistry, get_http_clients
+from src.api.services.pm_context import get_pm_context_cache
+from src.api.services.response_cache import get_response_cache
+from src.api.middleware.auth import get_current_user
+from src.storage.postgres import get_db
+
+def sse_body(*chunks):
+    lines = [f"data: {json.dumps({'choices': [{'delta': {'content': c}}]})}\n\n" for c in chunks]
+    return "".join(lines) + "data: [DONE]\n\n"
+
+def registry_with(handler):
+    registry = HTTPClientRegistry()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    registry.client_for = lambda url: client
+    return registry
+
+@pytest.mark.asyncio
+async def test_stream_llm_yields_deltas_and_requests_streaming():
+    seen = {}
+
+    def handler(request):
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, text=": keep-alive\n\n" + sse_body("Hel", "lo") + "data: {\"choices\": [{\"delta\": {}}]}\n\n")
+
+    registry = registry_with(handler)
+    deltas = [d async for d in chat.stream_llm(registry, "http://llm/v1", None, "m", "sys", "hi")]
+    assert deltas == ["Hel", "lo"]
+    assert seen["body"]["stream"] is True
+
+@pytest.mark.asyncio
+async def test_stream_llm_raises_on_error_status():
+    registry = registry_with(lambda request: httpx.Response(401, text="bad key"))
+    with pytest.raises(Exception, match="401 - bad key"):
+        async for _ in chat.stream_llm(registry, "http://llm/v1", "k", "m", "sys", "hi"):
+            pass
+
+def test_pm_stream_endpoint_emits_sse_events(monkeypatch):
+    async def prepare(msg, current_user, db, cache=None):
+        return chat.PreparedChat("a1", "ollama", None, "http://llm/v1", "llama3.2", "sys")
+
+    monkeypatch.setattr(chat, "prepare_pm_chat", prepare)
+    app = FastAPI()
+    app.include_router(chat.router)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="u1")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_pm_context_cache] = lambda: None
+    app.dependency_overrides[get_response_cache] = lambda: None
+    app.dependency_overrides[get_http_clients] = lambda: registry_with(lambda request: httpx.Response(200, text=sse_body("a", "b")))
+
+    response = TestClient(app).post("/chat/pm/stream", json={"message": "hi"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert [e[0] for e in events] == ["event: start", "event: token", "event: token", "event: done"]
+    assert json.loads(events[0][1][len("data: "):]) == {"model_used": "ollama:llama3.2", "conversation_id": None, "cached": False}
+    assert [json.loads(e[1][len("data: "):])["content"] for e in events[1:3]] == ["a", "b"]
+
+class StalledStream(httpx.AsyncByteStream):
+    """Sends one delta, then never another byte."""
+
+    async def __aiter__(self):
+        yield sse_body("a").split("data: [DONE]")[0].encode()
+        await asyncio.Event().wait()
+
+class FakeRequest:
+    def __init__(self):
+        self.gone = asyncio.Event()
+
+    async def receive(self):
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+async def stalled_pm_stream(monkeypatch):
+    """The PM stream response over a stalled upstream, plus the turns it records."""
+    recorded = []
+
+    async def prepare(msg, current_user, db, cache=None):
+        return chat.PreparedChat("a1", "ollama", None, "http://llm/v1", "llama3.2", "sys")
+
+    async def start_turn(msg, current_user, db, prepared):
+        return SimpleNamespace(system_prompt="sys", history=[])
+
+    async def record_turn(session, turn, message, reply, model_used):
+        recorded.append(reply)
+
+    class Session:
+        async def __aenter__(self):
+            return None
+
+        async def __aexit__(self, *exc_info):
+            return None
+
+    monkeypatch.setattr(chat, "prepare_pm_chat", prepare)
+    monkeypatch.setattr(chat, "start_conversation_turn", start_turn)
+    monkeypatch.setattr(chat.conversations, "record_turn", record_turn)
+    monkeypatch.setattr(chat, "AsyncSessionLocal", Session)
+    request = FakeRequest()
+    response = await chat.chat_with_pm_stream(
+        chat.ChatMessage(message="hi", conversation_id="c1"), request, SimpleNamespace(id="u1"), None,
+        registry_with(lambda r: httpx.Response(200, stream=StalledStream())), None, None
+    )
+    return response.body_iterator, request, recorded
+
+@pytest.mark.asyncio
+async def test_pm_stream_notices_disconnect_while_upstream_stalls(monkeypatch):
+    events, request, recorded = await stalled_pm_stream(monkeypatch)
+
+    assert (await events.__anext__()).startswith("event: start")
+    assert (await events.__anext__()).startswith("event: token")
+    request.gone.set()
+    assert (await asyncio.wait_for(events.__anext__(), timeout=2)).startswith("event: done")
+    assert recorded == ["a"]
+
+@pytest.mark.asyncio
+async def test_pm_stream_saves_the_turn_when_cancelled(monkeypatch):
+    events, _, recorded = await stalled_pm_stream(monkeypatch)
+
+    async def consume():
+        async for _ in events:
+            pass
+
+    consumer = asyncio.ensure_future(consume())
+    await asyncio.sleep(0.1)
+    # Cancelled twice, as a cancel scope does while the generator cleans up
+    consumer.cancel()
+    await asyncio.sleep(0)
+    consumer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer
+    await asyncio.wait_for(asyncio.gather(*chat._detached), timeout=2)
+    assert recorded == ["a"]
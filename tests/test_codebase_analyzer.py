@@ -0,0 +1,89 @@
+import json
+import pytest
+from src.core.codebase_analyzer import CodebaseAnalyzer, IgnoreRules
+
+def write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+@pytest.fixture
+def monorepo(tmp_path):
+    write(tmp_path / "pyproject.toml", '[project]\nname = "app"\ndependencies = ["core-lib>=1.0", "httpx"]\n')
+    write(tmp_path / ".gitignore", "build/\n*.log\n!keep.log\n/secret.py\n")
+    write(tmp_path / "app" / "main.py", "print('hi')\n")
+    write(tmp_path / "app" / "secret.py", "x = 1\n")
+    write(tmp_path / "secret.py", "x = 1\n")
+    write(tmp_path / "debug.log", "noise")
+    write(tmp_path / "keep.log", "kept")
+    write(tmp_path / "build" / "out.py", "x" * 1000)
+    write(tmp_path / "libs" / "core" / "pyproject.toml", '[project]\nname = "core-lib"\ndependencies = ["pydantic"]\n')
+    write(tmp_path / "libs" / "core" / "core.py", "y = 2\n")
+    write(tmp_path / "web" / "package.json", json.dumps({"name": "web", "dependencies": {"react": "^18"}}))
+    write(tmp_path / "web" / ".gitignore", "dist\n")
+    write(tmp_path / "web" / "dist" / "bundle.js", "z" * 500)
+    write(tmp_path / "web" / "index.ts", "export {}\n")
+    write(tmp_path / "svc" / "go.mod", "module example.com/svc\n\nrequire (\n\tgithub.com/x/y v1.0.0\n)\n")
+    write(tmp_path / ".git" / "HEAD", "ref: refs/heads/main\n")
+    return tmp_path
+
+@pytest.mark.asyncio
+async def test_analyzer_respects_gitignore_and_counts_languages(monorepo):
+    analysis = await CodebaseAnalyzer(str(monorepo)).analyze()
+
+    assert analysis["type"] == "Python"
+    assert analysis["structure"] == ["app", "libs", "svc", "web"]
+    assert analysis["dependencies"] == ["core-lib", "httpx"]
+    # build/, web/dist, debug.log, /secret.py and .git are skipped; app/secret.py and keep.log are not
+    assert analysis["languages"]["Python"]["files"] == 3
+    assert analysis["languages"]["TypeScript"] == {"files": 1, "bytes": 10}
+    assert "JavaScript" not in analysis["languages"]
+    assert analysis["files"] == 11
+
+@pytest.mark.asyncio
+async def test_analyzer_builds_dependency_graph(monorepo):
+    graph = (await CodebaseAnalyzer(str(monorepo)).analyze())["dependency_graph"]
+
+    nodes = {n["path"]: n for n in graph["nodes"]}
+    assert set(nodes) == {"pyproject.toml", "libs/core/pyproject.toml", "web/package.json", "svc/go.mod"}
+    assert nodes["svc/go.mod"]["dependencies"] == ["github.com/x/y"]
+    assert nodes["web/package.json"]["ecosystem"] == "node"
+    assert graph["edges"] == [["pyproject.toml", "libs/core/pyproject.toml"]]
+
+@pytest.mark.asyncio
+async def test_analyzer_streams_progress_and_manifests(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.codebase_analyzer.PROGRESS_EVERY", 10)
+    for i in range(35):
+        write(tmp_path / f"pkg{i % 5}" / f"m{i}.py", "pass\n")
+    write(tmp_path / "requirements.txt", "requests==2.0  # http\n-e .\n")
+
+    events = [e async for e in CodebaseAnalyzer(str(tmp_path), queue_size=1).stream()]
+
+    kinds = [e["event"] for e in events]
+    assert kinds.count("progress") == 3
+    assert kinds.count("manifest") == 1
+    assert kinds[-1] == "complete"
+    assert events[-1]["analysis"]["dependencies"] == ["requests"]
+
+@pytest.mark.asyncio
+async def test_abandoned_stream_stops_the_walk(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.codebase_analyzer.PROGRESS_EVERY", 1)
+    for i in range(50):
+        write(tmp_path / f"f{i}.py")
+
+    stream = CodebaseAnalyzer(str(tmp_path), queue_size=1).stream()
+    assert (await stream.__anext__())["event"] == "progress"
+    await stream.aclose()
+
+def test_ignore_rules():
+    rules = IgnoreRules().extend("", ["*.pyc", "docs/**/draft.md", "/top.txt", "cache/"])
+    sub = rules.extend("pkg", ["!important.pyc", "local.txt"])
+
+    assert rules.ignored("a/b.pyc", "b.pyc", False)
+    assert rules.ignored("docs/x/y/draft.md", "draft.md", False)
+    assert rules.ignored("docs/draft.md", "draft.md", False)
+    assert rules.ignored("top.txt", "top.txt", False)
+    assert not rules.ignored("a/top.txt", "top.txt", False)
+    assert rules.ignored("a/cache", "cache", True)
+    assert not rules.ignored("a/cache", "cache", False)
+    assert not sub.ignored("pkg/important.pyc", "important.pyc", False)
+    assert sub.ignored("pkg/local.txt", "local.txt", False)
@@ -0,0 +1,52 @@
+from src.core.conversation_context import (
+    build_window, context_window, estimate_tokens, fold_summary, history_budget, with_summary
+)
+
+def turns(n, words=50):
+    history = []
+    for i in range(n):
+        history.append((2 * i + 1, "user", f"Question {i}. " + "word " * words, None))
+        history.append((2 * i + 2, "assistant", f"Answer {i}. " + "word " * words, None))
+    return history
+
+def test_context_window_matches_longest_prefix():
+    assert context_window("gpt-4o-mini") == 128000
+    assert context_window("gpt-4") == 8192
+    assert context_window("llama3.2:latest") == 128000
+    assert context_window("some-local-model") == 4096
+
+def test_history_budget_is_capped_and_accounts_for_the_answer():
+    assert history_budget("gpt-4o", "sys", "hi", 500, cap=3000) == 3000
+    small = history_budget("unknown", "x" * 4000, "hi", 500, cap=3000)
+    assert small == 4096 - 500 - estimate_tokens("x" * 4000) - estimate_tokens("hi") - 8
+
+def test_window_keeps_newest_turns_and_evicts_the_rest():
+    history = turns(20)
+    window = build_window(history, budget=100000, max_turns=3)
+    assert [m["content"].split(".")[0] for m in window.messages] == [
+        "Question 17", "Answer 17", "Question 18", "Answer 18", "Question 19", "Answer 19"]
+    assert window.evicted_through == 34
+    assert len(window.evicted) == 34
+
+def test_window_respects_token_budget_and_starts_on_a_user_message():
+    history = turns(5)
+    per_message = estimate_tokens(history[0][2]) + 4
+    window = build_window(history, budget=per_message * 3, max_turns=10)
+    # Three messages would fit, but the oldest of them is an assistant reply
+    assert [m["role"] for m in window.messages] == ["user", "assistant"]
+    assert window.evicted_through == 8
+
+def test_fold_summary_is_extractive_and_bounded():
+    summary = fold_summary(None, [(1, "user", "What is blocking release? More detail here."),
+                                  (2, "assistant", "Two failing CI jobs.")], budget=1000)
+    assert summary == "- user: What is blocking release?\n- assistant: Two failing CI jobs."
+
+    evicted = [(i, "user", f"Line {i} " + "x" * 100) for i in range(3, 40)]
+    bounded = fold_summary(summary, evicted, budget=200)
+    assert estimate_tokens(bounded) <= 210
+    assert bounded.splitlines()[-1].startswith("- user: Line 39")
+    assert "blocking release" not in bounded
+
+def test_with_summary_appends_only_when_present():
+    assert with_summary("sys", None) == "sys"
+    assert with_summary("sys", "- user: hi").endswith("Earlier in this conversation:\n- user: hi")
@@ -0,0 +1,59 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from src.api.services import conversations
+from src.models.user import ConversationDB, ConversationMessageDB
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync: ConversationDB.metadata.create_all(
+            sync, tables=[ConversationDB.__table__, ConversationMessageDB.__table__]))
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+async def chat_turn(db, conversation_id, text, model="gpt-4"):
+    conversation = await conversations.get_conversation(db, "u1", conversation_id)
+    turn = await conversations.prepare_turn(db, conversation, "You are the PM.", text, model, 500)
+    await conversations.record_turn(db, turn, text, f"Reply to {text}.", f"openai:{model}")
+    return turn
+
+@pytest.mark.asyncio
+async def test_turns_are_persisted_in_order_and_scoped_to_the_owner(db):
+    conversation = await conversations.create_conversation(db, "u1")
+    first = await chat_turn(db, conversation.id, "What is on fire today?")
+    assert first.history == []
+
+    second = await chat_turn(db, conversation.id, "And tomorrow?")
+    assert second.history == [
+        {"role": "user", "content": "What is on fire today?"},
+        {"role": "assistant", "content": "Reply to What is on fire today?."},
+    ]
+
+    messages = await conversations.list_messages(db, conversation.id)
+    assert [(m.seq, m.role) for m in messages] == [(1, "user"), (2, "assistant"), (3, "user"), (4, "assistant")]
+    refreshed = await conversations.get_conversation(db, "u1", conversation.id)
+    assert refreshed.title == "What is on fire today?"
+    assert refreshed.message_count == 4
+    assert await conversations.get_conversation(db, "u2", conversation.id) is None
+
+@pytest.mark.asyncio
+async def test_old_turns_fold_into_the_summary(db, monkeypatch):
+    monkeypatch.setattr(conversations, "MAX_TURNS", 2)
+    conversation = await conversations.create_conversation(db, "u1")
+    for i in range(6):
+        turn = await chat_turn(db, conversation.id, f"Question {i}?")
+
+    # The last turn was built from the two newest pairs; older ones live in the summary
+    assert [m["content"] for m in turn.history if m["role"] == "user"] == ["Question 3?", "Question 4?"]
+    assert "- user: Question 2?" in turn.system_prompt
+    assert "Question 0?" in turn.system_prompt
+
+    refreshed = await conversations.get_conversation(db, "u1", conversation.id)
+    assert refreshed.summarized_through == 6
+    assert refreshed.summary == turn.summary
+
+    await conversations.delete_conversation(db, refreshed)
+    assert await conversations.list_messages(db, conversation.id) == []
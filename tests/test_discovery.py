@@ -0,0 +1,67 @@
+import os
+import subprocess
+import pytest
+from src.config.discovery import ProjectIndex, read_git_metadata
+
+def git(cwd, *args):
+    subprocess.run(["git", "-C", str(cwd), *args], check=True, capture_output=True,
+                   env={**os.environ, "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@e",
+                        "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@e",
+                        "GIT_AUTHOR_DATE": "1700000000 +0000", "GIT_COMMITTER_DATE": "1700000000 +0000"})
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "alpha" / ".git").mkdir(parents=True)
+    (tmp_path / "notes").mkdir()
+    return tmp_path
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_index_tracks_added_and_removed_projects(root, use_inotify):
+    index = ProjectIndex(str(root), use_inotify=use_inotify)
+    try:
+        assert index.projects() == ["alpha"]
+
+        (root / "beta" / ".git").mkdir(parents=True)
+        assert index.projects() == ["alpha", "beta"]
+
+        os.rename(root / "alpha", root / "gamma")
+        assert index.projects() == ["beta", "gamma"]
+    finally:
+        index.close()
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_index_sees_git_init_in_existing_directory(root, use_inotify):
+    index = ProjectIndex(str(root), use_inotify=use_inotify)
+    try:
+        assert index.projects() == ["alpha"]
+        (root / "notes" / ".git").mkdir()
+        assert index.projects() == ["alpha", "notes"]
+        os.rmdir(root / "alpha" / ".git")
+        assert index.projects() == ["notes"]
+    finally:
+        index.close()
+
+def test_listing_does_not_rescan_when_nothing_changed(root, monkeypatch):
+    index = ProjectIndex(str(root), use_inotify=False)
+    index.projects()
+    monkeypatch.setattr(os, "scandir", lambda *a: pytest.fail("rescanned"))
+    assert index.projects() == ["alpha"]
+
+def test_metadata_from_git_files(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "trunk")
+    (repo / "f.txt").write_text("x")
+    git(repo, "add", "f.txt")
+    git(repo, "commit", "-q", "-m", "first")
+    git(repo, "checkout", "-q", "-b", "feature")
+
+    meta = read_git_metadata(str(repo / ".git"))
+    assert meta == {"default_branch": "feature", "last_commit_time": 1700000000}
+
+    (repo / ".git" / "refs" / "remotes" / "origin").mkdir(parents=True)
+    (repo / ".git" / "refs" / "remotes" / "origin" / "HEAD").write_text("ref: refs/remotes/origin/trunk\n")
+    assert read_git_metadata(str(repo / ".git"))["default_branch"] == "trunk"
+
+    (repo / ".git" / "refs" / "remotes" / "origin" / "HEAD").write_text("ref: refs/remotes/origin/release/2.x\n")
+    assert read_git_metadata(str(repo / ".git"))["default_branch"] == "release/2.x"
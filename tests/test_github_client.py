@@ -1,6 +1,8 @@
+import subprocess
 import pytest
-from unittest.mock import AsyncMock, patch
-from src.clients.github_client import GitHubMCPClient
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.clients import github_client
+from src.clients.github_client import GitHubMCPClient, resolve_github_token
 
 @pytest.mark.asyncio
 async def test_github_client_list_issues():
@@ -71,3 +73,55 @@ async def test_github_client_create_issue():
             })
             
             await client.disconnect()
+
+def test_failed_token_lookup_is_retried_later(monkeypatch):
+    monkeypatch.setattr(github_client, "_cached_token", None)
+    monkeypatch.setattr(github_client, "_token_failed_at", None)
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    clock = [1000.0]
+    monkeypatch.setattr(github_client.time, "monotonic", lambda: clock[0])
+    gh = MagicMock(side_effect=subprocess.CalledProcessError(1, "gh"))
+    monkeypatch.setattr(github_client.subprocess, "run", gh)
+
+    assert resolve_github_token() == ""
+    assert resolve_github_token() == ""
+    assert gh.call_count == 1
+
+    # The user has since run `gh auth login`
+    gh.side_effect = None
+    gh.return_value = MagicMock(stdout="new_token\n")
+    clock[0] += github_client.TOKEN_RETRY_INTERVAL
+
+    assert resolve_github_token() == "new_token"
+    assert resolve_github_token() == "new_token"
+    assert gh.call_count == 2
+
+@pytest.mark.asyncio
+async def test_github_client_reconnects_with_new_token_after_auth_error(monkeypatch):
+    resolve = MagicMock(return_value="new_token")
+    monkeypatch.setattr(github_client, "resolve_github_token", resolve)
+
+    with patch("src.clients.github_client.stdio_client") as mock_stdio:
+        mock_stdio.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+
+        with patch("src.clients.github_client.ClientSession") as mock_session_cls:
+            mock_session = mock_session_cls.return_value
+            mock_session.initialize = AsyncMock()
+
+            denied = MagicMock(is_error=True, content=[MagicMock(text="GET /repos/o/r/issues: 401 Bad credentials")])
+            ok = MagicMock(is_error=False, content=[MagicMock(text="[]")])
+            mock_session.call_tool = AsyncMock(side_effect=[denied, ok])
+
+            client = GitHubMCPClient(token="revoked_token")
+            await client.connect()
+
+            issues = await client.list_issues("owner", "repo")
+
+            assert issues == []
+            resolve.assert_called_once_with(True)
+            assert client.token == "new_token"
+            assert mock_session.initialize.await_count == 2
+            env = mock_stdio.call_args.args[0].env
+            assert env["GITHUB_TOKEN"] == "new_token"
+
+            await client.disconnect()
@@ -0,0 +1,104 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+from src.api.services.http_clients import HTTPClientRegistry, origin_of
+
+def test_origin_of_normalizes_default_ports():
+    assert origin_of("https://API.github.com/user") == "https://api.github.com:443"
+    assert origin_of("https://api.github.com:443/repos") == "https://api.github.com:443"
+    assert origin_of("http://localhost:11434/v1/models") == "http://localhost:11434"
+
+@pytest.mark.asyncio
+async def test_registry_reuses_one_client_per_origin():
+    registry = HTTPClientRegistry(max_connections_per_host=4)
+    try:
+        github = registry.client_for("https://api.github.com/user")
+        assert registry.client_for("https://api.github.com/repos/a/b/issues") is github
+        assert registry.client_for("https://github.com/login/oauth/access_token") is not github
+        assert len(registry.stats()["hosts"]) == 2
+    finally:
+        await registry.aclose()
+    assert github.is_closed
+    with pytest.raises(RuntimeError):
+        registry.client_for("https://api.github.com/user")
+
+@pytest.mark.asyncio
+async def test_session_routes_by_origin_with_default_timeout():
+    registry = HTTPClientRegistry()
+    try:
+        client = registry.client_for("https://llm.example.com/v1")
+        client.request = AsyncMock(return_value=httpx.Response(200))
+        async with registry.session(timeout=30.0) as session:
+            await session.post("https://llm.example.com/v1/chat/completions", json={})
+            await session.get("https://llm.example.com/v1/models", timeout=5.0)
+        # Leaving the block keeps the pooled client open
+        assert not client.is_closed
+        first, second = client.request.await_args_list
+        assert first.args == ("POST", "https://llm.example.com/v1/chat/completions")
+        assert first.kwargs["timeout"] == 30.0
+        assert second.kwargs["timeout"] == 5.0
+    finally:
+        await registry.aclose()
+
+@pytest.mark.asyncio
+async def test_least_recently_used_host_is_evicted():
+    registry = HTTPClientRegistry(max_hosts=2)
+    try:
+        a = registry.client_for("https://a.example.com")
+        b = registry.client_for("https://b.example.com")
+        registry.client_for("https://a.example.com")
+        registry.client_for("https://c.example.com")
+        assert registry.stats()["hosts"] == ["https://a.example.com:443", "https://c.example.com:443"]
+        assert registry.client_for("https://a.example.com") is a
+    finally:
+        await registry.aclose()
+    # Retired clients still waiting out their grace period are closed too
+    assert a.is_closed and b.is_closed
+
+@pytest.mark.asyncio
+async def test_evicted_client_stays_open_until_its_stream_ends(monkeypatch):
+    import asyncio
+    from src.api.services import http_clients
+
+    real_client = httpx.AsyncClient
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text="data: x\n\n"))
+    monkeypatch.setattr(http_clients.httpx, "AsyncClient", lambda **kw: real_client(transport=transport, **kw))
+
+    registry = HTTPClientRegistry(max_hosts=1)
+    try:
+        async with registry.session() as session:
+            async with session.stream("POST", "https://llm.example.com/v1/chat/completions") as response:
+                streaming = registry.client_for("https://llm.example.com")
+                # Evicts the streaming client's origin mid-stream
+                await session.get("https://other.example.com/")
+                await asyncio.sleep(0)
+                assert not streaming.is_closed
+                assert await response.aread() == b"data: x\n\n"
+            await asyncio.sleep(0)
+            assert streaming.is_closed
+    finally:
+        await registry.aclose()
+
+@pytest.mark.asyncio
+async def test_shared_clients_do_not_carry_cookies_between_requests(monkeypatch):
+    from src.api.services import http_clients
+
+    sent = []
+
+    def handler(request):
+        sent.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "session=alice; Path=/"})
+
+    real_client = httpx.AsyncClient
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(http_clients.httpx, "AsyncClient", lambda **kw: real_client(transport=transport, **kw))
+
+    registry = HTTPClientRegistry()
+    try:
+        async with registry.session() as session:
+            await session.get("https://coder.example.com/api/v2/users/me")
+            await session.get("https://coder.example.com/api/v2/users/me")
+        assert sent == [None, None]
+        assert not registry.client_for("https://coder.example.com").cookies
+    finally:
+        await registry.aclose()
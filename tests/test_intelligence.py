@@ -11,8 +11,8 @@ def test_research_engine_save_artifact(tmp_path):
     
     file_path = engine.save_artifact(task_id, "data", {"result": 42}, "json")
     
-    assert os.path.exists(file_path)
-    with open(file_path, "r") as f:
+    assert file_path == os.path.join(engine.get_task_artifact_path(task_id), "data.json")
+    with engine.open_artifact(task_id, "data.json") as f:
         data = json.load(f)
         assert data["result"] == 42
 
@@ -26,6 +26,41 @@ def test_research_engine_generate_report(tmp_path):
     assert "Research Report: Research Task" in report
     assert "observation.txt" in report
 
+def test_research_report_is_incremental(tmp_path):
+    engine = ResearchEngine(str(tmp_path))
+    task = Task(id="t1", title="Research Task", project_name="p1", type=TaskType.RESEARCH)
+    engine.save_artifact(task.id, "a", "first finding", "txt")
+    engine.save_artifact(task.id, "b", {"k": 1}, "json")
+
+    report = engine.generate_report(task)
+    assert "- a.txt\n  > first finding" in report
+    assert "report.md" not in report
+
+    opened = []
+    original = engine.open_artifact
+    engine.open_artifact = lambda *args: opened.append(args) or original(*args)
+    report_path = engine.write_report(task)
+    mtime = os.stat(report_path).st_mtime_ns
+
+    # Nothing changed: no artifact is read and report.md is left alone
+    assert engine.write_report(task) == report_path
+    assert opened == [] and os.stat(report_path).st_mtime_ns == mtime
+
+    # Only the changed artifact is read again
+    engine.save_artifact(task.id, "a", "second finding", "txt")
+    assert "> second finding" in engine.generate_report(task)
+    assert opened == [(task.id, "a.txt")]
+
+def test_research_report_streams_lines(tmp_path):
+    engine = ResearchEngine(str(tmp_path))
+    task = Task(id="t1", title="Research Task", project_name="p1", type=TaskType.RESEARCH)
+    for i in range(3):
+        engine.save_artifact(task.id, f"n{i}", f"note {i}", "txt")
+
+    chunks = list(engine.iter_report(task))
+    assert chunks[0] == "# Research Report: Research Task"
+    assert "".join(chunks) == engine.generate_report(task)
+
 @pytest.mark.asyncio
 async def test_project_analyze_codebase(tmp_path):
     # Setup mock project
@@ -52,3 +87,132 @@ async def test_project_analyze_codebase(tmp_path):
     assert analysis["type"] == "Python"
     assert "src" in analysis["structure"]
     assert "mcp" in analysis["dependencies"]
+
+@pytest.mark.asyncio
+async def test_projects_health_all_runs_concurrently_with_deadline(tmp_path):
+    import asyncio
+    from unittest.mock import patch, AsyncMock
+    from mcp.server.fastmcp import FastMCP
+    from src.config.coder import CoderSettings
+    from src.models.project import ProjectStatus, GitInfo, GitHubInfo, TaskSummary
+    from src.server.tools.intelligence_tools import register_intelligence_tools
+
+    for name in ("fast", "broken", "slow"):
+        (tmp_path / name / ".git").mkdir(parents=True)
+
+    async def get_status(self, include_suggestions=True):
+        if self.project_name == "slow":
+            await asyncio.sleep(10)
+        if self.project_name == "broken":
+            raise RuntimeError("git exploded")
+        return ProjectStatus(
+            project=self.project_name, path=self.project_path,
+            git=GitInfo(branch="main", is_dirty=False, ahead=0, behind=0, last_commit={},
+                        modified_files=[], untracked_files=[]),
+            github=GitHubInfo(), tasks=TaskSummary(total=0, by_status={}, recent=[]),
+        )
+
+    mcp = FastMCP("test")
+    register_intelligence_tools(mcp, CoderSettings(projects_root=str(tmp_path)), MagicMock(),
+                                ResearchEngine(str(tmp_path / "artifacts")))
+
+    with patch("src.core.project_context.ProjectContext.initialize", AsyncMock()), \
+         patch("src.core.project_context.ProjectContext.close", AsyncMock()), \
+         patch("src.core.project_context.ProjectContext.get_status", get_status):
+        result_json, _ = await asyncio.wait_for(
+            mcp.call_tool("projects_health_all", {"max_concurrency": 3, "timeout": 0.5}), timeout=5
+        )
+
+    result = json.loads(result_json[0].text)
+    by_project = {r["project"]: r for r in result["projects"]}
+    assert result["total"] == 3
+    assert result["timed_out"] == ["slow"]
+    assert by_project["fast"]["overall_score"] == 70
+    assert "git exploded" in by_project["broken"]["error"]
+
+@pytest.mark.asyncio
+async def test_report_progress_falls_back_without_message():
+    from src.server.tools.intelligence_tools import _report_progress
+
+    calls = []
+
+    class OldContext:
+        async def report_progress(self, progress, total=None):
+            calls.append((progress, total))
+
+    await _report_progress(OldContext(), 3, {"event": "progress", "files": 3})
+    assert calls == [(3, None)]
+
+@pytest.mark.asyncio
+async def test_projects_health_all_timeouts_release_pool_slots(tmp_path):
+    import asyncio
+    from unittest.mock import patch, AsyncMock
+    from mcp.server.fastmcp import FastMCP
+    from src.clients.pool import MCPClientPool
+    from src.config.coder import CoderSettings
+    from src.server.tools.intelligence_tools import register_intelligence_tools
+
+    for name in ("a", "b"):
+        (tmp_path / name / ".git").mkdir(parents=True)
+
+    async def never_connects():
+        await asyncio.sleep(10)
+
+    def slow_client(project_path):
+        client = MagicMock()
+        client.connect = AsyncMock(side_effect=never_connects)
+        client.disconnect = AsyncMock()
+        return client
+
+    git_pool = MCPClientPool(max_size=1)
+    mcp = FastMCP("test")
+    register_intelligence_tools(mcp, CoderSettings(projects_root=str(tmp_path)), MagicMock(),
+                                ResearchEngine(str(tmp_path / "artifacts")), git_pool=git_pool)
+
+    with patch("src.core.project_context.GitMCPClient", slow_client):
+        result_json, _ = await asyncio.wait_for(
+            mcp.call_tool("projects_health_all", {"max_concurrency": 2, "timeout": 0.2}), timeout=5
+        )
+
+    assert json.loads(result_json[0].text)["timed_out"] == ["a", "b"]
+    assert len(git_pool) == 0
+    # The cancelled connects gave their slots back, so another key is served at once
+    fresh = MagicMock(connect=AsyncMock(), disconnect=AsyncMock(), ping=AsyncMock())
+    assert await asyncio.wait_for(git_pool.acquire("/other", lambda: fresh), timeout=1) is fresh
+    await git_pool.release("/other")
+    await git_pool.close()
+
+@pytest.mark.asyncio
+async def test_project_health_flags_stale_branches(tmp_path):
+    from datetime import datetime, timedelta
+    from unittest.mock import patch, AsyncMock
+    from mcp.server.fastmcp import FastMCP
+    from src.config.coder import CoderSettings
+    from src.core.suggestions import SuggestionsEngine
+    from src.models.project import ProjectStatus, GitInfo, GitHubInfo, TaskSummary
+    from src.server.tools.intelligence_tools import register_intelligence_tools
+
+    (tmp_path / "proj" / ".git").mkdir(parents=True)
+    old = (datetime.now() - timedelta(days=45)).isoformat()
+
+    async def get_status(self, include_suggestions=True):
+        git = GitInfo(branch="main", is_dirty=False, ahead=0, behind=0, last_commit={},
+                      modified_files=[], untracked_files=[],
+                      branches=[{"name": "main"}, {"name": "old-feature", "last_commit_date": old}])
+        github = GitHubInfo()
+        return ProjectStatus(
+            project=self.project_name, path=self.project_path, git=git, github=github,
+            tasks=TaskSummary(total=0, by_status={}, recent=[]),
+            suggestions=SuggestionsEngine().generate_suggestions(git, github),
+        )
+
+    mcp = FastMCP("test")
+    register_intelligence_tools(mcp, CoderSettings(projects_root=str(tmp_path)), MagicMock(),
+                                ResearchEngine(str(tmp_path / "artifacts")))
+
+    with patch("src.core.project_context.ProjectContext.initialize", AsyncMock()), \
+         patch("src.core.project_context.ProjectContext.close", AsyncMock()), \
+         patch("src.core.project_context.ProjectContext.get_status", get_status):
+        result_json, _ = await mcp.call_tool("project_health_check", {"project_name": "proj"})
+
+    assert json.loads(result_json[0].text)["checks"]["has_stale_branches"] is True
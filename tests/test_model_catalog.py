@@ -0,0 +1,91 @@
+import asyncio
+import httpx
+import pytest
+from src.api.services.http_clients import HTTPClientRegistry
+from src.api.services.model_catalog import ModelCatalog, ModelCatalogError
+
+def catalog_with(handler, **kwargs):
+    registry = HTTPClientRegistry()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    registry.client_for = lambda url: client
+    return ModelCatalog(registry, **kwargs)
+
+def models_handler(calls, delay=0.0):
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"data": [{"id": "b"}, {"id": f"a{len(calls)}"}]})
+    return handler
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_request_and_hits_are_cached():
+    calls = []
+    catalog = catalog_with(models_handler(calls, delay=0.05))
+    results = await asyncio.gather(*[catalog.list_models("http://ollama:11434/v1") for _ in range(10)])
+    assert all(r == ["a1", "b"] for r in results)
+    assert await catalog.list_models("http://ollama:11434/v1") == ["a1", "b"]
+    assert len(calls) == 1
+
+    # Another key is another entry
+    await catalog.list_models("http://ollama:11434/v1", api_key="secret")
+    assert len(calls) == 2
+    assert calls[1].headers["Authorization"] == "Bearer secret"
+    await catalog.aclose()
+
+@pytest.mark.asyncio
+async def test_stale_list_is_served_while_refreshing_in_background():
+    calls = []
+    catalog = catalog_with(models_handler(calls, delay=0.05), ttl=0.0, stale_ttl=60.0)
+    assert await catalog.list_models("http://llm/v1") == ["a1", "b"]
+
+    # Stale: answered from cache without waiting for the slow host
+    assert await asyncio.wait_for(catalog.list_models("http://llm/v1"), timeout=0.01) == ["a1", "b"]
+    await asyncio.sleep(0.1)
+    assert await catalog.list_models("http://llm/v1") == ["a2", "b"]
+    await catalog.aclose()
+
+@pytest.mark.asyncio
+async def test_failures_map_to_http_status_and_are_not_cached():
+    responses = [httpx.Response(401, text="nope"), httpx.Response(200, json={"data": [{"id": "gpt-4"}]})]
+    catalog = catalog_with(lambda request: responses.pop(0))
+    with pytest.raises(ModelCatalogError) as excinfo:
+        await catalog.list_models("http://llm/v1")
+    assert excinfo.value.status_code == 502
+    assert "Status: 401" in excinfo.value.detail
+    assert await catalog.list_models("http://llm/v1") == ["gpt-4"]
+
+    def timeout(request):
+        raise httpx.ReadTimeout("slow", request=request)
+
+    with pytest.raises(ModelCatalogError) as excinfo:
+        await catalog_with(timeout).list_models("http://slow/v1")
+    assert excinfo.value.status_code == 504
+
+@pytest.mark.asyncio
+async def test_refresh_loop_keeps_used_lists_warm():
+    calls = []
+    catalog = catalog_with(models_handler(calls), ttl=0.05, stale_ttl=60.0)
+    await catalog.list_models("http://llm/v1")
+    catalog.start(interval=0.02)
+    await asyncio.sleep(0.15)
+    await catalog.aclose()
+    assert len(calls) >= 2
+
+@pytest.mark.asyncio
+async def test_ad_hoc_fetches_and_invalidated_lists_are_not_kept():
+    calls = []
+    catalog = catalog_with(models_handler(calls, delay=0.05))
+    assert await catalog.fetch_models("http://llm/v1", api_key="typed-in") == ["a1", "b"]
+    assert not catalog._entries
+
+    await catalog.list_models("http://llm/v1", api_key="saved")
+    catalog.invalidate("http://llm/v1", api_key="saved")
+    assert await catalog.list_models("http://llm/v1", api_key="saved") == ["a3", "b"]
+
+    # A refresh that was running when the account changed does not store its list
+    pending = asyncio.ensure_future(catalog.list_models("http://other/v1"))
+    await asyncio.sleep(0)
+    catalog.invalidate("http://other/v1")
+    assert await pending == ["a4", "b"]
+    assert await catalog.list_models("http://other/v1") == ["a5", "b"]
+    await catalog.aclose()
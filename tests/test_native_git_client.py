@@ -0,0 +1,57 @@
+import subprocess
+import pytest
+from src.clients.native_git_client import NativeGitClient
+
+def git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q", "-b", "main")
+    git(tmp_path, "config", "user.email", "dev@example.com")
+    git(tmp_path, "config", "user.name", "Dev")
+    (tmp_path / "README.md").write_text("hello\n")
+    git(tmp_path, "add", "README.md")
+    git(tmp_path, "commit", "-q", "-m", "Initial commit")
+    git(tmp_path, "branch", "feature")
+    git(tmp_path, "remote", "add", "origin", "git@github.com:owner/repo.git")
+    return tmp_path
+
+@pytest.mark.asyncio
+async def test_native_git_status(repo):
+    (repo / "README.md").write_text("changed\n")
+    (repo / "new file.txt").write_text("new\n")
+
+    status = await NativeGitClient(str(repo)).get_status()
+
+    assert status["branch"] == "main"
+    assert status["is_dirty"] is True
+    assert status["modified_files"] == ["README.md"]
+    assert status["untracked_files"] == ["new file.txt"]
+    assert status["last_commit"]["message"] == "Initial commit"
+    assert status["last_commit"]["author"] == "Dev"
+
+@pytest.mark.asyncio
+async def test_native_git_branches_log_and_remotes(repo):
+    client = NativeGitClient(str(repo))
+
+    branches = await client.list_branches()
+    assert [b["name"] for b in branches] == ["feature", "main"]
+    assert next(b for b in branches if b["name"] == "main")["is_current"] is True
+    assert branches[0]["last_commit_date"]
+
+    log = await client.get_log(max_count=5)
+    assert len(log) == 1
+    assert log[0]["message"] == "Initial commit"
+
+    remotes = await client._call_tool("git_list_remotes", {})
+    assert remotes == [{"name": "origin", "url": "git@github.com:owner/repo.git"}]
+
+@pytest.mark.asyncio
+async def test_native_git_status_on_empty_repo(tmp_path):
+    subprocess.run(["git", "init", "-q", "-b", "main", str(tmp_path)], check=True)
+
+    status = await NativeGitClient(str(tmp_path)).get_status()
+
+    assert status["branch"] == "main"
+    assert status["last_commit"] == {}
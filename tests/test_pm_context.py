@@ -0,0 +1,63 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from src.api.routers import chat
+from src.api.services.pm_context import PMContextCache
+
+def prepared(prompt="sys"):
+    return chat.PreparedChat("a1", "openai", "key", "https://api.openai.com/v1", "gpt-4", prompt)
+
+def test_invalidation_is_scoped_to_the_user_unless_global():
+    cache = PMContextCache()
+    cache.put("u1", (None, None), prepared())
+    cache.put("u2", (None, None), prepared())
+
+    cache.invalidate_account("a9", "u1")
+    assert cache.get("u1", (None, None)) is None
+    assert cache.get("u2", (None, None)) is not None
+
+    cache.invalidate_account("a9", "u1", is_global=True)
+    assert cache.get("u2", (None, None)) is None
+
+def test_account_invalidation_reaches_every_user_that_resolved_to_it():
+    cache = PMContextCache()
+    # u2 resolved to a1, which belongs to u1 (e.g. while it was shared globally)
+    cache.put("u2", (None, None), prepared(), account_id="a1")
+    cache.put("u2", ("a2", None), prepared(), account_id="a2")
+    cache.put("u3", (None, None), prepared(), account_id="a2")
+
+    cache.invalidate_account("a1", "u1")
+
+    assert cache.get("u2", (None, None)) is None
+    assert cache.get("u2", ("a2", None)) is not None
+    assert cache.get("u3", (None, None)) is not None
+
+def test_entries_expire_and_users_are_bounded():
+    cache = PMContextCache(ttl=0.0, max_users=2)
+    cache.put("u1", "k", prepared())
+    assert cache.get("u1", "k") is None
+
+    cache.ttl = 60.0
+    for user in ("u1", "u2", "u3"):
+        cache.put(user, "k", prepared())
+    assert cache.get("u1", "k") is None
+    assert cache.stats()["users"] == 2
+
+@pytest.mark.asyncio
+async def test_prepare_pm_chat_builds_once_per_user_and_selection(monkeypatch):
+    build = AsyncMock(side_effect=lambda msg, user, db: prepared(f"prompt for {msg.model_name}"))
+    monkeypatch.setattr(chat, "_build_pm_chat", build)
+    cache = PMContextCache()
+    user = SimpleNamespace(id="u1")
+
+    first = await chat.prepare_pm_chat(chat.ChatMessage(message="hi"), user, None, cache)
+    again = await chat.prepare_pm_chat(chat.ChatMessage(message="status?"), user, None, cache)
+    other_model = await chat.prepare_pm_chat(chat.ChatMessage(message="hi", model_name="gpt-4o"), user, None, cache)
+
+    assert again is first
+    assert other_model.system_prompt == "prompt for gpt-4o"
+    assert build.await_count == 2
+
+    cache.invalidate_user("u1")
+    await chat.prepare_pm_chat(chat.ChatMessage(message="hi"), user, None, cache)
+    assert build.await_count == 3
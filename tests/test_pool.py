@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.clients.pool import MCPClientPool
+
+def make_client():
+    client = MagicMock()
+    client.connect = AsyncMock()
+    client.disconnect = AsyncMock()
+    client.ping = AsyncMock()
+    return client
+
+@pytest.mark.asyncio
+async def test_pool_reuses_session_per_key():
+    pool = MCPClientPool(max_size=2)
+    factory = MagicMock(side_effect=make_client)
+
+    first = await pool.acquire("/repo/a", factory)
+    await pool.release("/repo/a")
+    second = await pool.acquire("/repo/a", factory)
+
+    assert first is second
+    assert factory.call_count == 1
+    first.connect.assert_awaited_once()
+
+    await pool.release("/repo/a")
+    await pool.close()
+    first.disconnect.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_pool_evicts_lru_when_full():
+    pool = MCPClientPool(max_size=1)
+
+    a = await pool.acquire("/repo/a", make_client)
+    await pool.release("/repo/a")
+    b = await pool.acquire("/repo/b", make_client)
+
+    assert len(pool) == 1
+    a.disconnect.assert_awaited_once()
+    b.disconnect.assert_not_awaited()
+
+    await pool.release("/repo/b")
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_pool_evicts_idle_sessions():
+    pool = MCPClientPool(idle_timeout=0)
+
+    client = await pool.acquire("/repo/a", make_client)
+    await pool.release("/repo/a")
+    await pool.evict_idle()
+
+    assert len(pool) == 0
+    client.disconnect.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_after_failed_health_check():
+    pool = MCPClientPool(health_check_interval=0)
+
+    client = await pool.acquire("/repo/a", make_client)
+    await pool.release("/repo/a")
+    client.ping.side_effect = RuntimeError("server died")
+
+    same = await pool.acquire("/repo/a", make_client)
+
+    assert same is client
+    assert client.connect.await_count == 2
+    client.disconnect.assert_awaited_once()
+
+    await pool.release("/repo/a")
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_cancelled_acquire_does_not_leak_a_slot():
+    pool = MCPClientPool(max_size=1)
+    connecting = asyncio.Event()
+
+    def slow_client():
+        client = make_client()
+
+        async def connect():
+            connecting.set()
+            await asyncio.sleep(10)
+
+        client.connect = AsyncMock(side_effect=connect)
+        return client
+
+    task = asyncio.create_task(pool.acquire("/repo/slow", slow_client))
+    await connecting.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+
+    assert len(pool) == 0
+    # With the slot freed, another key is served instead of waiting forever
+    other = await asyncio.wait_for(pool.acquire("/repo/b", make_client), timeout=1)
+    other.connect.assert_awaited_once()
+    await pool.release("/repo/b")
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_restarts_of_one_generation_respawn_once():
+    pool = MCPClientPool()
+
+    def counting_client():
+        client = make_client()
+        client.generation = 0
+
+        async def connect():
+            await asyncio.sleep(0)
+            client.generation += 1
+
+        client.connect = AsyncMock(side_effect=connect)
+        return client
+
+    client = await pool.acquire("/repo/a", counting_client)
+    restart = client.set_reconnect_handler.call_args.args[0]
+    dead = client.generation
+
+    await asyncio.gather(*(restart(dead) for _ in range(3)))
+
+    assert client.connect.await_count == 2
+    client.disconnect.assert_awaited_once()
+    assert client.generation == dead + 1
+
+    await pool.release("/repo/a")
+    await pool.close()
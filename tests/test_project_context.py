@@ -3,11 +3,20 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from src.core.project_context import ProjectContext
 from src.config.coder import CoderSettings
 from src.models.task import Task
+from src.models.project import TaskSummary
+
+def summary_for(tasks):
+    by_status = {}
+    for t in tasks:
+        by_status[t.status.value] = by_status.get(t.status.value, 0) + 1
+    recent = [{"id": t.id, "title": t.title, "status": t.status.value} for t in tasks[:5]]
+    return TaskSummary(total=len(tasks), by_status=by_status, recent=recent)
 
 @pytest.fixture
 def mock_storage():
     storage = MagicMock()
-    storage.list_tasks.return_value = []
+    storage.linked_issue_numbers = AsyncMock(return_value=set())
+    storage.summarize = AsyncMock(return_value=summary_for([]))
     return storage
 
 @pytest.fixture
@@ -29,7 +38,7 @@ async def test_project_context_get_status():
             "is_dirty": True,
             "modified_files": ["README.md"]
         })
-        mock_git._call_tool = AsyncMock(return_value=[{"name": "origin", "url": "https://github.com/owner/repo.git"}])
+        mock_git.list_remotes = AsyncMock(return_value=[{"name": "origin", "url": "https://github.com/owner/repo.git"}])
         
         mock_github = mock_github_cls.return_value
         mock_github.connect = AsyncMock()
@@ -37,9 +46,9 @@ async def test_project_context_get_status():
         mock_github.list_issues = AsyncMock(return_value=[])
         
         storage = MagicMock()
-        storage.list_tasks.return_value = [
-            Task(id="1", project_name="test", title="Task 1", type="standard")
-        ]
+        tasks = [Task(id="1", project_name="test", title="Task 1", type="standard")]
+        storage.linked_issue_numbers = AsyncMock(return_value=set())
+        storage.summarize = AsyncMock(return_value=summary_for(tasks))
         
         ctx = ProjectContext("test", CoderSettings(projects_root="/tmp"), storage)
         await ctx.initialize()
@@ -53,3 +62,158 @@ async def test_project_context_get_status():
         assert len(status.suggestions) > 0 # Should have commit suggestion
         
         await ctx.close()
+
+@pytest.mark.asyncio
+async def test_project_context_shares_pooled_sessions():
+    from src.clients.pool import MCPClientPool
+
+    with patch("src.core.project_context.GitMCPClient") as mock_git_cls, \
+         patch("src.core.project_context.GitHubMCPClient") as mock_github_cls, \
+         patch("src.core.project_context.resolve_github_token", return_value="fake_token"):
+
+        mock_git = mock_git_cls.return_value
+        mock_git.connect = AsyncMock()
+        mock_git.disconnect = AsyncMock()
+        mock_git.get_status = AsyncMock(return_value={"branch": "main"})
+        mock_git.list_branches = AsyncMock(return_value=[])
+        mock_git.list_remotes = AsyncMock(return_value=[{"name": "origin", "url": "git@github.com:owner/repo.git"}])
+
+        mock_github = mock_github_cls.return_value
+        mock_github.connect = AsyncMock()
+        mock_github.disconnect = AsyncMock()
+        mock_github.list_issues = AsyncMock(return_value=[{"number": 1, "title": "Bug"}])
+
+        storage = MagicMock()
+        storage.linked_issue_numbers = AsyncMock(return_value=set())
+        storage.summarize = AsyncMock(return_value=summary_for([]))
+        git_pool, github_pool = MCPClientPool(), MCPClientPool()
+
+        for _ in range(3):
+            ctx = ProjectContext("test", CoderSettings(projects_root="/tmp"), storage,
+                                 git_pool=git_pool, github_pool=github_pool)
+            await ctx.initialize()
+            status = await ctx.get_status()
+            await ctx.close()
+            assert status.github.repo == "repo"
+            assert len(status.github.issues) == 1
+
+        mock_git.connect.assert_awaited_once()
+        mock_github.connect.assert_awaited_once()
+        mock_github_cls.assert_called_once_with("fake_token")
+
+        await git_pool.close()
+        await github_pool.close()
+        mock_github.disconnect.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_project_context_returns_partial_status_when_github_is_slow():
+    import asyncio
+
+    async def slow_issues(owner, repo):
+        await asyncio.sleep(5)
+        return []
+
+    with patch("src.core.project_context.GitMCPClient") as mock_git_cls, \
+         patch("src.core.project_context.GitHubMCPClient") as mock_github_cls, \
+         patch("src.core.project_context.resolve_github_token", return_value="fake_token"):
+
+        mock_git = mock_git_cls.return_value
+        mock_git.connect = AsyncMock()
+        mock_git.disconnect = AsyncMock()
+        mock_git.get_status = AsyncMock(return_value={"branch": "main"})
+        mock_git.list_branches = AsyncMock(return_value=[])
+        mock_git.list_remotes = AsyncMock(return_value=[{"name": "origin", "url": "https://github.com/owner/repo.git"}])
+
+        mock_github = mock_github_cls.return_value
+        mock_github.connect = AsyncMock()
+        mock_github.disconnect = AsyncMock()
+        mock_github.list_issues = slow_issues
+
+        storage = MagicMock()
+        tasks = [Task(id="1", project_name="test", title="Task 1", type="standard")]
+        storage.linked_issue_numbers = AsyncMock(return_value=set())
+        storage.summarize = AsyncMock(return_value=summary_for(tasks))
+
+        ctx = ProjectContext("test", CoderSettings(projects_root="/tmp"), storage,
+                             timeouts={"github": 0.05})
+        await ctx.initialize()
+        status = await asyncio.wait_for(ctx.get_status(), timeout=1)
+        await ctx.close()
+
+        assert status.git.branch == "main"
+        assert status.github.issues == []
+        assert status.tasks.total == 1
+
+@pytest.mark.asyncio
+async def test_project_context_reuses_cached_sections():
+    from src.core.status_cache import StatusCache
+
+    with patch("src.core.project_context.GitMCPClient") as mock_git_cls:
+        mock_git = mock_git_cls.return_value
+        mock_git.connect = AsyncMock()
+        mock_git.disconnect = AsyncMock()
+        mock_git.get_status = AsyncMock(return_value={"branch": "main"})
+        mock_git.list_branches = AsyncMock(return_value=[])
+        mock_git.list_remotes = AsyncMock(return_value=[])
+
+        storage = MagicMock()
+        storage.revision.return_value = 1
+        storage.linked_issue_numbers = AsyncMock(return_value=set())
+        storage.summarize = AsyncMock(return_value=summary_for([]))
+        cache = StatusCache()
+
+        for _ in range(2):
+            ctx = ProjectContext("test", CoderSettings(projects_root="/tmp"), storage, status_cache=cache)
+            await ctx.initialize()
+            await ctx.get_status()
+            await ctx.close()
+
+        mock_git.get_status.assert_awaited_once()
+        storage.linked_issue_numbers.assert_awaited_once()
+        storage.summarize.assert_awaited_once()
+
+        # A task write bumps the storage revision and invalidates the task section
+        storage.revision.return_value = 2
+        ctx = ProjectContext("test", CoderSettings(projects_root="/tmp"), storage, status_cache=cache)
+        await ctx.initialize()
+        await ctx.get_status()
+        await ctx.close()
+        assert storage.linked_issue_numbers.await_count == 2
+        mock_git.get_status.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_project_context_does_not_cache_failed_or_partial_sections():
+    from src.core.status_cache import StatusCache
+
+    with patch("src.core.project_context.GitMCPClient") as mock_git_cls, \
+         patch("src.core.project_context.GitHubMCPClient") as mock_github_cls, \
+         patch("src.core.project_context.resolve_github_token", return_value="fake_token"):
+        mock_git = mock_git_cls.return_value
+        mock_git.connect = AsyncMock()
+        mock_git.disconnect = AsyncMock()
+        mock_git.get_status = AsyncMock(return_value={"branch": "main"})
+        mock_git.list_branches = AsyncMock(side_effect=[RuntimeError("busy"), [{"name": "main"}]])
+        mock_git.list_remotes = AsyncMock(return_value=[{"name": "origin", "url": "https://github.com/owner/repo.git"}])
+
+        mock_github = mock_github_cls.return_value
+        mock_github.connect = AsyncMock()
+        mock_github.disconnect = AsyncMock()
+        mock_github.list_issues = AsyncMock(side_effect=[RuntimeError("502 Bad Gateway"), [{"number": 7}]])
+
+        storage = MagicMock()
+        storage.revision.return_value = 1
+        storage.linked_issue_numbers = AsyncMock(return_value=set())
+        storage.summarize = AsyncMock(return_value=summary_for([]))
+        cache = StatusCache()
+
+        statuses = []
+        for _ in range(2):
+            ctx = ProjectContext("test", CoderSettings(projects_root="/tmp"), storage, status_cache=cache)
+            await ctx.initialize()
+            statuses.append(await ctx.get_status(include_suggestions=False))
+            await ctx.close()
+
+        # First pass degraded, second pass refetched instead of serving the degraded values
+        assert statuses[0].github.issues == [] and statuses[1].github.issues == [{"number": 7}]
+        assert statuses[0].git.branches == [] and statuses[1].git.branches == [{"name": "main"}]
+        assert mock_git.get_status.await_count == 2
@@ -0,0 +1,95 @@
+import json
+import httpx
+import pytest
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api.routers import chat
+from src.api.services.http_clients import HTTPClientRegistry, get_http_clients
+from src.api.services.pm_context import get_pm_context_cache
+from src.api.services.response_cache import (
+    InMemoryResponseCache, LLMResponseCache, ResponseCacheBackend, create_response_cache, get_response_cache
+)
+from src.api.middleware.auth import get_current_user
+from src.storage.postgres import get_db
+
+def test_key_normalizes_whitespace_and_covers_the_prompt():
+    key = LLMResponseCache.key("http://llm/v1", "openai", "gpt-4", 0.7, "sys", "summarize  my\nprojects ")
+    assert key == LLMResponseCache.key("http://llm/v1", "openai", "gpt-4", 0.7, "sys", "summarize my projects")
+    assert key != LLMResponseCache.key("http://llm/v1", "openai", "gpt-4", 0.7, "sys v2", "summarize my projects")
+    assert key != LLMResponseCache.key("http://llm/v1", "openai", "gpt-4o", 0.7, "sys", "summarize my projects")
+    assert key != LLMResponseCache.key("http://llm/v1", "openai", "gpt-4", 0.7, "sys", "summarize my projects",
+                                       history=[{"role": "user", "content": "hi"}])
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_lru_and_expires():
+    backend = InMemoryResponseCache(max_entries=2)
+    await backend.set("a", "A", ttl=60)
+    await backend.set("b", "B", ttl=60)
+    assert await backend.get("a") == "A"
+    await backend.set("c", "C", ttl=60)
+    assert await backend.get("b") is None
+    assert await backend.get("a") == "A"
+
+    await backend.set("d", "D", ttl=-1)
+    assert await backend.get("d") is None
+
+def test_create_response_cache_backends():
+    assert create_response_cache("off") is None
+    assert isinstance(create_response_cache("memory").backend, InMemoryResponseCache)
+    with pytest.raises(ValueError):
+        create_response_cache("redis")
+
+def make_app(monkeypatch, cache, cache_responses=True):
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"answer {len(calls)}"}}]})
+
+    async def prepare(msg, current_user, db, pm_context=None):
+        return chat.PreparedChat("a1", "openai", "key", "http://llm/v1", "gpt-4", "sys", cache_responses)
+
+    registry = HTTPClientRegistry()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    registry.client_for = lambda url: client
+    monkeypatch.setattr(chat, "prepare_pm_chat", prepare)
+    app = FastAPI()
+    app.include_router(chat.router)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="u1")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_pm_context_cache] = lambda: None
+    app.dependency_overrides[get_http_clients] = lambda: registry
+    app.dependency_overrides[get_response_cache] = lambda: cache
+    return TestClient(app), calls
+
+def test_repeated_prompt_is_served_from_cache(monkeypatch):
+    cache = create_response_cache("memory")
+    client, calls = make_app(monkeypatch, cache)
+
+    first = client.post("/chat/pm", json={"message": "summarize my projects"}).json()
+    second = client.post("/chat/pm", json={"message": "summarize  my projects"}).json()
+    streamed = client.post("/chat/pm/stream", json={"message": "summarize my projects"}).text
+
+    assert first["response"] == second["response"] == "answer 1"
+    assert len(calls) == 1
+    assert '"cached": true' in streamed and '"content": "answer 1"' in streamed
+    assert cache.hits == 2
+
+def test_account_can_opt_out(monkeypatch):
+    client, calls = make_app(monkeypatch, create_response_cache("memory"), cache_responses=False)
+    client.post("/chat/pm", json={"message": "summarize my projects"})
+    client.post("/chat/pm", json={"message": "summarize my projects"})
+    assert len(calls) == 2
+
+def test_backend_must_implement_every_operation():
+    class NoClear(ResponseCacheBackend):
+        async def get(self, key):
+            return None
+
+        async def set(self, key, value, ttl):
+            pass
+
+    with pytest.raises(TypeError):
+        NoClear()
+    assert isinstance(InMemoryResponseCache(), ResponseCacheBackend)
@@ -0,0 +1,42 @@
+import os
+import time
+from src.core.status_cache import StatusCache, git_state_fingerprint
+
+def test_status_cache_token_and_ttl():
+    cache = StatusCache(ttls={"git": 60, "github": 0})
+
+    cache.put("p1", "git", "git-data", token=("a",))
+    assert cache.get("p1", "git", token=("a",)) == "git-data"
+    # A new fingerprint means the repository changed
+    assert cache.get("p1", "git", token=("b",)) is None
+    assert cache.get("p1", "git", token=("a",)) is None
+
+    cache.put("p1", "github", "gh-data")
+    time.sleep(0.01)
+    assert cache.get("p1", "github") is None
+
+def test_status_cache_invalidate_project():
+    cache = StatusCache()
+    cache.put("p1", "git", 1)
+    cache.put("p1", "tasks", 2)
+    cache.put("p2", "tasks", 3)
+
+    cache.invalidate("p1")
+
+    assert cache.get("p1", "git") is None
+    assert cache.get("p1", "tasks") is None
+    assert cache.get("p2", "tasks") == 3
+
+def test_git_state_fingerprint_tracks_refs(tmp_path):
+    git_dir = tmp_path / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    before = git_state_fingerprint(str(tmp_path))
+
+    assert git_state_fingerprint(str(tmp_path)) == before
+
+    ref = git_dir / "refs" / "heads" / "main"
+    ref.write_text("abc\n")
+    future = time.time() + 10
+    os.utime(ref, (future, future))
+    assert git_state_fingerprint(str(tmp_path)) != before
@@ -1,7 +1,7 @@
 import os
 import pytest
 from src.storage.db import TaskStorage
-from src.models.task import Task, TaskType, TaskStatus, TaskPriority
+from src.models.task import Task, TaskType, TaskStatus, TaskPriority, Artifact
 from datetime import datetime
 
 @pytest.fixture
@@ -9,7 +9,8 @@ def storage(tmp_path):
     db_path = tmp_path / "test.db"
     return TaskStorage(str(db_path))
 
-def test_create_and_get_task(storage):
+@pytest.mark.asyncio
+async def test_create_and_get_task(storage):
     task = Task(
         id="task-1",
         project_name="test-project",
@@ -20,45 +21,224 @@ def test_create_and_get_task(storage):
         priority=TaskPriority.MEDIUM
     )
     
-    storage.create_task(task)
-    retrieved = storage.get_task("task-1")
+    await storage.create_task(task)
+    retrieved = await storage.get_task("task-1")
     
     assert retrieved is not None
     assert retrieved.title == "Test Task"
     assert retrieved.project_name == "test-project"
 
-def test_list_tasks(storage):
+@pytest.mark.asyncio
+async def test_list_tasks(storage):
     task1 = Task(id="t1", project_name="p1", type=TaskType.STANDARD, title="T1")
     task2 = Task(id="t2", project_name="p1", type=TaskType.STANDARD, title="T2")
     task3 = Task(id="t3", project_name="p2", type=TaskType.STANDARD, title="T3")
     
-    storage.create_task(task1)
-    storage.create_task(task2)
-    storage.create_task(task3)
+    await storage.create_task(task1)
+    await storage.create_task(task2)
+    await storage.create_task(task3)
     
-    p1_tasks = storage.list_tasks(project_name="p1")
+    p1_tasks = await storage.list_tasks(project_name="p1")
     assert len(p1_tasks) == 2
     
-    all_tasks = storage.list_tasks()
+    all_tasks = await storage.list_tasks()
     assert len(all_tasks) == 3
 
-def test_update_task(storage):
+@pytest.mark.asyncio
+async def test_update_task(storage):
     task = Task(id="t1", project_name="p1", type=TaskType.STANDARD, title="Original")
-    storage.create_task(task)
+    await storage.create_task(task)
     
     task.title = "Updated"
     task.status = TaskStatus.DONE
-    storage.update_task(task)
+    await storage.update_task(task)
     
-    retrieved = storage.get_task("t1")
+    retrieved = await storage.get_task("t1")
     assert retrieved.title == "Updated"
     assert retrieved.status == TaskStatus.DONE
 
-def test_delete_task(storage):
+@pytest.mark.asyncio
+async def test_delete_task(storage):
     task = Task(id="t1", project_name="p1", type=TaskType.STANDARD, title="T1")
-    storage.create_task(task)
+    await storage.create_task(task)
     
-    assert storage.get_task("t1") is not None
+    assert await storage.get_task("t1") is not None
     
-    storage.delete_task("t1")
-    assert storage.get_task("t1") is None
+    await storage.delete_task("t1")
+    assert await storage.get_task("t1") is None
+
+@pytest.mark.asyncio
+async def test_revision_bumps_on_project_writes(storage):
+    assert storage.revision("p1") == 0
+
+    task = Task(id="t1", project_name="p1", type=TaskType.STANDARD, title="T1")
+    await storage.create_task(task)
+    after_create = storage.revision("p1")
+    assert after_create > 0
+
+    task.title = "Renamed"
+    await storage.update_task(task)
+    assert storage.revision("p1") > after_create
+
+    await storage.delete_task("t1")
+    assert storage.revision("p1") > after_create + 1
+    assert storage.revision("p2") == 0
+
+@pytest.mark.asyncio
+async def test_concurrent_access_uses_wal(storage):
+    import asyncio
+    from sqlalchemy import text
+
+    await asyncio.gather(*[
+        storage.create_task(Task(id=f"t{i}", project_name="p1", type=TaskType.STANDARD, title=f"T{i}"))
+        for i in range(20)
+    ])
+    results = await asyncio.gather(*[storage.list_tasks(project_name="p1") for _ in range(10)])
+    assert all(len(r) == 20 for r in results)
+
+    async with storage.engine.connect() as conn:
+        mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+        mmap_size = (await conn.execute(text("PRAGMA mmap_size"))).scalar()
+    assert mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert mmap_size > 0
+
+@pytest.mark.asyncio
+async def test_bulk_create_update_and_upsert(storage):
+    tasks = [Task(id=f"t{i}", project_name="p1", type=TaskType.STANDARD, title=f"T{i}") for i in range(1200)]
+    await storage.create_tasks(tasks)
+    assert len(await storage.list_tasks(project_name="p1")) == 1200
+
+    for t in tasks[:600]:
+        t.status = TaskStatus.DONE
+    await storage.update_tasks(tasks[:600])
+    assert len(await storage.list_tasks(project_name="p1", status=TaskStatus.DONE)) == 600
+
+    tasks[0].title = "Renamed"
+    new_task = Task(id="t-new", project_name="p2", type=TaskType.STANDARD, title="New")
+    await storage.upsert_tasks([tasks[0], new_task])
+    assert (await storage.get_task("t0")).title == "Renamed"
+    assert (await storage.get_task("t-new")).project_name == "p2"
+    assert storage.revision("p2") == 1
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_unknown_ids(storage):
+    ghost = Task(id="ghost", project_name="p1", type=TaskType.STANDARD, title="Ghost")
+    with pytest.raises(ValueError):
+        await storage.update_tasks([ghost])
+
+@pytest.mark.asyncio
+async def test_update_statuses_in_one_transaction(storage):
+    await storage.create_tasks([Task(id=f"t{i}", project_name="p1", type=TaskType.STANDARD, title=f"T{i}") for i in range(3)])
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    with pytest.raises(ValueError, match="ghost"):
+        await storage.update_statuses({"t0": TaskStatus.DONE, "ghost": TaskStatus.DONE}, now)
+    assert (await storage.get_task("t0")).status == TaskStatus.TODO
+
+    updated = await storage.update_statuses({"t0": TaskStatus.DONE, "t1": TaskStatus.IN_PROGRESS}, now)
+    assert [t.id for t in updated] == ["t0", "t1"]
+    done = await storage.get_task("t0")
+    assert done.status == TaskStatus.DONE and done.completed_at == now and done.updated_at == now
+    assert (await storage.get_task("t1")).completed_at is None
+
+@pytest.mark.asyncio
+async def test_list_tasks_page_keyset_and_projection(storage):
+    same_time = datetime(2024, 1, 1, 12, 0, 0)
+    tasks = [
+        Task(id=f"t{i:02d}", project_name="p1", type=TaskType.STANDARD, title=f"T{i}",
+             updated_at=same_time if i % 2 else datetime(2024, 1, 2, 0, i))
+        for i in range(25)
+    ]
+    await storage.create_tasks(tasks)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await storage.list_tasks_page(project_name="p1", fields=["title"], limit=10, cursor=cursor)
+        seen.extend(page)
+        if not cursor:
+            break
+
+    assert len(seen) == 25
+    assert len({t["id"] for t in seen}) == 25
+    assert set(seen[0]) == {"id", "title"}
+    # Most recently updated first
+    assert seen[0]["id"] == "t24"
+
+    asc, _ = await storage.list_tasks_page(project_name="p1", limit=3, descending=False)
+    assert [t["id"] for t in asc] == ["t01", "t03", "t05"]
+    assert asc[0]["status"] == "todo"
+
+    with pytest.raises(ValueError):
+        await storage.list_tasks_page(fields=["nope"])
+
+@pytest.mark.asyncio
+async def test_list_tasks_page_orders_rows_without_updated_at(storage):
+    from sqlalchemy import text
+    await storage.create_tasks([
+        Task(id=f"t{i}", project_name="p1", type=TaskType.STANDARD, title=f"T{i}",
+             created_at=datetime(2024, 1, 1, 0, i), updated_at=datetime(2024, 1, 2, 0, i))
+        for i in range(4)
+    ])
+    async with storage.engine.begin() as conn:
+        await conn.execute(text("UPDATE tasks SET updated_at = NULL WHERE id IN ('t1', 't2')"))
+        await conn.execute(text("UPDATE tasks SET created_at = NULL WHERE id = 't2'"))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await storage.list_tasks_page(project_name="p1", fields=["title"], limit=1, cursor=cursor)
+        seen.extend(t["id"] for t in page)
+        if cursor is None:
+            break
+    # t1 falls back to created_at; t2 has no timestamp at all and sorts last
+    assert seen == ["t3", "t0", "t1", "t2"]
+
+@pytest.mark.asyncio
+async def test_summarize_aggregates_in_sql(storage):
+    tasks = [
+        Task(id=f"t{i}", project_name="p1", type=TaskType.STANDARD, title=f"T{i}",
+             status=TaskStatus.DONE if i < 3 else TaskStatus.TODO,
+             updated_at=datetime(2024, 1, 1, 0, i))
+        for i in range(8)
+    ]
+    await storage.create_tasks(tasks)
+    await storage.create_task(Task(id="other", project_name="p2", type=TaskType.STANDARD, title="Other"))
+
+    summary = await storage.summarize("p1")
+
+    assert summary.total == 8
+    assert summary.by_status == {"done": 3, "todo": 5}
+    assert [r["id"] for r in summary.recent] == ["t7", "t6", "t5", "t4", "t3"]
+    assert summary.recent[0]["status"] == "todo"
+
+@pytest.mark.asyncio
+async def test_linked_issue_numbers(storage):
+    await storage.create_tasks([
+        Task(id="a", project_name="p1", type=TaskType.STANDARD, title="A", github_issue_number=7),
+        Task(id="b", project_name="p1", type=TaskType.STANDARD, title="B", github_issue_number=7),
+        Task(id="c", project_name="p1", type=TaskType.STANDARD, title="C"),
+        Task(id="d", project_name="p2", type=TaskType.STANDARD, title="D", github_issue_number=9),
+    ])
+
+    assert await storage.linked_issue_numbers("p1") == {7}
+    assert await storage.linked_issue_numbers("missing") == set()
+
+@pytest.mark.asyncio
+async def test_artifact_index_queries(storage):
+    await storage.record_artifacts([
+        Artifact(task_id="t1", name="data.json", format="json", size=10, hash="h1", created_at=datetime(2024, 1, 1)),
+        Artifact(task_id="t1", name="notes.txt", format="txt", size=5, hash="h2", created_at=datetime(2024, 1, 2)),
+        Artifact(task_id="t2", name="copy.json", format="json", size=10, hash="h1", created_at=datetime(2024, 1, 3)),
+    ])
+    # Re-saving an artifact replaces its entry
+    await storage.record_artifact(
+        Artifact(task_id="t1", name="notes.txt", format="txt", size=7, hash="h3", created_at=datetime(2024, 1, 4))
+    )
+
+    assert [a.name for a in await storage.list_artifacts(task_id="t1")] == ["notes.txt", "data.json"]
+    assert (await storage.list_artifacts(task_id="t1", format="txt"))[0].hash == "h3"
+    assert {a.task_id for a in await storage.list_artifacts(hash="h1")} == {"t1", "t2"}
+    assert [a.name for a in await storage.list_artifacts(name_prefix="co")] == ["copy.json"]
+    assert (await storage.latest_artifact("json")).task_id == "t2"
+    assert (await storage.latest_artifact("json", task_id="t1")).name == "data.json"
+    assert await storage.latest_artifact("csv") is None
@@ -0,0 +1,88 @@
+import pytest
+from src.core.suggestions import SuggestionsEngine, SuggestionRule
+from src.models.project import GitInfo, GitHubInfo, TaskSummary, Suggestion
+from src.models.task import Task, TaskStatus
+
+def clean_git():
+    return GitInfo(branch="main", is_dirty=False, ahead=0, behind=0, last_commit={},
+                   modified_files=[], untracked_files=[])
+
+def issues(*numbers):
+    return GitHubInfo(issues=[{"number": n, "title": f"Issue {n}"} for n in numbers])
+
+def test_unlinked_issues_from_tasks():
+    tasks = [
+        Task(id="1", project_name="p", title="T1", type="standard", github_issue_number=1),
+        Task(id="2", project_name="p", title="T2", type="standard"),
+    ]
+    suggestions = SuggestionsEngine().generate_suggestions(clean_git(), issues(1, 2), tasks)
+
+    assert [s.issue_number for s in suggestions if s.action == "create_task_from_issue"] == [2]
+    assert any(s.action == "start_task" for s in suggestions)
+
+def test_precomputed_links_and_summary():
+    summary = TaskSummary(total=2, by_status={"todo": 1, "in_progress": 1}, recent=[])
+    suggestions = SuggestionsEngine().generate_suggestions(
+        clean_git(), issues(1, 2, 3), linked_issues={2}, task_summary=summary
+    )
+
+    assert [s.issue_number for s in suggestions if s.action == "create_task_from_issue"] == [1, 3]
+    assert not any(s.action == "start_task" for s in suggestions)
+
+def test_rules_are_memoized_per_input_fingerprint():
+    calls = []
+
+    def count_branches(git):
+        calls.append(git.branch)
+        return [Suggestion(priority="low", action="noop", description=git.branch)]
+
+    engine = SuggestionsEngine(rules=[SuggestionRule("count", ("git",), count_branches)])
+    summary = TaskSummary(total=0, by_status={}, recent=[])
+
+    first = engine.generate_suggestions(clean_git(), issues(1), linked_issues=set(), task_summary=summary)
+    # GitHub and task changes do not touch a git-only rule
+    second = engine.generate_suggestions(clean_git(), issues(2), linked_issues={2}, task_summary=summary)
+    changed = clean_git().model_copy(update={"branch": "dev"})
+    third = engine.generate_suggestions(changed, issues(2), linked_issues={2}, task_summary=summary)
+
+    assert calls == ["main", "dev"]
+    assert first == second
+    assert third[0].description == "dev"
+    stats = engine.rule_stats()["count"]
+    assert stats["calls"] == 3 and stats["hits"] == 1
+
+def test_failing_rule_does_not_break_others():
+    def broken(git):
+        raise RuntimeError("boom")
+
+    engine = SuggestionsEngine()
+    engine.register(SuggestionRule("broken", ("git",), broken))
+    dirty = clean_git().model_copy(update={"is_dirty": True, "modified_files": ["a.py"]})
+
+    suggestions = engine.generate_suggestions(dirty, issues())
+
+    assert [s.action for s in suggestions] == ["commit_changes"]
+    assert "broken" in engine.rule_stats()
+    # Failures are not memoized, so the rule runs again on the same inputs
+    engine.generate_suggestions(dirty, issues())
+    assert engine.rule_stats()["broken"]["hits"] == 0
+
+def test_rule_fields_narrow_the_fingerprint():
+    calls = []
+
+    def ahead(git):
+        calls.append(git.ahead)
+        return []
+
+    engine = SuggestionsEngine(rules=[SuggestionRule("ahead", ("git",), ahead, fields={"git": ("ahead",)})])
+    engine.generate_suggestions(clean_git(), issues())
+    engine.generate_suggestions(clean_git().model_copy(update={"branch": "dev", "is_dirty": True}), issues())
+    engine.generate_suggestions(clean_git().model_copy(update={"ahead": 2}), issues())
+
+    assert calls == [0, 2]
+    with pytest.raises(ValueError):
+        SuggestionRule("bad", ("git",), ahead, fields={"github": ("issues",)})
+
+def test_unknown_rule_input_rejected():
+    with pytest.raises(ValueError):
+        SuggestionRule("bad", ("filesystem",), lambda filesystem: [])
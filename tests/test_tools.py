@@ -56,6 +56,86 @@ async def test_tasks_create_tool(coder_settings, tmp_path):
     # Verify it's in DB
     list_result = await server.mcp.call_tool("tasks_list", {"project_name": "test-proj"})
     list_contents, _ = list_result
-    tasks = json.loads(list_contents[0].text)
+    tasks = json.loads(list_contents[0].text)["tasks"]
     assert len(tasks) == 1
     assert tasks[0]["title"] == "New Task"
+
+@pytest.mark.asyncio
+async def test_tasks_batch_tools(coder_settings, tmp_path):
+    import os
+    os.environ["PROJECT_ASSISTANT_DB"] = str(tmp_path / "batch.db")
+
+    server = ProjectAssistantServer(coder_settings)
+
+    contents, _ = await server.mcp.call_tool("tasks_create_batch", {
+        "project_name": "bulk-proj",
+        "tasks": [{"title": f"Issue {i}", "github_issue_number": i} for i in range(50)]
+    })
+    created = json.loads(contents[0].text)
+    assert created["created"] == 50
+    assert len(set(created["ids"])) == 50 and all(len(i) == 36 for i in created["ids"])
+
+    contents, _ = await server.mcp.call_tool("tasks_update_batch", {
+        "updates": [{"task_id": task_id, "status": "done"} for task_id in created["ids"][:10]]
+    })
+    assert json.loads(contents[0].text)["updated"] == 10
+
+    contents, _ = await server.mcp.call_tool("tasks_list", {"project_name": "bulk-proj", "status": "done"})
+    assert len(json.loads(contents[0].text)["tasks"]) == 10
+
+    contents, _ = await server.mcp.call_tool("tasks_create_batch", {
+        "project_name": "bulk-proj",
+        "tasks": [{"title": "Fine"}, {"title": "Bad", "priority": "urgent"}]
+    })
+    assert json.loads(contents[0].text)["error"].startswith("Item 1:")
+    contents, _ = await server.mcp.call_tool("tasks_create_batch", {
+        "project_name": "bulk-proj", "tasks": [{"description": "no title"}]
+    })
+    assert json.loads(contents[0].text) == {"error": "Item 0: title is required"}
+
+    first, second = created["ids"][:2]
+    for updates, error in [
+        ([{"task_id": first, "status": "todo"}, {"status": "done"}], "Item 1: task_id is required"),
+        ([{"task_id": first}], "Item 0: status is required"),
+        ([{"task_id": first, "status": "todo"}, {"task_id": first, "status": "done"}],
+         f"Item 1: task {first} is listed more than once"),
+    ]:
+        contents, _ = await server.mcp.call_tool("tasks_update_batch", {"updates": updates})
+        assert json.loads(contents[0].text) == {"error": error}
+    contents, _ = await server.mcp.call_tool("tasks_update_batch", {
+        "updates": [{"task_id": second, "status": "todo"}, {"task_id": first, "status": "finished"}]
+    })
+    assert json.loads(contents[0].text)["error"].startswith("Item 1:")
+    # Nothing from a rejected batch is applied
+    contents, _ = await server.mcp.call_tool("tasks_get", {"task_id": second})
+    assert json.loads(contents[0].text)["status"] == "done"
+
+@pytest.mark.asyncio
+async def test_backfill_indexes_existing_artifacts_and_serves_reports_from_it(coder_settings, tmp_path, monkeypatch):
+    import os
+    from src.models.task import Task, TaskType
+
+    artifacts = tmp_path / "artifacts"
+    (artifacts / "legacy").mkdir(parents=True)
+    (artifacts / "legacy" / "old.txt").write_text("from before the blob store")
+    monkeypatch.setenv("PROJECT_ASSISTANT_DB", str(tmp_path / "index.db"))
+    monkeypatch.setenv("PROJECT_ASSISTANT_ARTIFACTS", str(artifacts))
+    monkeypatch.setenv("PROJECT_ASSISTANT_ANALYSIS_CACHE", str(tmp_path / "analysis.sqlite"))
+
+    server = ProjectAssistantServer(coder_settings)
+    engine = server.research_engine
+    engine.save_artifact("t1", "data", {"a": 1})
+    assert await engine.indexed_artifacts("t1") is None
+
+    await server._backfill_artifact_index()
+    indexed = await server.storage.list_artifacts(limit=None)
+    assert sorted((a.task_id, a.name) for a in indexed) == [("legacy", "old.txt"), ("t1", "data.json")]
+    # Already populated, so a second start does not rescan
+    monkeypatch.setattr(engine, "iter_indexed_artifacts", lambda: pytest.fail("rescanned"))
+    await server._backfill_artifact_index()
+
+    await server.storage.create_task(Task(id="legacy", project_name="p", type=TaskType.RESEARCH, title="Old"))
+    monkeypatch.setattr(os, "listdir", lambda *a: pytest.fail("scanned the task directory"))
+    contents, _ = await server.mcp.call_tool("tasks_generate_research_report", {"task_id": "legacy"})
+    assert "- old.txt\n  > from before the blob store" in json.loads(contents[0].text)["report"]
+    await server.storage.close()